@@ -0,0 +1,153 @@
+"""Recall@k, latency and memory benchmark of the vector indexes against the exact flat scan.
+
+Usage (from the project root):
+    PYTHONPATH=. python benchmark/vector_index_benchmark.py --size 5000 --dim 256 --ef-search 16 64 256
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from infrastructure.vector_store.binary_vector_index import BinaryVectorIndex
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.hnsw_vector_index import HNSWVectorIndex
+from infrastructure.vector_store.ivf_vector_index import IVFVectorIndex
+from infrastructure.vector_store.pq_vector_index import PQVectorIndex
+from infrastructure.vector_store.quantized_vector_index import QuantizedVectorIndex
+from infrastructure.vector_store.truncated_vector_index import TruncatedVectorIndex
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+def make_dataset(size: int, dim: int, queries: int, clusters: int, noise: float, seed: int):
+    """Clustered Gaussian vectors, closer to real embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=size + queries)
+    points = centers[labels] + noise * rng.normal(size=(size + queries, dim))
+    return points[:size].astype(np.float32), points[size:].astype(np.float32)
+
+
+def ground_truth(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    index = FlatVectorIndex()
+    index.add(vectors)
+    return [{row for row, _ in index.search(query, k)} for query in queries]
+
+
+def build(factory: Callable[[], VectorIndex], vectors: np.ndarray):
+    index = factory()
+    start = time.perf_counter()
+    index.add(vectors)
+    return index, time.perf_counter() - start
+
+
+def measure(index: VectorIndex, queries: np.ndarray, truth: List[set], k: int) -> Dict[str, float]:
+    latencies = []
+    recalls = []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        hits = index.search(query, k)
+        latencies.append(time.perf_counter() - start)
+        recalls.append(len({row for row, _ in hits} & expected) / k)
+
+    return {
+        "p50_ms": 1000 * float(np.percentile(latencies, 50)),
+        "p99_ms": 1000 * float(np.percentile(latencies, 99)),
+        "recall": float(np.mean(recalls)),
+    }
+
+
+def report(name: str, build_seconds: float, result: Dict[str, float], index: VectorIndex) -> None:
+    # Indexes without an nbytes property (graph and inverted-file ones) are reported as "-"
+    nbytes = getattr(index, "nbytes", None)
+    memory = f"{nbytes / len(index):.0f}" if nbytes is not None else "-"
+    print(f"{name:<32}{build_seconds:>10.2f}{result['p50_ms']:>10.3f}"
+          f"{result['p99_ms']:>10.3f}{result['recall']:>12.3f}{memory:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=5000, help="number of stored vectors")
+    parser.add_argument("--dim", type=int, default=256, help="embedding dimension")
+    parser.add_argument("--queries", type=int, default=100, help="number of queries")
+    parser.add_argument("--clusters", type=int, default=50, help="number of clusters in the synthetic data")
+    parser.add_argument("--noise", type=float, default=1.0, help="spread of the points around their cluster center")
+    parser.add_argument("--k", type=int, default=10, help="recall@k cut-off")
+    parser.add_argument("--indexes", nargs="+", default=["hnsw", "ivf", "int8", "float16", "binary", "pq", "truncated"], help="indexes to compare with the flat scan")
+    parser.add_argument("--m", type=int, default=16, help="HNSW M")
+    parser.add_argument("--ef-construction", type=int, default=100, help="HNSW ef_construction")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 64, 256], help="HNSW ef_search sweep")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF number of lists (0 for sqrt(size))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 8, 32], help="IVF nprobe sweep")
+    parser.add_argument("--rescore", type=int, default=100, help="float32 rescoring candidates for int8/float16")
+    parser.add_argument("--binary-rescore", type=int, nargs="+", default=[50, 200, 800],
+                        help="binary index rescoring sweep")
+    parser.add_argument("--pq-subspaces", type=int, nargs="+", default=[16, 32, 64], help="PQ subspace sweep")
+    parser.add_argument("--truncated-dims", type=int, nargs="+", default=[16, 32, 64],
+                        help="first-pass dimensions sweep of the truncated index")
+    parser.add_argument("--truncated-rescore", type=int, default=200, help="truncated index rescoring candidates")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors, queries = make_dataset(args.size, args.dim, args.queries, args.clusters, args.noise, args.seed)
+    truth = ground_truth(vectors, queries, args.k)
+
+    print(f"{'index':<32}{'build s':>10}{'p50 ms':>10}{'p99 ms':>10}{f'recall@{args.k}':>12}{'B/vector':>12}")
+
+    index, build_seconds = build(FlatVectorIndex, vectors)
+    report("flat", build_seconds, measure(index, queries, truth, args.k), index)
+
+    if "hnsw" in args.indexes:
+        index, build_seconds = build(
+            lambda: HNSWVectorIndex(m=args.m, ef_construction=args.ef_construction, seed=args.seed), vectors
+        )
+        # ef_search only affects queries, so one graph serves the whole sweep
+        for ef_search in args.ef_search:
+            index.ef_search = ef_search
+            report(f"hnsw(M={args.m},ef={ef_search})", build_seconds, measure(index, queries, truth, args.k), index)
+
+    if "ivf" in args.indexes:
+        index, build_seconds = build(
+            lambda: IVFVectorIndex(nlist=args.nlist, min_training_size=0, background=False, seed=args.seed), vectors
+        )
+        for nprobe in args.nprobe:
+            index.nprobe = nprobe
+            report(f"ivf(nprobe={nprobe})", build_seconds, measure(index, queries, truth, args.k), index)
+
+    for dtype in ("int8", "float16"):
+        if dtype in args.indexes:
+            for rescore in (0, args.rescore):
+                index, build_seconds = build(lambda: QuantizedVectorIndex(dtype=dtype, rescore_candidates=rescore), vectors)
+                report(f"{dtype}(rescore={rescore})", build_seconds, measure(index, queries, truth, args.k), index)
+
+    if "binary" in args.indexes:
+        index, build_seconds = build(BinaryVectorIndex, vectors)
+        for rescore in args.binary_rescore:
+            index.rescore_candidates = rescore
+            report(f"binary(rescore={rescore})", build_seconds, measure(index, queries, truth, args.k), index)
+
+    if "pq" in args.indexes:
+        for subspaces in args.pq_subspaces:
+            index, build_seconds = build(
+                lambda: PQVectorIndex(subspaces=subspaces, min_training_size=len(vectors), seed=args.seed), vectors
+            )
+            report(f"pq(M={subspaces})", build_seconds, measure(index, queries, truth, args.k), index)
+
+    if "truncated" in args.indexes:
+        for projection in ("prefix", "pca"):
+            for dimensions in args.truncated_dims:
+                index, build_seconds = build(
+                    lambda: TruncatedVectorIndex(
+                        dimensions=dimensions,
+                        projection=projection,
+                        rescore_candidates=args.truncated_rescore,
+                        min_training_size=len(vectors),
+                        seed=args.seed
+                    ),
+                    vectors
+                )
+                report(f"{projection}(d={dimensions})", build_seconds, measure(index, queries, truth, args.k), index)
+
+
+if __name__ == "__main__":
+    main()
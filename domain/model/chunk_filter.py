@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from domain.model.document import DocumentType
+from domain.model.document_chunk import DocumentChunk
+
+
+class ChunkFilter:
+    """Conjunction of conditions a chunk must meet to be returned by a search.
+
+    Every condition left to None is ignored; document_ids and document_types match any listed
+    value, metadata matches chunks whose document metadata holds all the given key/value pairs.
+    """
+
+    def __init__(
+        self,
+        document_ids: Optional[List[str]] = None,
+        document_types: Optional[List[DocumentType]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.document_ids = document_ids
+        self.document_types = document_types
+        self.created_after = created_after
+        self.created_before = created_before
+        self.metadata = metadata or {}
+
+    def is_empty(self) -> bool:
+        return (
+            self.document_ids is None
+            and self.document_types is None
+            and self.created_after is None
+            and self.created_before is None
+            and not self.metadata
+        )
+
+    def matches(self, chunk: DocumentChunk) -> bool:
+        """Whether a single chunk meets every condition, read from its document metadata."""
+        if self.document_ids is not None and chunk.document_id not in self.document_ids:
+            return False
+        metadata = chunk.metadata or {}
+        if self.document_types is not None and metadata.get("document_type") not in {
+            document_type.value for document_type in self.document_types
+        }:
+            return False
+        if self.created_after is not None or self.created_before is not None:
+            created_at = self._timestamp(metadata.get("created_at"))
+            if created_at is None:
+                return False
+            if self.created_after is not None and created_at < self.created_after.timestamp():
+                return False
+            if self.created_before is not None and created_at > self.created_before.timestamp():
+                return False
+        return all(key in metadata and metadata[key] == value for key, value in self.metadata.items())
+
+    @staticmethod
+    def _timestamp(value: Any) -> Optional[float]:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return None
+        return None
+
+    def __str__(self):
+        return (
+            f"ChunkFilter(document_ids={self.document_ids}, document_types={self.document_types}, "
+            f"created_after={self.created_after}, created_before={self.created_before}, metadata={self.metadata})"
+        )
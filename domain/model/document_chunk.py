@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional, Dict, Any
 
 
@@ -9,7 +10,8 @@ class DocumentChunk:
         content: str,
         chunk_index: int,
         embedding: Optional[list[float]] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        chat_id: Optional[str] = None
     ):
         self.chunk_id = chunk_id
         self.document_id = document_id
@@ -17,10 +19,22 @@ class DocumentChunk:
         self.chunk_index = chunk_index
         self.embedding = embedding
         self.metadata = metadata or {}
+        self.chat_id = chat_id
 
     def has_embedding(self) -> bool:
         return self.embedding is not None and len(self.embedding) > 0
 
+    def without_embedding(self) -> "DocumentChunk":
+        """Copy of the chunk without its embedding, for stores keeping the vectors elsewhere"""
+        return DocumentChunk(
+            self.chunk_id, self.document_id, self.content, self.chunk_index,
+            metadata=self.metadata, chat_id=self.chat_id
+        )
+
+    def content_hash(self) -> str:
+        """SHA-256 of the content: chunks with equal hashes have the same embedding"""
+        return hashlib.sha256(self.content.encode("utf-8")).hexdigest()
+
     def __eq__(self, other):
         if not isinstance(other, DocumentChunk):
             return False
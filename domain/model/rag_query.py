@@ -1,5 +1,6 @@
 from typing import List, Optional
 from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
 
 
 class RAGQuery:
@@ -25,12 +26,14 @@ class RAGResult:
         query: RAGQuery,
         relevant_chunks: List[DocumentChunk],
         generated_response: str,
-        confidence_score: Optional[float] = None
+        confidence_score: Optional[float] = None,
+        scored_chunks: Optional[List[ScoredChunk]] = None
     ):
         self.query = query
         self.relevant_chunks = relevant_chunks
         self.generated_response = generated_response
         self.confidence_score = confidence_score
+        self.scored_chunks = scored_chunks or []
 
     def has_relevant_context(self) -> bool:
         return len(self.relevant_chunks) > 0
@@ -0,0 +1,26 @@
+from domain.model.document_chunk import DocumentChunk
+
+
+class ScoredChunk:
+    def __init__(
+        self,
+        chunk: DocumentChunk,
+        similarity: float,
+        rank: int,
+        lexical_only: bool = False
+    ):
+        self.chunk = chunk
+        self.similarity = similarity
+        self.rank = rank  # 1 for the best match of the search
+        # Found by the lexical search alone: similarity is 0.0, not a measured cosine similarity
+        self.lexical_only = lexical_only
+
+    def __eq__(self, other):
+        if not isinstance(other, ScoredChunk):
+            return False
+        return self.chunk == other.chunk and (
+            self.similarity == other.similarity and self.rank == other.rank and self.lexical_only == other.lexical_only
+        )
+
+    def __str__(self):
+        return f"ScoredChunk(chunk_id={self.chunk.chunk_id}, similarity={self.similarity:.4f}, rank={self.rank})"
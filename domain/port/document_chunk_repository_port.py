@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
+from domain.model.chunk_filter import ChunkFilter
 from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
 
 
 class DocumentChunkRepositoryPort(ABC):
@@ -15,11 +17,21 @@ class DocumentChunkRepositoryPort(ABC):
         """Get all chunks for a specific document"""
         pass
 
+    @abstractmethod
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat"""
+        pass
+
     @abstractmethod
     def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
         """Get a specific chunk by ID"""
         pass
 
+    @abstractmethod
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID (normalized; unknown IDs are left out)"""
+        pass
+
     @abstractmethod
     def delete_chunks_by_document_id(self, document_id: str) -> bool:
         """Delete all chunks for a specific document"""
@@ -31,7 +43,32 @@ class DocumentChunkRepositoryPort(ABC):
         query_embedding: List[float], 
         chat_id: str,
         max_results: int = 5,
-        similarity_threshold: float = 0.7
-    ) -> List[DocumentChunk]:
-        """Search for similar chunks using vector similarity"""
-        pass 
\ No newline at end of file
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Search for similar chunks using vector similarity, most similar first (optionally filtered)"""
+        pass
+
+    @abstractmethod
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Search for similar chunks for several queries at once, one result list per query"""
+        pass 
+
+    def search_hybrid_chunks(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Search combining lexical matches on query_text with vector similarity (vector only unless overridden)"""
+        return self.search_similar_chunks(query_embedding, chat_id, max_results, similarity_threshold, chunk_filter)
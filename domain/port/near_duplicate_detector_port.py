@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import List
+from domain.model.document_chunk import DocumentChunk
+
+
+class NearDuplicateDetectorPort(ABC):
+
+    @abstractmethod
+    def filter_near_duplicates(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Register chunks and return those that are not near-duplicates of a chunk already registered in their chat"""
+        pass
+
+    @abstractmethod
+    def remove_document(self, document_id: str) -> List[DocumentChunk]:
+        """Forget the chunks of a document and return the skipped near-duplicates of other documents to store now"""
+        pass
@@ -0,0 +1,26 @@
+from typing import List
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+
+
+def chunk_embeddings(chunks: List[DocumentChunk], embedding_service: EmbeddingServicePort) -> List[List[float]]:
+    """Embeddings of chunks, aligned with them; only chunks without one are sent to the embedding service"""
+    missing = [chunk.content for chunk in chunks if not chunk.has_embedding()]
+    generated = iter(embedding_service.generate_embeddings_batch(missing) if missing else [])
+    return [chunk.embedding if chunk.has_embedding() else next(generated) for chunk in chunks]
+
+
+def embed_chunks(chunks: List[DocumentChunk], embedding_service: EmbeddingServicePort) -> List[DocumentChunk]:
+    """Set the embedding of every chunk that has none, sending each distinct content once
+
+    Contents are only deduplicated within the call; reuse across uploads is the job of the
+    embedding service (a CachedEmbeddingService when the embedding cache is enabled).
+    """
+    pending = [chunk for chunk in chunks if not chunk.has_embedding()]
+    # One entry per distinct content, in first-seen order
+    contents = list(dict.fromkeys(chunk.content for chunk in pending))
+    if contents:
+        embeddings = dict(zip(contents, embedding_service.generate_embeddings_batch(contents)))
+        for chunk in pending:
+            chunk.embedding = embeddings[chunk.content]
+    return chunks
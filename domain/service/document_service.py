@@ -5,6 +5,8 @@ from domain.port.document_repository_port import DocumentRepositoryPort
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
 from domain.port.document_processor_port import DocumentProcessorPort
 from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.port.near_duplicate_detector_port import NearDuplicateDetectorPort
+from domain.service.chunk_embedder import embed_chunks
 
 
 class DocumentService:
@@ -13,12 +15,14 @@ class DocumentService:
         document_repository: DocumentRepositoryPort,
         chunk_repository: DocumentChunkRepositoryPort,
         document_processor: DocumentProcessorPort,
-        embedding_service: EmbeddingServicePort
+        embedding_service: EmbeddingServicePort,
+        near_duplicate_detector: Optional[NearDuplicateDetectorPort] = None
     ):
         self.document_repository = document_repository
         self.chunk_repository = chunk_repository
         self.document_processor = document_processor
         self.embedding_service = embedding_service
+        self.near_duplicate_detector = near_duplicate_detector
 
     def upload_document(
         self,
@@ -53,13 +57,12 @@ class DocumentService:
             # Process the document to get chunks
             chunks = self.document_processor.process_document(document)
 
-            # Generate embeddings for each chunk
-            texts = [chunk.content for chunk in chunks]
-            embeddings = self.embedding_service.generate_embeddings_batch(texts)
+            # Skip chunks nearly identical to one already stored in the chat (e.g. re-uploads, OCR passes)
+            if self.near_duplicate_detector is not None:
+                chunks = self.near_duplicate_detector.filter_near_duplicates(chunks)
 
-            # Add embeddings to chunks
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk.embedding = embedding
+            # Add embeddings to chunks, embedding each distinct content once
+            embed_chunks(chunks, self.embedding_service)
 
             # Save chunks
             self.chunk_repository.save_chunks(chunks)
@@ -72,6 +75,7 @@ class DocumentService:
 
         except Exception as e:
             # Mark as failed
+            self._forget_near_duplicate_source(document_id)
             document.mark_as_failed()
             self.document_repository.save_document(document)
             raise e
@@ -89,9 +93,19 @@ class DocumentService:
         """Delete a document and its chunks"""
         # Delete chunks first
         self.chunk_repository.delete_chunks_by_document_id(document_id)
+        self._forget_near_duplicate_source(document_id)
         # Then delete the document
         return self.document_repository.delete_document(document_id)
 
+    def _forget_near_duplicate_source(self, document_id: str) -> None:
+        """Unregister a document's chunks from the detector, storing the near-duplicates they stood in for"""
+        if self.near_duplicate_detector is None:
+            return
+        restored = self.near_duplicate_detector.remove_document(document_id)
+        if restored:
+            embed_chunks(restored, self.embedding_service)
+            self.chunk_repository.save_chunks(restored)
+
     def get_pending_documents(self) -> List[Document]:
         """Get all documents that need processing"""
         return self.document_repository.get_documents_by_status(DocumentStatus.PENDING) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import List, Optional
+from domain.model.chunk_filter import ChunkFilter
 from domain.model.rag_query import RAGQuery, RAGResult
-from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
 from domain.model.history import History
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
 from domain.port.embedding_service_port import EmbeddingServicePort
@@ -27,7 +28,8 @@ class RAGService:
         chat_id: str,
         chat_history: History,
         max_chunks: int = 5,
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
     ) -> RAGResult:
         """Perform RAG query and generate response"""
         rag_query = RAGQuery(
@@ -55,13 +57,16 @@ class RAGService:
         # Generate embedding for the query
         query_embedding = self.embedding_service.generate_embedding(query)
 
-        # Search for similar chunks
-        relevant_chunks = self.chunk_repository.search_similar_chunks(
+        # Search for similar chunks (lexical matches are fused in when the repository supports them)
+        scored_chunks = self.chunk_repository.search_hybrid_chunks(
+            query_text=query,
             query_embedding=query_embedding,
             chat_id=chat_id,
             max_results=max_chunks,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            chunk_filter=chunk_filter
         )
+        relevant_chunks = [scored_chunk.chunk for scored_chunk in scored_chunks]
 
         if not relevant_chunks:
             # No relevant context found, use fallback
@@ -74,36 +79,25 @@ class RAGService:
             response = self.rag_generator.generate_response_with_context(
                 query, relevant_chunks, chat_history
             )
-            # Calculate average similarity as confidence score
-            confidence_score = self._calculate_confidence_score(
-                query_embedding, relevant_chunks
-            )
+            # Average similarity of the chunks the vector search retrieved as confidence score
+            confidence_score = self._calculate_confidence_score(scored_chunks)
 
         return RAGResult(
             query=rag_query,
             relevant_chunks=relevant_chunks,
             generated_response=response,
-            confidence_score=confidence_score
+            confidence_score=confidence_score,
+            scored_chunks=scored_chunks
         )
 
-    def _calculate_confidence_score(
-        self, 
-        query_embedding: List[float], 
-        chunks: List[DocumentChunk]
-    ) -> float:
-        """Calculate confidence score based on similarity scores"""
-        if not chunks:
+    def _calculate_confidence_score(self, scored_chunks: List[ScoredChunk]) -> float:
+        """Calculate confidence score from the similarities returned by the vector search"""
+        # Chunks only the lexical search found carry no similarity and would drag the mean down
+        similarities = [scored_chunk.similarity for scored_chunk in scored_chunks if not scored_chunk.lexical_only]
+        if not similarities:
             return 0.0
 
-        similarities = []
-        for chunk in chunks:
-            if chunk.has_embedding():
-                similarity = self.embedding_service.calculate_similarity(
-                    query_embedding, chunk.embedding
-                )
-                similarities.append(similarity)
-
-        return sum(similarities) / len(similarities) if similarities else 0.0
+        return sum(similarities) / len(similarities)
 
     def get_document_context_for_chat(self, chat_id: str) -> List[str]:
         """Get a summary of available documents for a chat"""
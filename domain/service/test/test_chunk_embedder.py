@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import MagicMock
+
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.service.chunk_embedder import chunk_embeddings, embed_chunks
+
+
+class TestChunkEmbedding(unittest.TestCase):
+    def setUp(self):
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.embedding_service_mock.generate_embeddings_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+
+    def test_identical_contents_are_embedded_once(self):
+        # Given: a re-uploaded document whose chunks repeat the same content
+        chunks = [
+            DocumentChunk("c-1", "doc-1", "payslip", 0),
+            DocumentChunk("c-2", "doc-1", "attestation", 1),
+            DocumentChunk("c-3", "doc-1", "payslip", 2)
+        ]
+
+        # When: embedding the chunks
+        embed_chunks(chunks, self.embedding_service_mock)
+
+        # Then: each distinct content is sent once and equal contents get the same embedding
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once_with(["payslip", "attestation"])
+        self.assertEqual([chunk.embedding for chunk in chunks], [[7.0, 1.0], [11.0, 1.0], [7.0, 1.0]])
+
+    def test_existing_embeddings_are_kept(self):
+        # Given: chunks that already carry an embedding
+        chunks = [DocumentChunk("c-1", "doc-1", "a", 0, embedding=[9.0, 9.0]), DocumentChunk("c-2", "doc-1", "b", 1)]
+
+        # When: embedding them, then embedding them again
+        embed_chunks(chunks, self.embedding_service_mock)
+        embed_chunks(chunks, self.embedding_service_mock)
+
+        # Then: the existing embedding is untouched and only the missing one was generated
+        self.assertEqual(chunks[0].embedding, [9.0, 9.0])
+        self.assertEqual(chunks[1].embedding, [1.0, 1.0])
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once_with(["b"])
+
+    def test_chunk_embeddings_only_embeds_missing(self):
+        chunks = [DocumentChunk("c-1", "doc-1", "a", 0, embedding=[9.0, 9.0]), DocumentChunk("c-2", "doc-1", "bb", 1)]
+
+        self.assertEqual(chunk_embeddings(chunks, self.embedding_service_mock), [[9.0, 9.0], [2.0, 1.0]])
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once_with(["bb"])
+        self.assertEqual(chunk_embeddings([chunks[0]], self.embedding_service_mock), [[9.0, 9.0]])
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once()
@@ -8,6 +8,7 @@ from domain.port.document_repository_port import DocumentRepositoryPort
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
 from domain.port.document_processor_port import DocumentProcessorPort
 from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.port.near_duplicate_detector_port import NearDuplicateDetectorPort
 from domain.service.document_service import DocumentService
 
 
@@ -148,6 +149,75 @@ class TestDocumentService(unittest.TestCase):
         # Then: document is marked as failed
         self.assertEqual(document.status, DocumentStatus.FAILED)
 
+    def test_process_document_skips_near_duplicate_chunks(self):
+        # Given: a near-duplicate detector rejecting the second chunk
+        document_id = "doc-123"
+        document = Document(
+            document_id=document_id,
+            filename="test.pdf",
+            document_type=DocumentType.PDF,
+            file_path="/path/to/test.pdf",
+            chat_id="chat-456",
+            status=DocumentStatus.PENDING
+        )
+        chunks = [
+            DocumentChunk("chunk-1", document_id, "First chunk content", 0),
+            DocumentChunk("chunk-2", document_id, "First chunk c0ntent", 1)
+        ]
+        detector_mock = MagicMock(spec=NearDuplicateDetectorPort)
+        detector_mock.filter_near_duplicates.return_value = chunks[:1]
+        detector_mock.remove_document.return_value = []
+        service = DocumentService(
+            document_repository=self.document_repository_mock,
+            chunk_repository=self.chunk_repository_mock,
+            document_processor=self.document_processor_mock,
+            embedding_service=self.embedding_service_mock,
+            near_duplicate_detector=detector_mock
+        )
+        self.document_repository_mock.get_document_by_id.return_value = document
+        self.document_processor_mock.process_document.return_value = chunks
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.1, 0.2, 0.3]]
+
+        # When: processing the document
+        result = service.process_document(document_id)
+
+        # Then: only the kept chunk is embedded and saved
+        self.assertTrue(result)
+        detector_mock.filter_near_duplicates.assert_called_once_with(chunks)
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once_with(["First chunk content"])
+        self.chunk_repository_mock.save_chunks.assert_called_once_with(chunks[:1])
+
+        # When: deleting the document
+        service.delete_document(document_id)
+
+        # Then: the detector forgets its chunks
+        detector_mock.remove_document.assert_called_once_with(document_id)
+        self.chunk_repository_mock.save_chunks.assert_called_once()
+
+    def test_delete_document_stores_the_near_duplicates_of_other_documents(self):
+        # Given: a detector handing back a chunk of another document skipped as a copy of this one
+        document_id = "doc-123"
+        copy = DocumentChunk("doc-456_0", "doc-456", "First chunk c0ntent", 0, chat_id="chat-456")
+        detector_mock = MagicMock(spec=NearDuplicateDetectorPort)
+        detector_mock.remove_document.return_value = [copy]
+        service = DocumentService(
+            document_repository=self.document_repository_mock,
+            chunk_repository=self.chunk_repository_mock,
+            document_processor=self.document_processor_mock,
+            embedding_service=self.embedding_service_mock,
+            near_duplicate_detector=detector_mock
+        )
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.1, 0.2, 0.3]]
+
+        # When: deleting the source document
+        service.delete_document(document_id)
+
+        # Then: the copy is embedded and stored in its place
+        self.chunk_repository_mock.delete_chunks_by_document_id.assert_called_once_with(document_id)
+        detector_mock.remove_document.assert_called_once_with(document_id)
+        self.chunk_repository_mock.save_chunks.assert_called_once_with([copy])
+        self.assertEqual(copy.embedding, [0.1, 0.2, 0.3])
+
     def test_get_documents_for_chat(self):
         # Given: documents exist for a chat
         chat_id = "chat-123"
@@ -5,6 +5,7 @@ from typing import List
 from domain.model.document import Document, DocumentStatus, DocumentType
 from domain.model.document_chunk import DocumentChunk
 from domain.model.rag_query import RAGQuery, RAGResult
+from domain.model.scored_chunk import ScoredChunk
 from domain.model.history import History
 from domain.model.role_message import RoleMessage
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
@@ -77,9 +78,11 @@ class TestRAGService(unittest.TestCase):
         
         self.document_service_mock.get_processed_documents_for_chat.return_value = processed_docs
         self.embedding_service_mock.generate_embedding.return_value = query_embedding
-        self.chunk_repository_mock.search_similar_chunks.return_value = relevant_chunks
+        self.chunk_repository_mock.search_hybrid_chunks.return_value = [
+            ScoredChunk(relevant_chunks[0], 0.8, 1),
+            ScoredChunk(relevant_chunks[1], 0.7, 2)
+        ]
         self.rag_generator_mock.generate_response_with_context.return_value = generated_response
-        self.embedding_service_mock.calculate_similarity.side_effect = [0.8, 0.7]  # Mock similarities
 
         # When: querying with RAG
         result = self.rag_service.query_with_rag(query, chat_id, chat_history)
@@ -89,14 +92,18 @@ class TestRAGService(unittest.TestCase):
         self.assertEqual(result.generated_response, generated_response)
         self.assertEqual(len(result.relevant_chunks), 2)
         self.assertEqual(result.confidence_score, 0.75)  # Average of 0.8 and 0.7
+        self.assertEqual([scored_chunk.similarity for scored_chunk in result.scored_chunks], [0.8, 0.7])
+        self.embedding_service_mock.calculate_similarity.assert_not_called()
         
         # Verify method calls
         self.embedding_service_mock.generate_embedding.assert_called_once_with(query)
-        self.chunk_repository_mock.search_similar_chunks.assert_called_once_with(
+        self.chunk_repository_mock.search_hybrid_chunks.assert_called_once_with(
+            query_text=query,
             query_embedding=query_embedding,
             chat_id=chat_id,
             max_results=5,
-            similarity_threshold=0.7
+            similarity_threshold=0.7,
+            chunk_filter=None
         )
         self.rag_generator_mock.generate_response_with_context.assert_called_once_with(
             query, relevant_chunks, chat_history
@@ -117,7 +124,7 @@ class TestRAGService(unittest.TestCase):
         
         self.document_service_mock.get_processed_documents_for_chat.return_value = processed_docs
         self.embedding_service_mock.generate_embedding.return_value = query_embedding
-        self.chunk_repository_mock.search_similar_chunks.return_value = []  # No relevant chunks
+        self.chunk_repository_mock.search_hybrid_chunks.return_value = []  # No relevant chunks
         self.rag_generator_mock.generate_response_without_context.return_value = fallback_response
 
         # When: querying with RAG
@@ -144,9 +151,8 @@ class TestRAGService(unittest.TestCase):
         
         self.document_service_mock.get_processed_documents_for_chat.return_value = processed_docs
         self.embedding_service_mock.generate_embedding.return_value = query_embedding
-        self.chunk_repository_mock.search_similar_chunks.return_value = relevant_chunks
+        self.chunk_repository_mock.search_hybrid_chunks.return_value = [ScoredChunk(relevant_chunks[0], 0.9, 1)]
         self.rag_generator_mock.generate_response_with_context.return_value = "AI response"
-        self.embedding_service_mock.calculate_similarity.return_value = 0.9
 
         # When: querying with custom parameters
         result = self.rag_service.query_with_rag(
@@ -154,53 +160,51 @@ class TestRAGService(unittest.TestCase):
         )
 
         # Then: uses custom parameters
-        self.chunk_repository_mock.search_similar_chunks.assert_called_once_with(
+        self.chunk_repository_mock.search_hybrid_chunks.assert_called_once_with(
+            query_text=query,
             query_embedding=query_embedding,
             chat_id=chat_id,
             max_results=max_chunks,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            chunk_filter=None
         )
 
     def test_calculate_confidence_score_no_chunks(self):
-        # Given: no chunks
-        query_embedding = [0.1, 0.2, 0.3]
-        chunks = []
+        # Given: no scored chunks
+        scored_chunks = []
 
         # When: calculating confidence score
-        score = self.rag_service._calculate_confidence_score(query_embedding, chunks)
+        score = self.rag_service._calculate_confidence_score(scored_chunks)
 
         # Then: returns 0.0
         self.assertEqual(score, 0.0)
 
     def test_calculate_confidence_score_with_chunks(self):
-        # Given: chunks with embeddings
-        query_embedding = [0.1, 0.2, 0.3]
-        chunks = [
-            DocumentChunk("chunk-1", "doc-1", "content1", 0, [0.15, 0.25, 0.35]),
-            DocumentChunk("chunk-2", "doc-1", "content2", 1, [0.12, 0.22, 0.32])
+        # Given: chunks scored by the search
+        scored_chunks = [
+            ScoredChunk(DocumentChunk("chunk-1", "doc-1", "content1", 0), 0.8, 1),
+            ScoredChunk(DocumentChunk("chunk-2", "doc-1", "content2", 1), 0.6, 2)
         ]
-        
-        self.embedding_service_mock.calculate_similarity.side_effect = [0.8, 0.6]
 
         # When: calculating confidence score
-        score = self.rag_service._calculate_confidence_score(query_embedding, chunks)
+        score = self.rag_service._calculate_confidence_score(scored_chunks)
 
-        # Then: returns average similarity
-        self.assertEqual(score, 0.7)  # (0.8 + 0.6) / 2
+        # Then: returns average similarity without recomputing it
+        self.assertAlmostEqual(score, 0.7)  # (0.8 + 0.6) / 2
+        self.embedding_service_mock.calculate_similarity.assert_not_called()
 
-    def test_calculate_confidence_score_chunks_without_embeddings(self):
-        # Given: chunks without embeddings
-        query_embedding = [0.1, 0.2, 0.3]
-        chunks = [
-            DocumentChunk("chunk-1", "doc-1", "content1", 0),  # No embedding
-            DocumentChunk("chunk-2", "doc-1", "content2", 1)   # No embedding
+    def test_calculate_confidence_score_ignores_lexical_only_chunks(self):
+        # Given: a hybrid search result where one chunk was only found by the lexical search
+        scored_chunks = [
+            ScoredChunk(DocumentChunk("chunk-1", "doc-1", "content1", 0), 0.8, 1),
+            ScoredChunk(DocumentChunk("chunk-2", "doc-1", "APL-730", 1), 0.0, 2, lexical_only=True)
         ]
 
         # When: calculating confidence score
-        score = self.rag_service._calculate_confidence_score(query_embedding, chunks)
+        score = self.rag_service._calculate_confidence_score(scored_chunks)
 
-        # Then: returns 0.0
-        self.assertEqual(score, 0.0)
+        # Then: the lexical-only chunk does not lower it
+        self.assertAlmostEqual(score, 0.8)
 
     def test_get_document_context_for_chat(self):
         # Given: processed documents for a chat
@@ -1,14 +1,17 @@
 from typing import List, Optional
+from domain.model.chunk_filter import ChunkFilter
 from domain.model.document import Document, DocumentType, DocumentStatus
-from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
 from domain.model.rag_query import RAGQuery, RAGResult
 from domain.model.history import History
 from domain.port.document_processor_port import DocumentProcessorPort
 from domain.port.document_repository_port import DocumentRepositoryPort
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
 from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.port.near_duplicate_detector_port import NearDuplicateDetectorPort
 from domain.port.rag_generator_port import RAGGeneratorPort
 from domain.port.generator_controller_port import GeneratorControllerPort
+from domain.service.chunk_embedder import embed_chunks
 
 
 class RAGAdapter(GeneratorControllerPort):
@@ -19,12 +22,14 @@ class RAGAdapter(GeneratorControllerPort):
                  document_repository: DocumentRepositoryPort,
                  chunk_repository: DocumentChunkRepositoryPort,
                  embedding_service: EmbeddingServicePort,
-                 rag_generator: RAGGeneratorPort):
+                 rag_generator: RAGGeneratorPort,
+                 near_duplicate_detector: Optional[NearDuplicateDetectorPort] = None):
         self.document_processor = document_processor
         self.document_repository = document_repository
         self.chunk_repository = chunk_repository
         self.embedding_service = embedding_service
         self.rag_generator = rag_generator
+        self.near_duplicate_detector = near_duplicate_detector
     
     def generate_message(self, prompt: str, chat_history: list) -> str:
         """Generate a message using RAG if relevant documents exist, otherwise fallback to normal generation."""
@@ -85,7 +90,12 @@ class RAGAdapter(GeneratorControllerPort):
             # Process document to extract chunks
             chunks = self.document_processor.process_document(saved_document)
             
-            # Save chunks with embeddings
+            # Skip chunks nearly identical to one already stored in the chat
+            if self.near_duplicate_detector is not None:
+                chunks = self.near_duplicate_detector.filter_near_duplicates(chunks)
+            
+            # Embed each distinct content once, then save chunks with embeddings
+            embed_chunks(chunks, self.embedding_service)
             self.chunk_repository.save_chunks(chunks)
             
             # Update document status to processed
@@ -96,6 +106,7 @@ class RAGAdapter(GeneratorControllerPort):
             
         except Exception as e:
             # Update document status to failed
+            self._forget_near_duplicate_source(saved_document.document_id)
             self.document_repository.update_document_status(
                 saved_document.document_id, 
                 DocumentStatus.FAILED
@@ -104,7 +115,14 @@ class RAGAdapter(GeneratorControllerPort):
         
         return saved_document
     
-    def query_with_rag(self, query: str, chat_id: str, max_chunks: int = 5, similarity_threshold: float = 0.7) -> RAGResult:
+    def query_with_rag(
+        self,
+        query: str,
+        chat_id: str,
+        max_chunks: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> RAGResult:
         """Query the RAG system and return results."""
         rag_query = RAGQuery(
             query=query,
@@ -116,33 +134,46 @@ class RAGAdapter(GeneratorControllerPort):
         # Generate query embedding
         query_embedding = self.embedding_service.generate_embedding(query)
         
-        # Search for similar chunks
-        relevant_chunks = self.chunk_repository.search_similar_chunks(
+        # Search for similar chunks (lexical matches are fused in when the repository supports them)
+        scored_chunks = self.chunk_repository.search_hybrid_chunks(
+            query_text=query,
             query_embedding=query_embedding,
             chat_id=chat_id,
             max_results=max_chunks,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            chunk_filter=chunk_filter
         )
         
         # For now, we'll generate the response in the calling method
         # This allows for better separation of concerns
         return RAGResult(
             query=rag_query,
-            relevant_chunks=relevant_chunks,
+            relevant_chunks=[scored_chunk.chunk for scored_chunk in scored_chunks],
             generated_response="",  # Will be generated by calling method
-            confidence_score=self._calculate_confidence(relevant_chunks)
+            confidence_score=self._calculate_confidence(scored_chunks),
+            scored_chunks=scored_chunks
         )
     
     def remove_document(self, document_id: str) -> bool:
         """Remove a document and its chunks from the RAG system."""
         # Remove chunks first
         chunks_removed = self.chunk_repository.delete_chunks_by_document_id(document_id)
+        self._forget_near_duplicate_source(document_id)
         
         # Remove document
         document_removed = self.document_repository.delete_document(document_id)
         
         return chunks_removed and document_removed
     
+    def _forget_near_duplicate_source(self, document_id: str) -> None:
+        """Unregister a document's chunks from the detector, storing the near-duplicates they stood in for."""
+        if self.near_duplicate_detector is None:
+            return
+        restored = self.near_duplicate_detector.remove_document(document_id)
+        if restored:
+            embed_chunks(restored, self.embedding_service)
+            self.chunk_repository.save_chunks(restored)
+    
     def list_documents_for_chat(self, chat_id: str) -> List[Document]:
         """List all documents for a specific chat."""
         return self.document_repository.get_documents_by_chat_id(chat_id)
@@ -158,12 +189,10 @@ class RAGAdapter(GeneratorControllerPort):
         # You might have chat_id in the history or need to derive it differently
         return "default_chat"
     
-    def _calculate_confidence(self, chunks: List[DocumentChunk]) -> float:
-        """Calculate confidence score based on retrieved chunks."""
-        if not chunks:
+    def _calculate_confidence(self, scored_chunks: List[ScoredChunk]) -> float:
+        """Calculate confidence score as the average similarity of the chunks the vector search retrieved."""
+        similarities = [scored_chunk.similarity for scored_chunk in scored_chunks if not scored_chunk.lexical_only]
+        if not similarities:
             return 0.0
         
-        # Simple confidence calculation - can be improved
-        # Based on number of chunks and their relevance
-        base_confidence = min(len(chunks) / 5.0, 1.0)  # Normalize to max 5 chunks
-        return base_confidence 
\ No newline at end of file
+        return sum(similarities) / len(similarities) 
\ No newline at end of file
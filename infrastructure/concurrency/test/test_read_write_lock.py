@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+
+from infrastructure.concurrency.read_write_lock import ReadWriteLock
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Unit tests for ReadWriteLock."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.lock = ReadWriteLock()
+
+    def test_readers_share_the_lock(self):
+        """Test that a reader gets in while another reader holds the lock."""
+        entered = threading.Event()
+        with self.lock.read():
+            thread = threading.Thread(target=lambda: self._read_then_set(entered))
+            thread.start()
+            self.assertTrue(entered.wait(1.0))
+        thread.join()
+
+    def test_writer_excludes_readers_and_is_preferred(self):
+        """Test that a waiting writer goes before readers arriving after it."""
+        order = []
+
+        def write():
+            with self.lock.write():
+                order.append("writer")
+
+        def read():
+            with self.lock.read():
+                order.append("reader")
+
+        with self.lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            while not self.lock._waiting_writers:
+                time.sleep(0.001)
+            reader = threading.Thread(target=read)
+            reader.start()
+            self.assertEqual(order, [])
+        writer.join(1.0)
+        reader.join(1.0)
+
+        self.assertEqual(order, ["writer", "reader"])
+
+    def _read_then_set(self, event):
+        with self.lock.read():
+            event.set()
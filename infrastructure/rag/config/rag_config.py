@@ -13,6 +13,25 @@ class RAGConfig:
     cohere_api_key: str = os.environ.get('COHERE_API_KEY', '')
     embedding_model: str = "embed-english-v3.0"
     chat_model: str = "command-r-plus"
+    # Embedding backend: "cohere", or "hashing" for deterministic local vectors of
+    # local_embedding_dimensions (load tests without network or API key; no generation then)
+    embedding_backend: str = "cohere"
+    local_embedding_dimensions: int = 1024
+    # Texts per embed request (at most 96 for Cohere), requests in flight, retries per request
+    embedding_batch_size: int = 96
+    embedding_workers: int = 4
+    embedding_max_retries: int = 3
+    # Query micro-batching: single-text embeddings requested within micro_batch_max_wait seconds
+    # of each other are sent together (up to embedding_batch_size, embedding_workers calls in flight)
+    embedding_micro_batching: bool = False
+    micro_batch_max_wait: float = 0.005
+    
+    # Embedding cache settings: embeddings keyed by model, input type and text hash, kept in an
+    # LRU of up to embedding_cache_max_bytes and, when persistent, in a SQLite file under storage_path;
+    # re-uploaded chunk contents reuse their embeddings through it
+    embedding_cache: bool = False
+    embedding_cache_max_bytes: int = 64 * 1024 * 1024
+    embedding_cache_persistent: bool = True
     
     # Document processing settings
     chunk_size: int = 1000
@@ -22,14 +41,85 @@ class RAGConfig:
     similarity_threshold: float = 0.3
     max_chunks_per_query: int = 5
     
+    # Vector index settings ("flat" for exact search, "hnsw" or "ivf" for approximate indexes,
+    # "int8" or "float16" for scalar-quantized storage, "binary" for a sign-bit first pass,
+    # "pq" for product quantization, "truncated" for a reduced-dimension first pass); only the
+    # "memory" storage backend supports types other than "flat"
+    vector_index_type: str = "flat"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 100
+    hnsw_ef_search: int = 64
+    ivf_nlist: int = 0  # 0 picks sqrt(corpus size) at training time
+    ivf_nprobe: int = 8
+    ivf_retrain_growth_factor: float = 2.0
+    ivf_min_training_size: int = 1000
+    quantized_rescore_candidates: int = 0  # > 0 keeps float32 copies to rescore that many candidates
+    binary_rescore_candidates: int = 200
+    pq_subspaces: int = 64
+    pq_min_training_size: int = 10000
+    truncated_dimensions: int = 128
+    truncated_projection: str = "prefix"  # "prefix" or "pca"
+    truncated_rescore_candidates: int = 200
+    truncated_min_training_size: int = 1000  # rows stored before the PCA projection is fitted
+    
+    # Segment settings: rows per segment, and the tombstoned fraction that triggers compaction
+    segment_size: int = 50000
+    compaction_deleted_ratio: float = 0.5
+    
+    # Storage settings ("memory" keeps everything in process, "mmap" persists chunks in
+    # memory-mapped files and documents in a SQLite database shared by the worker processes,
+    # "sqlite" persists both in that database; files go under storage_path)
+    storage_backend: str = "memory"
+    storage_path: str = "./data/rag_store"
+    # With "mmap", the first worker process to open the chunk store becomes its writer and the
+    # others open it read-only, serving searches from the writer's files through shared memory
+    # maps and forwarding their writes to the writer; True opens it read-only in every process
+    storage_read_only: bool = False
+    
+    # Hybrid search settings: BM25 lexical search fused with the vector search by reciprocal
+    # rank fusion, each leg returning up to hybrid_candidates chunks
+    hybrid_search: bool = False
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    rrf_k: int = 60
+    hybrid_candidates: int = 20
+    
+    # Diversification settings: maximal marginal relevance over mmr_fetch_factor times more
+    # candidates than requested (mmr_lambda 1.0 ranks by relevance only, 0.0 by diversity only)
+    mmr_enabled: bool = False
+    mmr_lambda: float = 0.5
+    mmr_fetch_factor: int = 4
+    
+    # Near-duplicate settings: chunks whose MinHash-estimated Jaccard similarity with a chunk
+    # already stored in the chat reaches near_duplicate_threshold are not stored again
+    near_duplicate_detection: bool = False
+    near_duplicate_threshold: float = 0.9
+    minhash_permutations: int = 128
+    
     # Generation settings
     temperature: float = 0.7
     max_tokens: int = 1000
     
     def validate(self) -> bool:
         """Validate the configuration."""
-        if not self.cohere_api_key:
+        if self.embedding_backend not in ("cohere", "hashing"):
+            raise ValueError(f"Unsupported embedding backend: {self.embedding_backend}")
+        if self.embedding_backend == "cohere" and not self.cohere_api_key:
             raise ValueError("COHERE_API_KEY environment variable is required")
+        if self.vector_index_type not in ("flat", "hnsw", "ivf", "int8", "float16", "binary", "pq", "truncated"):
+            raise ValueError(f"Unsupported vector index type: {self.vector_index_type}")
+        if not 0.0 < self.compaction_deleted_ratio <= 1.0:
+            raise ValueError("compaction_deleted_ratio must be in (0, 1]")
+        if self.storage_backend not in ("memory", "mmap", "sqlite"):
+            raise ValueError(f"Unsupported storage backend: {self.storage_backend}")
+        if not 0.0 <= self.mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda must be in [0, 1]")
+        if not 0.0 < self.near_duplicate_threshold <= 1.0:
+            raise ValueError("near_duplicate_threshold must be in (0, 1]")
+        if self.micro_batch_max_wait < 0:
+            raise ValueError("micro_batch_max_wait must not be negative")
+        if self.embedding_cache_max_bytes < 0:
+            raise ValueError("embedding_cache_max_bytes must not be negative")
         return True
 
 
@@ -68,11 +68,21 @@ class DocumentProcessor(DocumentProcessorPort):
         chunks = []
         for i, chunk_text in enumerate(text_chunks):
             chunk = DocumentChunk(
+                chunk_id=f"{document.document_id}_{i}",
                 content=chunk_text,
                 chunk_index=i,
                 document_id=document.document_id,
+                metadata=self._chunk_metadata(document),
                 chat_id=document.chat_id
             )
             chunks.append(chunk)
         
-        return chunks 
\ No newline at end of file
+        return chunks
+    
+    def _chunk_metadata(self, document: Document) -> dict:
+        """Document attributes copied onto each chunk so searches can filter on them."""
+        return {
+            **document.metadata,
+            "document_type": document.document_type.value,
+            "created_at": document.created_at.isoformat()
+        }
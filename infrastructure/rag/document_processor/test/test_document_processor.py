@@ -221,8 +221,7 @@ class TestDocumentProcessor(unittest.TestCase):
             self.assertEqual(chunk.content, f"Chunk {i + 1}")
             self.assertEqual(chunk.chunk_index, i)
             self.assertEqual(chunk.document_id, self.pdf_document.document_id)
-            # Note: This test will fail due to the bug in the implementation
-            # The DocumentChunk constructor requires chunk_id but it's not provided
+            self.assertEqual(chunk.chunk_id, f"{self.pdf_document.document_id}_{i}")
 
     @patch.object(DocumentProcessor, 'extract_text_from_image')
     @patch.object(DocumentProcessor, 'split_text_into_chunks')
@@ -315,7 +314,9 @@ class TestDocumentProcessor(unittest.TestCase):
         self.assertEqual(chunk.document_id, self.pdf_document.document_id)
         self.assertEqual(chunk.chunk_index, 0)
         self.assertEqual(chunk.content, "Chunk content")
-        # Note: chat_id is not being set in the current implementation - this is a bug
+        self.assertEqual(chunk.chat_id, self.pdf_document.chat_id)
+        self.assertEqual(chunk.metadata["document_type"], "pdf")
+        self.assertEqual(chunk.metadata["created_at"], self.pdf_document.created_at.isoformat())
 
     def test_chunk_size_and_overlap_validation(self):
         """Test that chunk size and overlap parameters are properly validated."""
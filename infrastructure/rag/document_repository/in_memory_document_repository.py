@@ -1,53 +1,94 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from domain.model.document import Document, DocumentStatus
 from domain.port.document_repository_port import DocumentRepositoryPort
+from infrastructure.concurrency.read_write_lock import ReadWriteLock
 
 
 class InMemoryDocumentRepository(DocumentRepositoryPort):
-    """In-memory implementation of document repository."""
-    
+    """In-memory implementation of document repository.
+
+    Documents are kept in a dict keyed by document ID, with secondary indexes from chat ID and
+    from status to document IDs, so every lookup and mutation is O(1) (plus the size of the
+    returned list). The secondary indexes are dicts used as insertion-ordered sets; saving a document
+    again only moves it in the index whose key changed, so the other lists keep their order. Lookups
+    share a reader-writer lock and mutations take it exclusively, so the three dicts never disagree.
+    """
+
     def __init__(self):
-        self.documents: List[Document] = []
-    
+        self.documents: Dict[str, Document] = {}
+        self._ids_by_chat: Dict[str, Dict[str, None]] = {}
+        self._ids_by_status: Dict[DocumentStatus, Dict[str, None]] = {}
+        # Chat and status each document is indexed under; documents are mutated in place before
+        # being saved again, so the previous values cannot be read from the document itself
+        self._indexed_keys: Dict[str, tuple] = {}
+        self._lock = ReadWriteLock()
+
     def save_document(self, document: Document) -> Document:
         """Save a document to the repository."""
-        # Check if document already exists and update it
-        for i, existing_doc in enumerate(self.documents):
-            if existing_doc.document_id == document.document_id:
-                self.documents[i] = document
-                return document
-        
-        # Add new document
-        self.documents.append(document)
+        # Replacing an existing document keeps its position
+        with self._lock.write():
+            self.documents[document.document_id] = document
+            self._index(document)
         return document
-    
+
     def get_document_by_id(self, document_id: str) -> Optional[Document]:
         """Retrieve a document by its ID."""
-        for document in self.documents:
-            if document.document_id == document_id:
-                return document
-        return None
-    
+        with self._lock.read():
+            return self.documents.get(document_id)
+
     def get_documents_by_chat_id(self, chat_id: str) -> List[Document]:
         """Get all documents for a specific chat."""
-        return [doc for doc in self.documents if doc.chat_id == chat_id]
-    
+        with self._lock.read():
+            return [self.documents[document_id] for document_id in self._ids_by_chat.get(chat_id, ())]
+
     def get_documents_by_status(self, status: DocumentStatus) -> List[Document]:
         """Get all documents with a specific status."""
-        return [doc for doc in self.documents if doc.status == status]
-    
+        with self._lock.read():
+            return [self.documents[document_id] for document_id in self._ids_by_status.get(status, ())]
+
     def update_document_status(self, document_id: str, status: DocumentStatus) -> bool:
         """Update the status of a document."""
-        for document in self.documents:
-            if document.document_id == document_id:
-                document.status = status
-                return True
-        return False
-    
+        with self._lock.write():
+            document = self.documents.get(document_id)
+            if document is None:
+                return False
+            document.status = status
+            self._index(document)
+        return True
+
     def delete_document(self, document_id: str) -> bool:
         """Delete a document from the repository."""
-        for i, document in enumerate(self.documents):
-            if document.document_id == document_id:
-                del self.documents[i]
-                return True
-        return False 
\ No newline at end of file
+        with self._lock.write():
+            if document_id not in self.documents:
+                return False
+            self._unindex(document_id)
+            del self.documents[document_id]
+        return True
+
+    def _index(self, document: Document) -> None:
+        document_id = document.document_id
+        previous = self._indexed_keys.get(document_id)
+        if previous is None or previous[0] != document.chat_id:
+            if previous is not None:
+                self._discard(self._ids_by_chat, previous[0], document_id)
+            self._ids_by_chat.setdefault(document.chat_id, {})[document_id] = None
+        if previous is None or previous[1] != document.status:
+            if previous is not None:
+                self._discard(self._ids_by_status, previous[1], document_id)
+            self._ids_by_status.setdefault(document.status, {})[document_id] = None
+        self._indexed_keys[document_id] = (document.chat_id, document.status)
+
+    def _unindex(self, document_id: str) -> None:
+        keys = self._indexed_keys.pop(document_id, None)
+        if keys is None:
+            return
+        chat_id, status = keys
+        self._discard(self._ids_by_chat, chat_id, document_id)
+        self._discard(self._ids_by_status, status, document_id)
+
+    @staticmethod
+    def _discard(index: dict, key, document_id: str) -> None:
+        ids = index[key]
+        del ids[document_id]
+        if not ids:
+            del index[key]
@@ -0,0 +1,105 @@
+import json
+import threading
+from datetime import datetime
+from typing import List, Optional
+from domain.model.document import Document, DocumentStatus, DocumentType
+from domain.port.document_repository_port import DocumentRepositoryPort
+from infrastructure.sqlite.connection import open_connection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    document_id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    document_type TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_chat_id ON documents (chat_id);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status);
+"""
+
+COLUMNS = "document_id, filename, document_type, file_path, chat_id, status, metadata, created_at"
+
+
+class SQLiteDocumentRepository(DocumentRepositoryPort):
+    """Document repository stored in a SQLite database (WAL mode), indexed on chat_id and status."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = open_connection(path)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def save_document(self, document: Document) -> Document:
+        """Insert a document, or update it in place if it already exists."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO documents ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (document_id) DO UPDATE SET filename = excluded.filename, "
+                "document_type = excluded.document_type, file_path = excluded.file_path, "
+                "chat_id = excluded.chat_id, status = excluded.status, metadata = excluded.metadata, "
+                "created_at = excluded.created_at",
+                (
+                    document.document_id,
+                    document.filename,
+                    document.document_type.value,
+                    document.file_path,
+                    document.chat_id,
+                    document.status.value,
+                    json.dumps(document.metadata),
+                    document.created_at.isoformat()
+                )
+            )
+        return document
+
+    def get_document_by_id(self, document_id: str) -> Optional[Document]:
+        """Retrieve a document by its ID."""
+        documents = self._select("WHERE document_id = ?", (document_id,))
+        return documents[0] if documents else None
+
+    def get_documents_by_chat_id(self, chat_id: str) -> List[Document]:
+        """Get all documents for a specific chat."""
+        return self._select("WHERE chat_id = ? ORDER BY rowid", (chat_id,))
+
+    def get_documents_by_status(self, status: DocumentStatus) -> List[Document]:
+        """Get all documents with a specific status."""
+        return self._select("WHERE status = ? ORDER BY rowid", (status.value,))
+
+    def update_document_status(self, document_id: str, status: DocumentStatus) -> bool:
+        """Update the status of a document."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE documents SET status = ? WHERE document_id = ?", (status.value, document_id)
+            )
+        return cursor.rowcount > 0
+
+    def delete_document(self, document_id: str) -> bool:
+        """Delete a document from the repository."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+        return cursor.rowcount > 0
+
+    def _select(self, clause: str, parameters: tuple) -> List[Document]:
+        with self._lock:
+            rows = self._connection.execute(f"SELECT {COLUMNS} FROM documents {clause}", parameters).fetchall()
+        return [
+            Document(
+                document_id=document_id,
+                filename=filename,
+                document_type=DocumentType(document_type),
+                file_path=file_path,
+                chat_id=chat_id,
+                status=DocumentStatus(status),
+                metadata=json.loads(metadata),
+                created_at=datetime.fromisoformat(created_at)
+            )
+            for document_id, filename, document_type, file_path, chat_id, status, metadata, created_at in rows
+        ]
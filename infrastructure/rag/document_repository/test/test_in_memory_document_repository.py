@@ -0,0 +1,107 @@
+import threading
+import unittest
+
+from domain.model.document import Document, DocumentStatus, DocumentType
+from infrastructure.rag.document_repository.in_memory_document_repository import InMemoryDocumentRepository
+
+
+class TestInMemoryDocumentRepository(unittest.TestCase):
+    """Unit tests for InMemoryDocumentRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.repository = InMemoryDocumentRepository()
+        self.documents = [
+            Document("doc-1", "a.pdf", DocumentType.PDF, "/a.pdf", "chat-1"),
+            Document("doc-2", "b.pdf", DocumentType.PDF, "/b.pdf", "chat-2"),
+            Document("doc-3", "c.png", DocumentType.IMAGE, "/c.png", "chat-1")
+        ]
+        for document in self.documents:
+            self.repository.save_document(document)
+
+    def test_lookups_by_id_chat_and_status(self):
+        """Test that the primary and secondary indexes return documents in insertion order."""
+        self.assertIs(self.repository.get_document_by_id("doc-2"), self.documents[1])
+        self.assertIsNone(self.repository.get_document_by_id("missing"))
+        self.assertEqual(self.repository.get_documents_by_chat_id("chat-1"), [self.documents[0], self.documents[2]])
+        self.assertEqual(self.repository.get_documents_by_chat_id("missing"), [])
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PENDING), self.documents)
+
+    def test_status_index_follows_in_place_changes_on_save(self):
+        """Test that a document mutated in place is re-indexed when it is saved again."""
+        document = self.documents[0]
+        document.mark_as_processed()
+        self.repository.save_document(document)
+
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PROCESSED), [document])
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PENDING), self.documents[1:])
+
+    def test_saving_again_keeps_the_order_of_unchanged_indexes(self):
+        """Test that saving or updating a document does not move it in the chat or status lists it stays in."""
+        self.repository.save_document(self.documents[0])
+        self.repository.update_document_status("doc-1", DocumentStatus.PENDING)
+        self.documents[0].mark_as_processed()
+        self.repository.save_document(self.documents[0])
+
+        self.assertEqual(self.repository.get_documents_by_chat_id("chat-1"), [self.documents[0], self.documents[2]])
+        self.documents[0].status = DocumentStatus.PENDING
+        self.repository.save_document(self.documents[0])
+        self.assertEqual(self.repository.get_documents_by_chat_id("chat-1"), [self.documents[0], self.documents[2]])
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PENDING), self.documents[1:] + self.documents[:1])
+
+    def test_update_document_status(self):
+        """Test that status updates move the document between status buckets."""
+        self.assertTrue(self.repository.update_document_status("doc-3", DocumentStatus.FAILED))
+        self.assertFalse(self.repository.update_document_status("missing", DocumentStatus.FAILED))
+
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.FAILED), [self.documents[2]])
+        self.assertEqual(self.documents[2].status, DocumentStatus.FAILED)
+
+    def test_delete_document_updates_every_index(self):
+        """Test that a deleted document disappears from all lookups."""
+        self.assertTrue(self.repository.delete_document("doc-1"))
+        self.assertFalse(self.repository.delete_document("doc-1"))
+
+        self.assertIsNone(self.repository.get_document_by_id("doc-1"))
+        self.assertEqual(self.repository.get_documents_by_chat_id("chat-1"), [self.documents[2]])
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PENDING), self.documents[1:])
+
+    def test_concurrent_writes_and_lookups(self):
+        """Stress test: concurrent saves, status updates, deletes and lookups keep the indexes consistent."""
+        errors = []
+
+        def write(writer):
+            for i in range(200):
+                document = Document(f"doc-{writer}-{i}", "a.pdf", DocumentType.PDF, "/a.pdf", f"chat-{i % 3}")
+                self.repository.save_document(document)
+                self.repository.update_document_status(document.document_id, DocumentStatus.PROCESSED)
+                if i % 2:
+                    self.repository.delete_document(document.document_id)
+
+        def read():
+            for i in range(200):
+                for document in self.repository.get_documents_by_status(DocumentStatus.PROCESSED):
+                    if document.status != DocumentStatus.PROCESSED:
+                        errors.append(f"{document.document_id} listed as processed while {document.status}")
+                self.repository.get_documents_by_chat_id(f"chat-{i % 3}")
+
+        def run(target, *args):
+            try:
+                target(*args)
+            except Exception as e:
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=run, args=(write, writer)) for writer in range(4)]
+        threads += [threading.Thread(target=run, args=(read,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        processed = self.repository.get_documents_by_status(DocumentStatus.PROCESSED)
+        self.assertEqual(len(processed), 4 * 100)
+        self.assertEqual(
+            sum(len(self.repository.get_documents_by_chat_id(f"chat-{chat}")) for chat in range(3)),
+            4 * 100 + len(self.documents)
+        )
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from domain.model.document import Document, DocumentStatus, DocumentType
+from infrastructure.rag.document_repository.sqlite_document_repository import SQLiteDocumentRepository
+
+
+class TestSQLiteDocumentRepository(unittest.TestCase):
+    """Unit tests for SQLiteDocumentRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rag.sqlite3")
+        self.repository = SQLiteDocumentRepository(self.path)
+        self.document = Document("doc-1", "a.pdf", DocumentType.PDF, "/a.pdf", "chat-1", metadata={"pages": 2})
+        self.repository.save_document(self.document)
+        self.repository.save_document(Document("doc-2", "b.png", DocumentType.IMAGE, "/b.png", "chat-1"))
+
+    def tearDown(self):
+        """Close the database and remove it."""
+        self.repository.close()
+        self.directory.cleanup()
+
+    def test_save_and_reopen(self):
+        """Test that documents round-trip through the database, including updates."""
+        self.document.mark_as_processed()
+        self.repository.save_document(self.document)
+        self.repository.close()
+
+        self.repository = SQLiteDocumentRepository(self.path)
+        document = self.repository.get_document_by_id("doc-1")
+
+        self.assertEqual(document.filename, "a.pdf")
+        self.assertEqual(document.document_type, DocumentType.PDF)
+        self.assertEqual(document.metadata, {"pages": 2})
+        self.assertEqual(document.created_at, self.document.created_at)
+        self.assertTrue(document.is_processed())
+        self.assertIsNone(self.repository.get_document_by_id("missing"))
+
+    def test_instances_share_the_database(self):
+        """Test that documents saved by several processes' instances over one database all survive."""
+        other = SQLiteDocumentRepository(self.path)
+        try:
+            other.save_document(Document("doc-3", "c.pdf", DocumentType.PDF, "/c.pdf", "chat-1"))
+            self.repository.save_document(Document("doc-4", "d.pdf", DocumentType.PDF, "/d.pdf", "chat-1"))
+
+            expected = ["doc-1", "doc-2", "doc-3", "doc-4"]
+            for repository in (self.repository, other):
+                self.assertEqual([document.document_id for document in repository.get_documents_by_chat_id("chat-1")], expected)
+        finally:
+            other.close()
+
+    def test_queries_by_chat_and_status(self):
+        """Test the chat and status lookups and status updates."""
+        self.assertTrue(self.repository.update_document_status("doc-2", DocumentStatus.FAILED))
+        self.assertFalse(self.repository.update_document_status("missing", DocumentStatus.FAILED))
+
+        self.assertEqual([doc.document_id for doc in self.repository.get_documents_by_chat_id("chat-1")], ["doc-1", "doc-2"])
+        self.assertEqual([doc.document_id for doc in self.repository.get_documents_by_status(DocumentStatus.FAILED)], ["doc-2"])
+        self.assertEqual(self.repository.get_documents_by_status(DocumentStatus.PROCESSED), [])
+
+    def test_delete_document(self):
+        """Test that deleted documents are gone."""
+        self.assertTrue(self.repository.delete_document("doc-1"))
+        self.assertFalse(self.repository.delete_document("doc-1"))
+        self.assertEqual([doc.document_id for doc in self.repository.get_documents_by_chat_id("chat-1")], ["doc-2"])
@@ -0,0 +1,178 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.sqlite.connection import open_connection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model_name TEXT NOT NULL,
+    input_type TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    PRIMARY KEY (model_name, input_type, content_hash)
+) WITHOUT ROWID;
+"""
+
+# Hashes looked up per statement, below the host parameter limit of older SQLite builds
+LOOKUP_BATCH_SIZE = 500
+
+CacheKey = Tuple[str, str, str]
+
+
+class CachedEmbeddingService(EmbeddingServicePort):
+    """Embedding service answering from a content-addressed cache before calling another one.
+
+    Entries are keyed by (model_name, input_type, SHA-256 of the text), so one cache file can be
+    shared by services using different models. Lookups go through a memory tier, an LRU bounded
+    by the bytes of its vectors, then through an optional SQLite tier at path that survives
+    restarts; disk hits are promoted to memory. A batch sends only the texts found in neither tier
+    upstream, once each, and gets its embeddings back in input order. Embeddings are stored as
+    float32, and hits and misses alike are returned from the stored values, so a text always
+    gets the same vector.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        path: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        model_name: Optional[str] = None,
+        input_type: Optional[str] = None
+    ):
+        if max_bytes < 0:
+            raise ValueError("Embedding cache max_bytes must not be negative")
+        self.embedding_service = embedding_service
+        self.path = path
+        self.max_bytes = max_bytes
+        self.model_name = model_name or getattr(embedding_service, "model_name", type(embedding_service).__name__)
+        self.input_type = input_type or getattr(embedding_service, "input_type", "search_document")
+        # Texts served from either tier (disk_hits counts those read from disk), and texts sent upstream
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = open_connection(path)
+            with self._lock, self._connection:
+                self._connection.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes of the vectors held by the memory tier."""
+        return self._memory_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the requested texts served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._connection is not None:
+            self._connection.close()
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding vector for a text, unless it is cached."""
+        key = self._key(text)
+        cached = self._lookup([key])
+        if key in cached:
+            self._count(hits=1, misses=0)
+            return cached[key].tolist()
+        stored = self._store({key: self.embedding_service.generate_embedding(text)})
+        self._count(hits=0, misses=1)
+        return stored[key].tolist()
+
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts, sending only the uncached ones upstream."""
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+        found = self._lookup(dict.fromkeys(keys))
+        # One entry per uncached text, in first-seen order
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            embeddings = self.embedding_service.generate_embeddings_batch(list(missing.values()))
+            found.update(self._store(dict(zip(missing, embeddings))))
+        self._count(hits=len(texts) - len(missing), misses=len(missing))
+        return [found[key].tolist() for key in keys]
+
+    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+        """Calculate similarity with the wrapped service."""
+        return self.embedding_service.calculate_similarity(embedding1, embedding2)
+
+    def _key(self, text: str) -> CacheKey:
+        return self.model_name, self.input_type, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _lookup(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, np.ndarray]:
+        """Cached vectors of the keys found in memory, then on disk."""
+        found: Dict[CacheKey, np.ndarray] = {}
+        with self._lock:
+            absent = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    absent.append(key)
+            if absent and self._connection is not None:
+                loaded = self._load(absent)
+                self.disk_hits += len(loaded)
+                for key, vector in loaded.items():
+                    self._remember(key, vector)
+                found.update(loaded)
+        return found
+
+    def _load(self, keys: List[CacheKey]) -> Dict[CacheKey, np.ndarray]:
+        loaded = {}
+        hashes = [content_hash for _, _, content_hash in keys]
+        for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            batch = hashes[start:start + LOOKUP_BATCH_SIZE]
+            rows = self._connection.execute(
+                "SELECT content_hash, embedding FROM embeddings "
+                f"WHERE model_name = ? AND input_type = ? AND content_hash IN ({', '.join('?' * len(batch))})",
+                [self.model_name, self.input_type, *batch]
+            )
+            for content_hash, embedding in rows:
+                loaded[(self.model_name, self.input_type, content_hash)] = np.frombuffer(embedding, dtype=np.float32)
+        return loaded
+
+    def _store(self, embeddings: Dict[CacheKey, List[float]]) -> Dict[CacheKey, np.ndarray]:
+        vectors = {key: np.asarray(embedding, dtype=np.float32) for key, embedding in embeddings.items()}
+        with self._lock:
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model_name, input_type, content_hash, embedding) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(*key, vector.tobytes()) for key, vector in vectors.items()]
+                    )
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+        return vectors
+
+    def _remember(self, key: CacheKey, vector: np.ndarray) -> None:
+        """Put a vector in the memory tier, evicting the least recently used ones beyond max_bytes."""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
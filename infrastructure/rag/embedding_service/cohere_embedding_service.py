@@ -1,41 +1,86 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 import cohere
+import httpx
 import numpy as np
+from cohere.core.api_error import ApiError
 from dotenv import load_dotenv
 from domain.port.embedding_service_port import EmbeddingServicePort
 
 load_dotenv()
 COHERE_API_KEY = os.environ.get('COHERE_API_KEY')
 
+# Texts accepted by a single Cohere embed request
+MAX_BATCH_SIZE = 96
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed request may succeed if sent again: rate limits, 5xx, connection errors, timeouts."""
+    if isinstance(error, ApiError):
+        return error.status_code is not None and (error.status_code == 429 or error.status_code >= 500)
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
 
 class CohereEmbeddingService(EmbeddingServicePort):
-    """Cohere implementation for embedding generation and similarity calculation."""
+    """Cohere implementation for embedding generation and similarity calculation.
+
+    Batches larger than max_batch_size are split into provider-sized requests sent concurrently
+    by up to max_workers threads, and the embeddings are reassembled in input order. A request
+    failing with a transient error is retried on its own, max_retries times with exponential
+    backoff, so one hiccup does not fail a whole document; other errors (invalid key or request)
+    are raised at once.
+    """
     
-    def __init__(self, model_name: str = "embed-english-v3.0"):
+    def __init__(
+        self,
+        model_name: str = "embed-english-v3.0",
+        input_type: str = "search_document",
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ):
+        if not 1 <= max_batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Embedding batch size must be in [1, {MAX_BATCH_SIZE}]")
         self.client = cohere.Client(COHERE_API_KEY)
         self.model_name = model_name
+        self.input_type = input_type
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding-batch")
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding vector for a text."""
-        response = self.client.embed(
-            texts=[text],
-            model=self.model_name,
-            input_type="search_document"
-        )
-        return response.embeddings[0]
+        return self._embed([text])[0]
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
+        """Generate embeddings for multiple texts, one concurrent request per provider-sized batch."""
         if not texts:
             return []
         
-        response = self.client.embed(
-            texts=texts,
-            model=self.model_name,
-            input_type="search_document"
-        )
-        return response.embeddings
+        batches = [texts[start:start + self.max_batch_size] for start in range(0, len(texts), self.max_batch_size)]
+        if len(batches) == 1:
+            return self._embed(batches[0])
+        # map yields the batch results in submission order, whatever order they complete in
+        return [embedding for batch in self._executor.map(self._embed, batches) for embedding in batch]
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed one request's worth of texts, retrying failed attempts."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.embed(
+                    texts=texts,
+                    model=self.model_name,
+                    input_type=self.input_type
+                )
+                return response.embeddings
+            except Exception as error:
+                if attempt == self.max_retries or not is_transient(error):
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
     
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between two embeddings."""
@@ -0,0 +1,57 @@
+import re
+import zlib
+from collections import Counter
+from typing import List, Optional
+import numpy as np
+from domain.port.embedding_service_port import EmbeddingServicePort
+
+# Lowercased runs of letters and digits are the words hashed into features
+WORD_PATTERN = re.compile(r"\w+")
+
+# Dimensionality of embed-english-v3.0, so indexes and benchmarks see realistic vector sizes
+DEFAULT_DIMENSIONS = 1024
+
+
+class HashingEmbeddingService(EmbeddingServicePort):
+    """Local, deterministic embeddings by signed feature hashing; no network or API key needed.
+
+    Word unigrams and bigrams are hashed with CRC-32 into `dimensions` buckets, a hash bit picks
+    the sign of each feature (so collisions cancel out on average, making the vector a random
+    projection sketch of the term counts), terms weigh 1 + log(count) and vectors are
+    L2-normalized. The same text always gets the same vector, in every process, and texts
+    sharing words have a positive cosine similarity: enough to load-test ingestion and search,
+    not to judge retrieval quality.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS, model_name: Optional[str] = None):
+        if dimensions < 1:
+            raise ValueError("Embedding dimensions must be at least 1")
+        self.dimensions = dimensions
+        # The dimension is part of the name, so cached vectors of another size are never reused
+        self.model_name = model_name or f"local-hashing-{dimensions}"
+        self.input_type = "search_document"
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding vector for a text."""
+        tokens = WORD_PATTERN.findall(text.lower())
+        features = Counter(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])])
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in features.items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dimensions] += sign * (1.0 + np.log(count))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts."""
+        return [self.generate_embedding(text) for text in texts]
+
+    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+        """Calculate cosine similarity between two embeddings (0.0 when one of them is zero)."""
+        a = np.array(embedding1)
+        b = np.array(embedding2)
+        norms = np.linalg.norm(a) * np.linalg.norm(b)
+        return float(np.dot(a, b) / norms) if norms > 0 else 0.0
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+from domain.port.embedding_service_port import EmbeddingServicePort
+
+
+class MicroBatchingEmbeddingService(EmbeddingServicePort):
+    """Embedding service coalescing concurrent single-text requests into batched calls.
+
+    Each generate_embedding call queues its text with a future and waits on it. A collector
+    thread takes the first queued text, gathers the texts arriving within max_wait seconds (up
+    to max_batch_size), sends them in one generate_embeddings_batch call and resolves every
+    future, or fails them all with the call's error. Up to max_concurrent_batches calls are in
+    flight; while they all are, texts keep queuing and are sent together as soon as one returns,
+    so the batches grow with the load instead of the queue.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        max_wait: float = 0.005,
+        max_batch_size: int = 96,
+        max_concurrent_batches: int = 4
+    ):
+        if max_wait < 0:
+            raise ValueError("Micro-batch max_wait must not be negative")
+        if max_batch_size < 1:
+            raise ValueError("Micro-batch max_batch_size must be at least 1")
+        if max_concurrent_batches < 1:
+            raise ValueError("Micro-batch max_concurrent_batches must be at least 1")
+        self.embedding_service = embedding_service
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._slots = threading.Semaphore(max_concurrent_batches)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="embedding-micro-batch")
+        self._closed = threading.Event()
+        # Makes the closed check and the enqueue atomic, so no text is queued after close()
+        self._lock = threading.Lock()
+        self._collector = threading.Thread(target=self._collect, name="embedding-micro-batcher", daemon=True)
+        self._collector.start()
+
+    def close(self) -> None:
+        """Send the queued texts, then stop the collector."""
+        with self._lock:
+            self._closed.set()
+        self._collector.join()
+        self._executor.shutdown(wait=True)
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate embedding vector for a text, batched with concurrent requests."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("Embedding micro-batcher is closed")
+            self._queue.put((text, future))
+        return future.result()
+
+    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts with the wrapped service."""
+        return self.embedding_service.generate_embeddings_batch(texts)
+
+    def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+        """Calculate similarity with the wrapped service."""
+        return self.embedding_service.calculate_similarity(embedding1, embedding2)
+
+    def _collect(self) -> None:
+        while True:
+            self._slots.acquire()
+            try:
+                # Wake up regularly to notice close() while idle
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                self._slots.release()
+                if self._closed.is_set():
+                    return
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        try:
+            embeddings = self.embedding_service.generate_embeddings_batch([text for text, _ in batch])
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+        except Exception as error:
+            for _, future in batch:
+                future.set_exception(error)
+        finally:
+            self._slots.release()
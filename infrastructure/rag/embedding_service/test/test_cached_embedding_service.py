@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.rag.embedding_service.cached_embedding_service import CachedEmbeddingService
+
+
+class TestCachedEmbeddingService(unittest.TestCase):
+    """Unit tests for CachedEmbeddingService."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "embeddings.sqlite3")
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.embedding_service_mock.generate_embeddings_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+        self.embedding_service_mock.generate_embedding.side_effect = lambda text: [float(len(text)), 1.0]
+        self.service = self._create_service()
+
+    def tearDown(self):
+        """Close the cache and remove it."""
+        self.service.close()
+        self.directory.cleanup()
+
+    def _create_service(self, model_name="model-a", input_type="search_document"):
+        return CachedEmbeddingService(
+            self.embedding_service_mock, path=self.path, model_name=model_name, input_type=input_type
+        )
+
+    def test_batch_sends_only_misses_and_keeps_order(self):
+        """Test that cached and repeated texts are not sent upstream and results follow the input order."""
+        self.assertEqual(self.service.generate_embeddings_batch(["a", "bb"]), [[1.0, 1.0], [2.0, 1.0]])
+
+        result = self.service.generate_embeddings_batch(["ccc", "a", "ccc", "bb"])
+
+        self.assertEqual(result, [[3.0, 1.0], [1.0, 1.0], [3.0, 1.0], [2.0, 1.0]])
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_with(["ccc"])
+        self.assertEqual((self.service.hits, self.service.misses), (3, 3))
+        self.assertEqual(self.service.hit_rate, 0.5)
+        self.assertEqual(self.service.generate_embeddings_batch([]), [])
+
+    def test_single_embedding(self):
+        """Test that single texts share the cache with batches."""
+        self.service.generate_embeddings_batch(["a"])
+
+        self.assertEqual(self.service.generate_embedding("a"), [1.0, 1.0])
+        self.assertEqual(self.service.generate_embedding("bb"), [2.0, 1.0])
+        self.assertEqual(self.service.generate_embedding("bb"), [2.0, 1.0])
+
+        self.embedding_service_mock.generate_embedding.assert_called_once_with("bb")
+        self.assertEqual((self.service.hits, self.service.misses), (2, 2))
+
+    def test_memory_tier_is_bounded_by_bytes(self):
+        """Test that the least recently used vectors are evicted beyond max_bytes."""
+        service = CachedEmbeddingService(self.embedding_service_mock, max_bytes=16, model_name="model-a")
+        service.generate_embeddings_batch(["a", "bb"])
+        service.generate_embedding("a")
+        service.generate_embedding("ccc")
+
+        self.assertEqual(len(service), 2)
+        self.assertEqual(service.memory_bytes, 16)
+        service.generate_embedding("bb")
+        self.assertEqual(self.embedding_service_mock.generate_embedding.call_count, 2)
+
+    def test_disk_tier_survives_restarts(self):
+        """Test that a new cache on the same file serves earlier embeddings without calling upstream."""
+        self.service.generate_embeddings_batch(["a", "bb"])
+        self.service.close()
+        self.embedding_service_mock.generate_embeddings_batch.reset_mock()
+
+        self.service = self._create_service()
+        result = self.service.generate_embeddings_batch(["bb", "a"])
+
+        self.assertEqual(result, [[2.0, 1.0], [1.0, 1.0]])
+        self.embedding_service_mock.generate_embeddings_batch.assert_not_called()
+        self.assertEqual(self.service.disk_hits, 2)
+        self.assertEqual(len(self.service), 2)
+
+    def test_keys_include_model_and_input_type(self):
+        """Test that embeddings of another model or input type are not reused."""
+        self.service.generate_embeddings_batch(["a"])
+        for model_name, input_type in [("model-a", "search_query"), ("model-b", "search_document")]:
+            other = self._create_service(model_name, input_type)
+            other.generate_embeddings_batch(["a"])
+            other.close()
+
+        self.assertEqual(self.embedding_service_mock.generate_embeddings_batch.call_count, 3)
+
+    def test_defaults_come_from_the_wrapped_service(self):
+        """Test that the model name and input type are read from the wrapped service."""
+        self.embedding_service_mock.model_name = "model-b"
+        self.embedding_service_mock.input_type = "search_query"
+
+        service = CachedEmbeddingService(self.embedding_service_mock)
+
+        self.assertEqual(service._key("a")[:2], ("model-b", "search_query"))
+
+
+if __name__ == '__main__':
+    unittest.main()
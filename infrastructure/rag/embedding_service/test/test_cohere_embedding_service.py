@@ -0,0 +1,104 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+from cohere.core.api_error import ApiError
+
+from infrastructure.rag.embedding_service.cohere_embedding_service import CohereEmbeddingService, is_transient
+
+
+class TestCohereEmbeddingService(unittest.TestCase):
+    """Unit tests for CohereEmbeddingService batching and retries."""
+
+    def setUp(self):
+        """Set up a service around a mocked Cohere client."""
+        with patch("infrastructure.rag.embedding_service.cohere_embedding_service.cohere.Client") as client_class:
+            self.client_mock = client_class.return_value
+            self.service = CohereEmbeddingService(max_batch_size=3, max_workers=2, retry_delay=0.0)
+        self.client_mock.embed.side_effect = self._embed
+
+    def _embed(self, texts, model, input_type):
+        return MagicMock(embeddings=[[float(text)] for text in texts])
+
+    def test_batch_is_split_and_reassembled_in_order(self):
+        """Test that requests hold at most max_batch_size texts and results follow the input order."""
+        texts = [str(number) for number in range(8)]
+
+        result = self.service.generate_embeddings_batch(texts)
+
+        self.assertEqual(result, [[float(number)] for number in range(8)])
+        sizes = sorted(len(call.kwargs["texts"]) for call in self.client_mock.embed.call_args_list)
+        self.assertEqual(sizes, [2, 3, 3])
+        self.assertEqual(self.service.generate_embeddings_batch([]), [])
+
+    def test_batches_are_sent_concurrently(self):
+        """Test that several requests are in flight at once."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def embed(texts, model, input_type):
+            barrier.wait()
+            return self._embed(texts, model, input_type)
+
+        self.client_mock.embed.side_effect = embed
+
+        result = self.service.generate_embeddings_batch(["1", "2", "3", "4"])
+
+        self.assertEqual(result, [[1.0], [2.0], [3.0], [4.0]])
+
+    def test_failed_batch_is_retried_alone(self):
+        """Test that a transient failure only resends the batch that failed."""
+        failures = {"4": 2}
+
+        def embed(texts, model, input_type):
+            if failures.get(texts[0]):
+                failures[texts[0]] -= 1
+                raise ConnectionError("Service unavailable")
+            return self._embed(texts, model, input_type)
+
+        self.client_mock.embed.side_effect = embed
+
+        result = self.service.generate_embeddings_batch(["1", "2", "3", "4", "5"])
+
+        self.assertEqual(result, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        sent = [call.kwargs["texts"] for call in self.client_mock.embed.call_args_list]
+        self.assertEqual(sent.count(["1", "2", "3"]), 1)
+        self.assertEqual(sent.count(["4", "5"]), 3)
+
+    def test_persistent_failure_is_raised(self):
+        """Test that the error is raised once the retries are exhausted."""
+        self.client_mock.embed.side_effect = ConnectionError("Service unavailable")
+
+        with self.assertRaises(ConnectionError):
+            self.service.generate_embedding("1")
+        self.assertEqual(self.client_mock.embed.call_count, self.service.max_retries + 1)
+
+    def test_non_transient_errors_are_not_retried(self):
+        """Test that authentication and request errors are raised after a single attempt."""
+        for error in (ApiError(status_code=401, body="invalid api token"), ValueError("bad input")):
+            self.client_mock.embed.reset_mock()
+            self.client_mock.embed.side_effect = error
+
+            with self.assertRaises(type(error)):
+                self.service.generate_embedding("1")
+            self.assertEqual(self.client_mock.embed.call_count, 1)
+
+    def test_is_transient(self):
+        """Test that rate limits, server errors, connection errors and timeouts are transient."""
+        self.assertTrue(is_transient(ApiError(status_code=429)))
+        self.assertTrue(is_transient(ApiError(status_code=503)))
+        self.assertTrue(is_transient(httpx.ConnectTimeout("timed out")))
+        self.assertTrue(is_transient(ConnectionError()))
+        self.assertFalse(is_transient(ApiError(status_code=400)))
+        self.assertFalse(is_transient(ApiError(body="no status")))
+        self.assertFalse(is_transient(TypeError()))
+
+    def test_batch_size_above_provider_limit_is_rejected(self):
+        """Test that batch sizes the provider would refuse are rejected."""
+        with patch("infrastructure.rag.embedding_service.cohere_embedding_service.cohere.Client"):
+            with self.assertRaises(ValueError):
+                CohereEmbeddingService(max_batch_size=97)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from infrastructure.rag.embedding_service.hashing_embedding_service import HashingEmbeddingService
+
+
+class TestHashingEmbeddingService(unittest.TestCase):
+    """Unit tests for HashingEmbeddingService."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.service = HashingEmbeddingService(dimensions=256)
+
+    def test_embeddings_are_normalized_and_sized(self):
+        """Test that vectors have the configured dimensionality and unit norm."""
+        embedding = self.service.generate_embedding("Vector search over document chunks")
+
+        self.assertEqual(len(embedding), 256)
+        self.assertAlmostEqual(float(np.linalg.norm(embedding)), 1.0, places=5)
+        self.assertEqual(len(HashingEmbeddingService().generate_embedding("text")), 1024)
+
+    def test_model_name_includes_the_dimension(self):
+        """Test that services of different sizes never share cache keys."""
+        self.assertEqual(self.service.model_name, "local-hashing-256")
+        self.assertEqual(HashingEmbeddingService().model_name, "local-hashing-1024")
+
+    def test_embeddings_are_deterministic_across_processes(self):
+        """Test that a text gets the same vector here and in a fresh interpreter."""
+        text = "Retrieval augmented generation"
+        script = (
+            "import json;"
+            "from infrastructure.rag.embedding_service.hashing_embedding_service import HashingEmbeddingService;"
+            f"print(json.dumps(HashingEmbeddingService(dimensions=256).generate_embedding({text!r})))"
+        )
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(self.service.generate_embedding(text), json.loads(output.splitlines()[-1]))
+        self.assertEqual(self.service.generate_embeddings_batch([text, text])[1], self.service.generate_embedding(text))
+
+    def test_shared_words_increase_similarity(self):
+        """Test that texts sharing words are closer than unrelated texts."""
+        query = self.service.generate_embedding("quarterly revenue report")
+        related = self.service.generate_embedding("The quarterly revenue report for Europe")
+        unrelated = self.service.generate_embedding("Photosynthesis in green plants")
+
+        self.assertGreater(
+            self.service.calculate_similarity(query, related),
+            self.service.calculate_similarity(query, unrelated) + 0.3
+        )
+
+    def test_empty_text(self):
+        """Test that texts without words get a zero vector with zero similarity."""
+        empty = self.service.generate_embedding("  ...  ")
+
+        self.assertEqual(empty, [0.0] * 256)
+        self.assertEqual(self.service.calculate_similarity(empty, self.service.generate_embedding("word")), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.rag.embedding_service.micro_batching_embedding_service import MicroBatchingEmbeddingService
+
+
+class TestMicroBatchingEmbeddingService(unittest.TestCase):
+    """Unit tests for MicroBatchingEmbeddingService."""
+
+    def setUp(self):
+        """Set up a batcher whose first upstream call blocks until released."""
+        self.release = threading.Event()
+        self.batches = []
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.embedding_service_mock.generate_embeddings_batch.side_effect = self._embed
+        self.service = MicroBatchingEmbeddingService(
+            self.embedding_service_mock, max_wait=0.0, max_batch_size=3, max_concurrent_batches=1
+        )
+        self.executor = ThreadPoolExecutor(max_workers=8)
+
+    def tearDown(self):
+        """Stop the batcher and the callers."""
+        self.release.set()
+        self.service.close()
+        self.executor.shutdown()
+
+    def _embed(self, texts):
+        self.batches.append(list(texts))
+        if len(self.batches) == 1:
+            self.release.wait(timeout=5)
+        if "fail" in texts:
+            raise ConnectionError("Service unavailable")
+        return [[float(text)] for text in texts]
+
+    def _wait_until_queued(self, count):
+        deadline = time.monotonic() + 5
+        while self.service._queue.qsize() < count and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(self.service._queue.qsize(), count)
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test that texts queued during an upstream call are sent in batches of max_batch_size."""
+        first = self.executor.submit(self.service.generate_embedding, "0")
+        while not self.batches:
+            time.sleep(0.001)
+        others = [self.executor.submit(self.service.generate_embedding, str(number)) for number in range(1, 8)]
+        self._wait_until_queued(7)
+
+        self.release.set()
+
+        self.assertEqual(first.result(timeout=5), [0.0])
+        self.assertEqual([future.result(timeout=5) for future in others], [[float(number)] for number in range(1, 8)])
+        self.assertEqual(self.batches[0], ["0"])
+        self.assertEqual([len(batch) for batch in self.batches[1:]], [3, 3, 1])
+        self.assertEqual(sorted(text for batch in self.batches[1:] for text in batch), [str(n) for n in range(1, 8)])
+
+    def test_upstream_error_fails_every_caller_of_the_batch(self):
+        """Test that an upstream error is raised to each caller of the failed batch only."""
+        first = self.executor.submit(self.service.generate_embedding, "0")
+        while not self.batches:
+            time.sleep(0.001)
+        failed = [self.executor.submit(self.service.generate_embedding, text) for text in ("1", "fail")]
+        self._wait_until_queued(2)
+
+        self.release.set()
+
+        self.assertEqual(first.result(timeout=5), [0.0])
+        for future in failed:
+            with self.assertRaises(ConnectionError):
+                future.result(timeout=5)
+        self.assertEqual(self.service.generate_embedding("2"), [2.0])
+
+    def test_batch_calls_go_straight_upstream(self):
+        """Test that batch calls are not queued."""
+        self.release.set()
+
+        self.assertEqual(self.service.generate_embeddings_batch(["1", "2"]), [[1.0], [2.0]])
+        self.assertEqual(self.batches, [["1", "2"]])
+
+    def test_closed_batcher_rejects_requests(self):
+        """Test that requests after close() are rejected instead of waiting forever."""
+        self.release.set()
+        self.service.close()
+
+        with self.assertRaises(ValueError):
+            self.service.generate_embedding("1")
+
+
+if __name__ == '__main__':
+    unittest.main()
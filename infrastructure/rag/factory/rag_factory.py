@@ -1,11 +1,38 @@
+import os
+from typing import Callable, Optional
 from infrastructure.rag.document_processor.document_processor import DocumentProcessor
+from infrastructure.rag.embedding_service.cached_embedding_service import CachedEmbeddingService
 from infrastructure.rag.embedding_service.cohere_embedding_service import CohereEmbeddingService
+from infrastructure.rag.embedding_service.hashing_embedding_service import HashingEmbeddingService
+from infrastructure.rag.embedding_service.micro_batching_embedding_service import MicroBatchingEmbeddingService
 from infrastructure.rag.rag_generator.cohere_rag_generator import CohereRAGGenerator
 from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+from infrastructure.vector_store.hnsw_chunk_repository import HNSWChunkRepository
+from infrastructure.vector_store.ivf_chunk_repository import IVFChunkRepository
+from infrastructure.vector_store.mmap_chunk_repository import MemoryMappedChunkRepository
+from infrastructure.vector_store.sqlite_chunk_repository import SQLiteChunkRepository
+from infrastructure.vector_store.hybrid_chunk_repository import HybridChunkRepository
+from infrastructure.vector_store.mmr_chunk_repository import MMRChunkRepository
+from infrastructure.vector_store.binary_vector_index import BinaryVectorIndex
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.pq_vector_index import PQVectorIndex
+from infrastructure.vector_store.quantized_vector_index import QuantizedVectorIndex
+from infrastructure.vector_store.truncated_vector_index import TruncatedVectorIndex
+from infrastructure.vector_store.vector_index import VectorIndex
+from infrastructure.rag.near_duplicate_detector.minhash_near_duplicate_detector import MinHashNearDuplicateDetector
 from infrastructure.rag.document_repository.in_memory_document_repository import InMemoryDocumentRepository
+from infrastructure.rag.document_repository.sqlite_document_repository import SQLiteDocumentRepository
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from domain.port.document_repository_port import DocumentRepositoryPort
+from domain.port.embedding_service_port import EmbeddingServicePort
 from infrastructure.rag.rag_workflow.rag_workflow_orchestrator import RAGWorkflowOrchestrator
 from infrastructure.rag.config.rag_config import rag_config
 
+# Chunks and documents share one database file when the SQLite backend is selected
+SQLITE_DATABASE = "rag.sqlite3"
+# Embeddings cached on disk, shared by every storage backend
+EMBEDDING_CACHE_DATABASE = "embeddings.sqlite3"
+
 
 class RAGFactory:
     """Factory for creating RAG system components using the correct ports."""
@@ -19,9 +46,38 @@ class RAGFactory:
         )
     
     @staticmethod
-    def create_embedding_service() -> CohereEmbeddingService:
-        """Create an embedding service."""
-        return CohereEmbeddingService(model_name=rag_config.embedding_model)
+    def create_embedding_service() -> EmbeddingServicePort:
+        """Create an embedding service, with query micro-batching and a cache when enabled."""
+        if rag_config.embedding_backend == "hashing":
+            backend = HashingEmbeddingService(dimensions=rag_config.local_embedding_dimensions)
+        else:
+            backend = CohereEmbeddingService(
+                model_name=rag_config.embedding_model,
+                max_batch_size=rag_config.embedding_batch_size,
+                max_workers=rag_config.embedding_workers,
+                max_retries=rag_config.embedding_max_retries
+            )
+        embedding_service = backend
+        if rag_config.embedding_micro_batching:
+            embedding_service = MicroBatchingEmbeddingService(
+                embedding_service,
+                max_wait=rag_config.micro_batch_max_wait,
+                max_batch_size=rag_config.embedding_batch_size,
+                max_concurrent_batches=rag_config.embedding_workers
+            )
+        if not rag_config.embedding_cache:
+            return embedding_service
+        path = None
+        if rag_config.embedding_cache_persistent:
+            path = os.path.join(rag_config.storage_path, EMBEDDING_CACHE_DATABASE)
+        # Outermost, so cache hits never wait for a micro-batch
+        return CachedEmbeddingService(
+            embedding_service,
+            path=path,
+            max_bytes=rag_config.embedding_cache_max_bytes,
+            model_name=backend.model_name,
+            input_type=backend.input_type
+        )
     
     @staticmethod
     def create_rag_generator() -> CohereRAGGenerator:
@@ -29,19 +85,116 @@ class RAGFactory:
         return CohereRAGGenerator(model_name=rag_config.chat_model)
     
     @staticmethod
-    def create_chunk_repository(embedding_service: CohereEmbeddingService) -> InMemoryChunkRepository:
+    def create_chunk_repository(embedding_service: EmbeddingServicePort) -> DocumentChunkRepositoryPort:
+        """Create a chunk repository, adding lexical search and diversification when enabled."""
+        repository = RAGFactory.create_vector_chunk_repository(embedding_service)
+        if rag_config.hybrid_search:
+            repository = HybridChunkRepository(
+                vector_repository=repository,
+                k1=rag_config.bm25_k1,
+                b=rag_config.bm25_b,
+                rrf_k=rag_config.rrf_k,
+                candidates=rag_config.hybrid_candidates
+            )
+        if rag_config.mmr_enabled:
+            repository = MMRChunkRepository(
+                repository=repository,
+                lambda_mult=rag_config.mmr_lambda,
+                fetch_factor=rag_config.mmr_fetch_factor
+            )
+        return repository
+    
+    @staticmethod
+    def create_vector_chunk_repository(embedding_service: EmbeddingServicePort) -> DocumentChunkRepositoryPort:
         """Create a chunk repository with vector search capabilities."""
-        return InMemoryChunkRepository(embedding_service=embedding_service)
+        # The persistent backends always search their stored vectors exhaustively
+        if rag_config.storage_backend in ("mmap", "sqlite") and rag_config.vector_index_type != "flat":
+            raise ValueError(
+                f"Vector index type {rag_config.vector_index_type} is not supported "
+                f"by the {rag_config.storage_backend} storage backend"
+            )
+        if rag_config.storage_backend == "mmap":
+            path = os.path.join(rag_config.storage_path, "chunks")
+            if rag_config.storage_read_only:
+                return MemoryMappedChunkRepository(embedding_service=embedding_service, path=path, read_only=True)
+            return MemoryMappedChunkRepository.open_shared(embedding_service=embedding_service, path=path)
+        if rag_config.storage_backend == "sqlite":
+            return SQLiteChunkRepository(
+                embedding_service=embedding_service,
+                path=os.path.join(rag_config.storage_path, SQLITE_DATABASE)
+            )
+        if rag_config.vector_index_type == "hnsw":
+            return HNSWChunkRepository(
+                embedding_service=embedding_service,
+                m=rag_config.hnsw_m,
+                ef_construction=rag_config.hnsw_ef_construction,
+                ef_search=rag_config.hnsw_ef_search,
+                segment_size=rag_config.segment_size,
+                compaction_deleted_ratio=rag_config.compaction_deleted_ratio
+            )
+        if rag_config.vector_index_type == "ivf":
+            return IVFChunkRepository(
+                embedding_service=embedding_service,
+                nlist=rag_config.ivf_nlist,
+                nprobe=rag_config.ivf_nprobe,
+                retrain_growth_factor=rag_config.ivf_retrain_growth_factor,
+                min_training_size=rag_config.ivf_min_training_size,
+                segment_size=rag_config.segment_size,
+                compaction_deleted_ratio=rag_config.compaction_deleted_ratio
+            )
+        return InMemoryChunkRepository(
+            embedding_service=embedding_service,
+            index_factory=RAGFactory.create_vector_index_factory(),
+            segment_size=rag_config.segment_size,
+            compaction_deleted_ratio=rag_config.compaction_deleted_ratio
+        )
     
     @staticmethod
-    def create_document_repository() -> InMemoryDocumentRepository:
+    def create_vector_index_factory() -> Callable[[], VectorIndex]:
+        """Create the factory building each chat's vector index for the in-memory repository."""
+        if rag_config.vector_index_type in ("int8", "float16"):
+            return lambda: QuantizedVectorIndex(
+                dtype=rag_config.vector_index_type,
+                rescore_candidates=rag_config.quantized_rescore_candidates
+            )
+        if rag_config.vector_index_type == "binary":
+            return lambda: BinaryVectorIndex(rescore_candidates=rag_config.binary_rescore_candidates)
+        if rag_config.vector_index_type == "pq":
+            return lambda: PQVectorIndex(
+                subspaces=rag_config.pq_subspaces,
+                min_training_size=rag_config.pq_min_training_size
+            )
+        if rag_config.vector_index_type == "truncated":
+            return lambda: TruncatedVectorIndex(
+                dimensions=rag_config.truncated_dimensions,
+                projection=rag_config.truncated_projection,
+                rescore_candidates=rag_config.truncated_rescore_candidates,
+                min_training_size=rag_config.truncated_min_training_size
+            )
+        return FlatVectorIndex
+    
+    @staticmethod
+    def create_document_repository() -> DocumentRepositoryPort:
         """Create a document repository."""
+        # One database for every worker process: SQLite serializes their writes
+        if rag_config.storage_backend in ("mmap", "sqlite"):
+            return SQLiteDocumentRepository(os.path.join(rag_config.storage_path, SQLITE_DATABASE))
         return InMemoryDocumentRepository()
     
+    @staticmethod
+    def create_near_duplicate_detector() -> Optional[MinHashNearDuplicateDetector]:
+        """Create a near-duplicate detector, or None when detection is disabled."""
+        if not rag_config.near_duplicate_detection:
+            return None
+        return MinHashNearDuplicateDetector(
+            threshold=rag_config.near_duplicate_threshold,
+            permutations=rag_config.minhash_permutations
+        )
+    
     @staticmethod
     def create_rag_workflow_orchestrator(
-        embedding_service: CohereEmbeddingService,
-        chunk_repository: InMemoryChunkRepository
+        embedding_service: EmbeddingServicePort,
+        chunk_repository: DocumentChunkRepositoryPort
     ) -> RAGWorkflowOrchestrator:
         """Create a RAG workflow orchestrator."""
         return RAGWorkflowOrchestrator(
@@ -59,16 +212,22 @@ class RAGFactory:
         chunk_repository = RAGFactory.create_chunk_repository(embedding_service)
         document_repository = RAGFactory.create_document_repository()
         document_processor = RAGFactory.create_document_processor()
-        rag_generator = RAGFactory.create_rag_generator()
-        workflow_orchestrator = RAGFactory.create_rag_workflow_orchestrator(
-            embedding_service, chunk_repository
-        )
+        near_duplicate_detector = RAGFactory.create_near_duplicate_detector()
+        # Generation needs Cohere; the local embedding backend runs ingestion and search without it
+        rag_generator = None
+        workflow_orchestrator = None
+        if rag_config.cohere_api_key:
+            rag_generator = RAGFactory.create_rag_generator()
+            workflow_orchestrator = RAGFactory.create_rag_workflow_orchestrator(
+                embedding_service, chunk_repository
+            )
         
         return {
             'embedding_service': embedding_service,
             'chunk_repository': chunk_repository,
             'document_repository': document_repository,
             'document_processor': document_processor,
+            'near_duplicate_detector': near_duplicate_detector,
             'rag_generator': rag_generator,
             'workflow_orchestrator': workflow_orchestrator
         } 
\ No newline at end of file
@@ -0,0 +1,152 @@
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from domain.model.document_chunk import DocumentChunk
+from domain.port.near_duplicate_detector_port import NearDuplicateDetectorPort
+
+# Prime just above 2**32: with 32-bit shingle hashes and coefficients, a * x + b fits in uint64
+HASH_PRIME = 4294967311
+
+# Character shingles absorb the small, scattered differences of two OCR passes better than words
+SHINGLE_SIZE = 5
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Character k-grams of a text, lowercased and with whitespace runs collapsed."""
+    normalized = " ".join(text.lower().split())
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[start:start + size] for start in range(len(normalized) - size + 1)}
+
+
+def lsh_bands(threshold: float, permutations: int) -> Tuple[int, int]:
+    """(bands, rows per band) splitting a signature for LSH at the given Jaccard threshold.
+
+    Two signatures share a band with probability 1 - (1 - s**rows)**bands, a curve rising around
+    s = (1 / bands)**(1 / rows). The widest bands keeping that point at or below the threshold
+    are picked, so pairs above the threshold are rarely missed and few dissimilar pairs collide.
+    """
+    best = (permutations, 1)
+    for rows in range(1, permutations + 1):
+        if permutations % rows == 0 and (rows / permutations) ** (1.0 / rows) <= threshold:
+            best = (permutations // rows, rows)
+    return best
+
+
+class MinHashNearDuplicateDetector(NearDuplicateDetectorPort):
+    """Near-duplicate detection with MinHash signatures and LSH banding, per chat.
+
+    Each chunk gets a signature of `permutations` min-hashes over its character shingles; the
+    fraction of equal min-hashes between two signatures estimates the Jaccard similarity of their
+    shingle sets. Signatures are split into bands hashed into buckets, so only chunks sharing a
+    bucket are compared. A chunk whose estimated similarity with a chunk already registered in the
+    same chat reaches the threshold is dropped: searches are per chat, so a duplicate found in
+    another chat must still be stored. Dropped chunks are remembered against the chunk they
+    duplicate; when the document of that chunk is removed, remove_document returns those of other
+    documents that are no longer covered by a registered chunk, so their content can be stored.
+    """
+
+    def __init__(self, threshold: float = 0.9, permutations: int = 128, seed: int = 0):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("Near-duplicate threshold must be in (0, 1]")
+        if permutations < 1:
+            raise ValueError("MinHash permutations must be at least 1")
+        self.threshold = threshold
+        self.permutations = permutations
+        self.bands, self.rows = lsh_bands(threshold, permutations)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=permutations, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=permutations, dtype=np.uint64)
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._keys_by_chunk: Dict[str, List[tuple]] = {}
+        self._buckets: Dict[tuple, Set[str]] = {}
+        self._chunk_ids_by_document: Dict[str, List[str]] = {}
+        # Skipped chunks by the ID of the registered chunk they duplicate, and by their own document
+        self._duplicates: Dict[str, Dict[str, DocumentChunk]] = {}
+        self._skipped_by_document: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text: the minimum of every hash permutation over its shingles."""
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64
+        )
+        return ((np.outer(hashes, self._a) + self._b) % np.uint64(HASH_PRIME)).min(axis=0)
+
+    def filter_near_duplicates(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Register chunks and return those that are not near-duplicates of a chunk already registered in their chat."""
+        kept = []
+        for chunk in chunks:
+            signature, keys = self._signature_and_keys(chunk)
+            with self._lock:
+                if self._admit(chunk, signature, keys):
+                    kept.append(chunk)
+        return kept
+
+    def remove_document(self, document_id: str) -> List[DocumentChunk]:
+        """Forget the chunks of a document and return the skipped near-duplicates of other documents to store now."""
+        with self._lock:
+            for chunk_id, kept_chunk_id in self._skipped_by_document.pop(document_id, {}).items():
+                duplicates = self._duplicates[kept_chunk_id]
+                del duplicates[chunk_id]
+                if not duplicates:
+                    del self._duplicates[kept_chunk_id]
+            orphans = []
+            for chunk_id in self._chunk_ids_by_document.pop(document_id, ()):
+                del self._signatures[chunk_id]
+                for key in self._keys_by_chunk.pop(chunk_id):
+                    bucket = self._buckets[key]
+                    bucket.discard(chunk_id)
+                    if not bucket:
+                        del self._buckets[key]
+                orphans.extend(self._duplicates.pop(chunk_id, {}).values())
+
+            # An orphan either duplicates another registered chunk (possibly an orphan promoted
+            # just before) and stays skipped, or is registered and must be stored
+            restored = []
+            for chunk in orphans:
+                skipped = self._skipped_by_document[chunk.document_id]
+                del skipped[chunk.chunk_id]
+                if not skipped:
+                    del self._skipped_by_document[chunk.document_id]
+                if self._admit(chunk, *self._signature_and_keys(chunk)):
+                    restored.append(chunk)
+            return restored
+
+    def _signature_and_keys(self, chunk: DocumentChunk) -> Tuple[np.ndarray, List[tuple]]:
+        signature = self.signature(chunk.content)
+        keys = [
+            (chunk.chat_id, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+        return signature, keys
+
+    def _admit(self, chunk: DocumentChunk, signature: np.ndarray, keys: List[tuple]) -> bool:
+        """Register a chunk, or record it against the chunk it duplicates; True when registered."""
+        duplicate_of = self._find_duplicate(signature, keys)
+        if duplicate_of is None:
+            self._register(chunk, signature, keys)
+            return True
+        self._duplicates.setdefault(duplicate_of, {})[chunk.chunk_id] = chunk
+        self._skipped_by_document.setdefault(chunk.document_id, {})[chunk.chunk_id] = duplicate_of
+        return False
+
+    def _find_duplicate(self, signature: np.ndarray, keys: List[tuple]) -> Optional[str]:
+        candidates = set()
+        for key in keys:
+            candidates.update(self._buckets.get(key, ()))
+        for chunk_id in candidates:
+            if np.mean(self._signatures[chunk_id] == signature) >= self.threshold:
+                return chunk_id
+        return None
+
+    def _register(self, chunk: DocumentChunk, signature: np.ndarray, keys: List[tuple]) -> None:
+        self._signatures[chunk.chunk_id] = signature
+        self._keys_by_chunk[chunk.chunk_id] = keys
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(chunk.chunk_id)
+        self._chunk_ids_by_document.setdefault(chunk.document_id, []).append(chunk.chunk_id)
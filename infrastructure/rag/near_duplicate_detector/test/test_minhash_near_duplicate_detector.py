@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import MagicMock
+
+from domain.model.document import Document, DocumentType
+from domain.model.document_chunk import DocumentChunk
+from domain.port.document_processor_port import DocumentProcessorPort
+from domain.port.document_repository_port import DocumentRepositoryPort
+from domain.service.document_service import DocumentService
+from infrastructure.rag.embedding_service.hashing_embedding_service import HashingEmbeddingService
+from infrastructure.rag.near_duplicate_detector.minhash_near_duplicate_detector import (
+    MinHashNearDuplicateDetector,
+    lsh_bands,
+    shingles
+)
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+
+TEXT = (
+    "Retrieval augmented generation grounds the answers of a language model in documents "
+    "uploaded to the chat. Documents are split into overlapping chunks, embedded, and stored "
+    "so that the chunks closest to a question can be added to the prompt."
+)
+# The same passage as read by a second OCR pass: a few characters differ
+OCR_TEXT = TEXT.replace("language", "1anguage").replace("overlapping", "overlappinq")
+OTHER_TEXT = (
+    "The quarterly report lists revenue per region, operating costs and the headcount of "
+    "every department, followed by the forecast for the next fiscal year."
+)
+
+
+class TestMinHashNearDuplicateDetector(unittest.TestCase):
+    """Unit tests for MinHashNearDuplicateDetector."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = MinHashNearDuplicateDetector(threshold=0.8)
+
+    def test_shingles_normalize_case_and_whitespace(self):
+        """Test that shingles ignore case and whitespace layout."""
+        self.assertEqual(shingles("Hello   World", 5), shingles("hello world\n", 5))
+        self.assertEqual(shingles("abc", 5), {"abc"})
+
+    def test_lsh_bands(self):
+        """Test that bands split the signature evenly around the threshold."""
+        bands, rows = lsh_bands(0.9, 128)
+        self.assertEqual(bands * rows, 128)
+        self.assertLessEqual((1.0 / bands) ** (1.0 / rows), 0.9)
+        self.assertEqual(lsh_bands(0.01, 128), (128, 1))
+
+    def test_signature_estimates_jaccard_similarity(self):
+        """Test that near-identical texts share most min-hashes and unrelated texts few."""
+        signature = self.detector.signature(TEXT)
+        self.assertEqual(len(signature), 128)
+        self.assertGreater((signature == self.detector.signature(OCR_TEXT)).mean(), 0.8)
+        self.assertLess((signature == self.detector.signature(OTHER_TEXT)).mean(), 0.1)
+
+    def test_filter_near_duplicates(self):
+        """Test that near-duplicates are dropped across and within batches, per chat."""
+        first = [DocumentChunk("chunk-1", "doc-1", TEXT, 0, chat_id="chat-1")]
+        second = [
+            DocumentChunk("chunk-2", "doc-2", OCR_TEXT, 0, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", OTHER_TEXT, 1, chat_id="chat-1"),
+            DocumentChunk("chunk-4", "doc-2", OTHER_TEXT, 2, chat_id="chat-1"),
+            DocumentChunk("chunk-5", "doc-2", OCR_TEXT, 3, chat_id="chat-2")
+        ]
+
+        self.assertEqual(self.detector.filter_near_duplicates(first), first)
+        kept = self.detector.filter_near_duplicates(second)
+
+        self.assertEqual([chunk.chunk_id for chunk in kept], ["chunk-3", "chunk-5"])
+        self.assertEqual(len(self.detector), 3)
+
+    def test_remove_document(self):
+        """Test that chunks of a removed document no longer count as duplicates."""
+        chunk = DocumentChunk("chunk-1", "doc-1", TEXT, 0, chat_id="chat-1")
+        self.detector.filter_near_duplicates([chunk])
+
+        self.assertEqual(self.detector.remove_document("doc-1"), [])
+        self.assertEqual(self.detector.remove_document("missing"), [])
+
+        self.assertEqual(len(self.detector), 0)
+        reupload = DocumentChunk("chunk-2", "doc-2", OCR_TEXT, 0, chat_id="chat-1")
+        self.assertEqual(self.detector.filter_near_duplicates([reupload]), [reupload])
+
+    def test_remove_document_returns_the_near_duplicates_it_covered(self):
+        """Test that skipped chunks of other documents are handed back once their source is removed."""
+        source = DocumentChunk("chunk-1", "doc-1", TEXT, 0, chat_id="chat-1")
+        first_copy = DocumentChunk("chunk-2", "doc-2", OCR_TEXT, 0, chat_id="chat-1")
+        second_copy = DocumentChunk("chunk-3", "doc-3", TEXT, 0, chat_id="chat-1")
+        self.detector.filter_near_duplicates([source])
+        self.assertEqual(self.detector.filter_near_duplicates([first_copy]), [])
+        self.assertEqual(self.detector.filter_near_duplicates([second_copy]), [])
+
+        self.assertEqual(self.detector.remove_document("doc-1"), [first_copy])
+
+        # The promoted chunk now covers the other copy, which is handed back once it goes too
+        self.assertEqual(len(self.detector), 1)
+        self.assertEqual(self.detector.remove_document("doc-2"), [second_copy])
+        self.assertEqual(self.detector.remove_document("doc-3"), [])
+        self.assertEqual(len(self.detector), 0)
+
+    def test_remove_document_forgets_its_skipped_chunks(self):
+        """Test that skipped chunks of a removed document are not handed back later."""
+        source = DocumentChunk("chunk-1", "doc-1", TEXT, 0, chat_id="chat-1")
+        copy = DocumentChunk("chunk-2", "doc-2", OCR_TEXT, 0, chat_id="chat-1")
+        self.detector.filter_near_duplicates([source])
+        self.detector.filter_near_duplicates([copy])
+
+        self.assertEqual(self.detector.remove_document("doc-2"), [])
+        self.assertEqual(self.detector.remove_document("doc-1"), [])
+
+    def test_deleting_the_source_document_keeps_its_copies_searchable(self):
+        """Test that a document whose chunk was skipped keeps its content once the source is deleted."""
+        documents = {
+            document_id: Document(document_id, f"{document_id}.pdf", DocumentType.PDF, f"/{document_id}.pdf", "chat-1")
+            for document_id in ("doc-1", "doc-2")
+        }
+        contents = {"doc-1": TEXT, "doc-2": OCR_TEXT}
+        document_repository = MagicMock(spec=DocumentRepositoryPort)
+        document_repository.get_document_by_id.side_effect = documents.get
+        document_processor = MagicMock(spec=DocumentProcessorPort)
+        document_processor.process_document.side_effect = lambda document: [
+            DocumentChunk(f"{document.document_id}_0", document.document_id, contents[document.document_id], 0, chat_id="chat-1")
+        ]
+        embedding_service = HashingEmbeddingService(dimensions=64)
+        chunk_repository = InMemoryChunkRepository(embedding_service)
+        service = DocumentService(
+            document_repository, chunk_repository, document_processor, embedding_service, near_duplicate_detector=self.detector
+        )
+        service.process_document("doc-1")
+        service.process_document("doc-2")
+        self.assertEqual(chunk_repository.get_chunks_by_document_id("doc-2"), [])
+
+        service.delete_document("doc-1")
+
+        self.assertEqual([chunk.chunk_id for chunk in chunk_repository.get_chunks_by_document_id("doc-2")], ["doc-2_0"])
+        hits = chunk_repository.search_similar_chunks(embedding_service.generate_embedding(TEXT), "chat-1", similarity_threshold=0.5)
+        self.assertEqual([hit.chunk.chunk_id for hit in hits], ["doc-2_0"])
+
+    def test_invalid_threshold(self):
+        """Test that thresholds outside (0, 1] are rejected."""
+        with self.assertRaises(ValueError):
+            MinHashNearDuplicateDetector(threshold=0.0)
+        with self.assertRaises(ValueError):
+            MinHashNearDuplicateDetector(threshold=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
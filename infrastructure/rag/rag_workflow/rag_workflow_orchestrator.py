@@ -57,12 +57,14 @@ class RAGWorkflowOrchestrator:
         query_embedding = self.embedding_service.generate_embedding(rephrased_question)
         
         # Step 3: Retrieve similar chunks
-        retrieved_chunks = self.chunk_repository.search_similar_chunks(
+        scored_chunks = self.chunk_repository.search_hybrid_chunks(
+            query_text=rephrased_question,
             query_embedding=query_embedding,
             chat_id=chat_id,
             max_results=max_results * 2,  # Get more to filter later
             similarity_threshold=0.3
         )
+        retrieved_chunks = [scored_chunk.chunk for scored_chunk in scored_chunks]
         
         # Step 4: Filter chunks for relevance
         filtered_chunks = self._filter_relevant_chunks(question, retrieved_chunks)
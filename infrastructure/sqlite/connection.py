@@ -0,0 +1,14 @@
+import os
+import sqlite3
+
+
+def open_connection(path: str) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode, shareable across threads (callers serialize access)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False)
+    # WAL lets readers proceed while a write is in progress; NORMAL sync is durable in WAL mode
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
@@ -0,0 +1,113 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors, top_k
+from infrastructure.vector_store.vector_index import VectorIndex
+
+# Number of set bits for every byte value, used when np.bitwise_count is unavailable (NumPy < 2)
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def pack_signs(vectors: np.ndarray) -> np.ndarray:
+    """One bit per dimension (set when the component is positive), packed 8 per byte."""
+    return np.packbits(vectors > 0, axis=1)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance between every packed row and the packed query."""
+    differing = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(differing).sum(axis=1, dtype=np.uint16)
+    return POPCOUNT_TABLE[differing].sum(axis=1, dtype=np.uint16)
+
+
+class BinaryVectorIndex(VectorIndex):
+    """Two-stage search: a Hamming scan over sign bits, then exact cosine on the best candidates.
+
+    The packed codes take d/8 bytes per vector (128 B for 1024-d embeddings), so the first stage
+    streams millions of rows from cache. Only rescore_candidates rows are rescored against the
+    float32 vectors, which are kept for that purpose.
+    """
+
+    def __init__(self, rescore_candidates: int = 200, initial_capacity: int = 1024, batch_size: int = 16384):
+        if rescore_candidates < 1:
+            raise ValueError("Binary index rescore_candidates must be at least 1")
+        self.rescore_candidates = rescore_candidates
+        self.initial_capacity = initial_capacity
+        self.batch_size = batch_size
+        self._codes: Optional[np.ndarray] = None
+        self._size = 0
+        self._originals = FlatVectorIndex(initial_capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def codes(self) -> np.ndarray:
+        """View of the packed sign bits, one row per vector."""
+        if self._codes is None:
+            return np.empty((0, 0), dtype=np.uint8)
+        return self._codes[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the packed codes and the float32 rescoring copy."""
+        return self.codes.nbytes + self._originals.nbytes
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors and their packed sign bits."""
+        if len(vectors) == 0:
+            return
+        normalized = normalize_vectors(vectors)
+        self._originals.add(normalized)
+        codes = pack_signs(normalized)
+        self._reserve(self._size + len(codes), codes.shape[1])
+        self._codes[self._size:self._size + len(codes)] = codes
+        self._size += len(codes)
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Shortlist by Hamming distance, then rank the shortlist by exact cosine similarity."""
+        if self._size == 0:
+            return []
+
+        query_vector = normalize_vectors(query)[0]
+        query_code = pack_signs(query_vector[np.newaxis])[0]
+        distances = np.empty(self._size, dtype=np.uint16)
+        codes = self.codes
+        for start in range(0, self._size, self.batch_size):
+            distances[start:start + self.batch_size] = hamming_distances(codes[start:start + self.batch_size], query_code)
+
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(self._size)
+        # Negated distances so the shared top_k helper picks the closest codes
+        candidates = rows[top_k(-distances[rows].astype(np.int32), max(self.rescore_candidates, max_results))]
+
+        exact = self._originals.vectors[candidates] @ query_vector
+        kept = np.flatnonzero(exact >= similarity_threshold)
+        best = kept[top_k(exact[kept], max_results)]
+        return [(int(candidates[position]), float(exact[position])) for position in best]
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Exact vectors of the given rows, from the float32 rescoring copy."""
+        return self._originals.decode(rows)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False."""
+        if self._codes is None:
+            return
+        kept = self.codes[mask]
+        self._codes[:len(kept)] = kept
+        self._size = len(kept)
+        self._originals.keep(mask)
+
+    def _reserve(self, size: int, width: int) -> None:
+        if self._codes is None:
+            self._codes = np.zeros((max(self.initial_capacity, size), width), dtype=np.uint8)
+        elif size > len(self._codes):
+            grown = np.zeros((max(size, 2 * len(self._codes)), width), dtype=np.uint8)
+            grown[:self._size] = self.codes
+            self._codes = grown
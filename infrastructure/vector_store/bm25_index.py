@@ -0,0 +1,104 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+
+# Words, numbers and codes such as "APL" or "F24"; punctuation separates tokens
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric tokens of a text."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring over the chunks of a single chat.
+
+    Postings map each term to the term frequency in every chunk holding it, and chunk lengths
+    are kept next to them, so adding or removing a chunk only touches its own terms. Document
+    frequencies and the average chunk length are read at query time, so scores are always
+    those of the current corpus without any rebuild.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._chunks: Dict[str, DocumentChunk] = {}
+        self._chunk_ids_by_document: Dict[str, Dict[str, None]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def add(self, chunks: List[DocumentChunk]) -> None:
+        """Index chunks, replacing any already indexed under the same chunk ID."""
+        with self._lock:
+            for chunk in chunks:
+                self._remove_chunk(chunk.chunk_id)
+                terms = Counter(tokenize(chunk.content))
+                for term, frequency in terms.items():
+                    self._postings.setdefault(term, {})[chunk.chunk_id] = frequency
+                length = sum(terms.values())
+                self._lengths[chunk.chunk_id] = length
+                self._total_length += length
+                self._chunks[chunk.chunk_id] = chunk
+                self._chunk_ids_by_document.setdefault(chunk.document_id, {})[chunk.chunk_id] = None
+
+    def remove_document(self, document_id: str) -> int:
+        """Drop every chunk of a document and return how many were indexed."""
+        with self._lock:
+            chunk_ids = list(self._chunk_ids_by_document.get(document_id, ()))
+            for chunk_id in chunk_ids:
+                self._remove_chunk(chunk_id)
+            return len(chunk_ids)
+
+    def search(
+        self,
+        query: str,
+        max_results: int,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Return (chunk, BM25 score) pairs for chunks holding a query term, best first."""
+        with self._lock:
+            if not self._chunks:
+                return []
+            corpus_size = len(self._chunks)
+            average_length = self._total_length / corpus_size
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (corpus_size - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, frequency in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[chunk_id] / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+            hits = [(self._chunks[chunk_id], score) for chunk_id, score in scores.items()]
+
+        if chunk_filter is not None and not chunk_filter.is_empty():
+            hits = [hit for hit in hits if chunk_filter.matches(hit[0])]
+        return heapq.nlargest(max_results, hits, key=lambda hit: hit[1])
+
+    def _remove_chunk(self, chunk_id: str) -> None:
+        chunk = self._chunks.pop(chunk_id, None)
+        if chunk is None:
+            return
+        # Terms are not stored per chunk: tokenizing the content again gives them back
+        for term in set(tokenize(chunk.content)):
+            postings = self._postings[term]
+            del postings[chunk_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(chunk_id)
+        ids = self._chunk_ids_by_document[chunk.document_id]
+        del ids[chunk_id]
+        if not ids:
+            del self._chunk_ids_by_document[chunk.document_id]
@@ -0,0 +1,159 @@
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from infrastructure.concurrency.read_write_lock import ReadWriteLock
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.segment import Segment
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+class ChatPartition:
+    """Chunks of a single chat, stored in append-only segments of at most segment_size rows.
+
+    New rows go to the last (active) segment, which is sealed once full. Deletes only set
+    tombstones, so removing a document costs O(rows of that document). Once the tombstoned
+    fraction of the partition exceeds compaction_deleted_ratio, a background compactor rewrites
+    the segments above that ratio and drops the empty ones; each rewrite is bounded by
+    segment_size, which keeps it cheap even for indexes that are expensive to rebuild.
+
+    Searches share a reader-writer lock, so they run concurrently; appends, deletes and segment
+    rewrites take it exclusively and never leave a segment's chunks and vectors misaligned.
+    """
+
+    def __init__(
+        self,
+        chat_id: str,
+        index_factory: Callable[[], VectorIndex] = FlatVectorIndex,
+        segment_size: int = 50000,
+        compaction_deleted_ratio: float = 0.5,
+        background_compaction: bool = True
+    ):
+        if segment_size < 1:
+            raise ValueError("Segment size must be at least 1")
+        if not 0.0 < compaction_deleted_ratio <= 1.0:
+            raise ValueError("Compaction deleted ratio must be in (0, 1]")
+        self.chat_id = chat_id
+        self.index_factory = index_factory
+        self.segment_size = segment_size
+        self.compaction_deleted_ratio = compaction_deleted_ratio
+        self.background_compaction = background_compaction
+        self.segments: List[Segment] = []
+        self._lock = ReadWriteLock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._lock.read():
+            return sum(len(segment) for segment in self.segments)
+
+    @property
+    def chunks(self) -> List[DocumentChunk]:
+        """Live chunks, in insertion order."""
+        with self._lock.read():
+            return [chunk for segment in self.segments for chunk in segment.chunks]
+
+    @property
+    def deleted_ratio(self) -> float:
+        """Fraction of stored rows that are tombstoned."""
+        with self._lock.read():
+            size = sum(segment.size for segment in self.segments)
+            return sum(segment.deleted for segment in self.segments) / size if size else 0.0
+
+    def chunks_of_document(self, document_id: str) -> List[DocumentChunk]:
+        """Live chunks of one document, in insertion order."""
+        with self._lock.read():
+            return [chunk for segment in self.segments for chunk in segment.chunks_of_document(document_id)]
+
+    def embeddings(self, chunk_ids: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Vectors of the live chunks among chunk_ids, decoded from their segment's index."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock.read():
+            for segment in self.segments:
+                found.update(segment.embeddings(chunk_ids))
+        return found
+
+    def add(self, chunks: List[DocumentChunk], embeddings: Sequence[Sequence[float]]) -> None:
+        """Append chunks to the active segment, sealing it and opening a new one when full."""
+        with self._lock.write():
+            start = 0
+            while start < len(chunks):
+                if not self.segments or self.segments[-1].sealed:
+                    self.segments.append(Segment(self.index_factory()))
+                active = self.segments[-1]
+                stop = min(len(chunks), start + self.segment_size - active.size)
+                active.add(chunks[start:stop], embeddings[start:stop])
+                if active.size >= self.segment_size:
+                    active.sealed = True
+                start = stop
+
+    def remove_document(self, document_id: str) -> bool:
+        """Tombstone every chunk of a document."""
+        with self._lock.write():
+            removed = sum(segment.delete_document(document_id) for segment in self.segments)
+            # Segments without a live row are dropped right away, no rewrite needed
+            self.segments = [segment for segment in self.segments if len(segment) > 0]
+        if removed:
+            self._maybe_compact()
+        return removed > 0
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        max_results: int,
+        similarity_threshold: float,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Return (chunk, similarity) pairs across all segments, most similar first."""
+        with self._lock.read():
+            hits = [
+                hit
+                for segment in self.segments
+                for hit in segment.search(query_embedding, max_results, similarity_threshold, chunk_filter)
+            ]
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return hits[:max_results]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        max_results: int,
+        similarity_threshold: float,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[Tuple[DocumentChunk, float]]]:
+        """Search for several queries at once, one list of (chunk, similarity) pairs per query."""
+        merged: List[List[Tuple[DocumentChunk, float]]] = [[] for _ in query_embeddings]
+        with self._lock.read():
+            for segment in self.segments:
+                batch = segment.search_batch(query_embeddings, max_results, similarity_threshold, chunk_filter)
+                for hits, segment_hits in zip(merged, batch):
+                    hits.extend(segment_hits)
+        for hits in merged:
+            hits.sort(key=lambda hit: hit[1], reverse=True)
+        return [hits[:max_results] for hits in merged]
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Block until a background compaction, if any, has finished."""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _maybe_compact(self) -> None:
+        if self.deleted_ratio <= self.compaction_deleted_ratio:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+
+        if not self.background_compaction:
+            self._compact()
+            return
+        self._compaction_thread = threading.Thread(target=self._compact, name="segment-compaction", daemon=True)
+        self._compaction_thread.start()
+
+    def _compact(self) -> None:
+        """Rewrite the segments whose tombstoned fraction exceeds the threshold."""
+        for segment in list(self.segments):
+            # The lock is taken per segment so searches can run between two rewrites
+            with self._lock.write():
+                if segment.size and segment.deleted / segment.size > self.compaction_deleted_ratio:
+                    segment.compact()
@@ -0,0 +1,125 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+def normalize_vectors(vectors) -> np.ndarray:
+    """Convert vectors to a float32 matrix with unit-norm rows (zero rows stay zero)."""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores: np.ndarray, max_results: int) -> np.ndarray:
+    """Return the positions of the highest scores, best first."""
+    if max_results <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if scores.size > max_results:
+        candidates = np.argpartition(-scores, max_results - 1)[:max_results]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class FlatVectorIndex(VectorIndex):
+    """Exact cosine search over a contiguous matrix of pre-normalized float32 vectors."""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.initial_capacity = initial_capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the stored (normalized) vectors, one row per entry."""
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored vectors."""
+        return self.vectors.nbytes
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors at the end of the index."""
+        if len(vectors) == 0:
+            return
+        normalized = normalize_vectors(vectors)
+        self._reserve(self._size + len(normalized), normalized.shape[1])
+        self._matrix[self._size:self._size + len(normalized)] = normalized
+        self._size += len(normalized)
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Stored vectors of the given rows (all rows by default)."""
+        return self.vectors if rows is None else self.vectors[np.asarray(rows, dtype=np.int64)]
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False, preserving the order of the others."""
+        if self._matrix is None:
+            return
+        kept = self.vectors[mask]
+        self._matrix[:len(kept)] = kept
+        self._size = len(kept)
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Return (row, cosine similarity) pairs for the best matching rows."""
+        if self._size == 0:
+            return []
+
+        scores = self.vectors @ normalize_vectors(query)[0]
+        eligible = scores >= similarity_threshold
+        if mask is not None:
+            eligible &= mask
+        rows = np.flatnonzero(eligible)
+        best = rows[top_k(scores[rows], max_results)]
+        return [(int(row), float(scores[row])) for row in best]
+
+    def search_batch(
+        self,
+        queries: Sequence[Sequence[float]],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Score all queries with a single matrix-matrix product, then select each top-k."""
+        if len(queries) == 0:
+            return []
+        if self._size == 0:
+            return [[] for _ in queries]
+
+        scores = normalize_vectors(queries) @ self.vectors.T
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+        results = []
+        for query_scores in scores:
+            rows = np.flatnonzero(query_scores >= similarity_threshold)
+            best = rows[top_k(query_scores[rows], max_results)]
+            results.append([(int(row), float(query_scores[row])) for row in best])
+        return results
+
+    def _reserve(self, size: int, dimension: int) -> None:
+        """Grow the backing matrix geometrically so appends stay amortized O(1)."""
+        if self._matrix is None:
+            capacity = max(self.initial_capacity, size)
+            self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+            return
+        if self._matrix.shape[1] != dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: index has {self._matrix.shape[1]}, got {dimension}"
+            )
+        if size > len(self._matrix):
+            capacity = max(size, 2 * len(self._matrix))
+            grown = np.zeros((capacity, dimension), dtype=np.float32)
+            grown[:self._size] = self.vectors
+            self._matrix = grown
@@ -0,0 +1,26 @@
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.hnsw_vector_index import HNSWVectorIndex
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+
+
+class HNSWChunkRepository(InMemoryChunkRepository):
+    """In-memory chunk repository answering searches from a per-chat HNSW graph (approximate)."""
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        segment_size: int = 50000,
+        compaction_deleted_ratio: float = 0.5
+    ):
+        super().__init__(
+            embedding_service=embedding_service,
+            index_factory=lambda: HNSWVectorIndex(m=m, ef_construction=ef_construction, ef_search=ef_search),
+            segment_size=segment_size,
+            compaction_deleted_ratio=compaction_deleted_ratio
+        )
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
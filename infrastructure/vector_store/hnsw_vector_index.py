@@ -0,0 +1,185 @@
+import heapq
+import math
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+class HNSWVectorIndex(VectorIndex):
+    """Hierarchical Navigable Small World graph for approximate cosine search.
+
+    Pure Python/NumPy version of the Malkov & Yashunin algorithm. Vectors are stored normalized,
+    so similarity is a dot product. Rows excluded by the search mask are still traversed but
+    never returned, which is how soft-deleted chunks are handled.
+    """
+
+    def __init__(self, m: int = 16, ef_construction: int = 100, ef_search: int = 64, seed: Optional[int] = None):
+        if m < 2:
+            raise ValueError("HNSW parameter m must be at least 2")
+        self.m = m
+        self.max_neighbors_layer0 = 2 * m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_multiplier = 1.0 / math.log(m)
+        self._rng = np.random.default_rng(seed)
+        self._storage = FlatVectorIndex()
+        # node -> level -> neighbor rows
+        self._neighbors: List[List[List[int]]] = []
+        self._entry_point: Optional[int] = None
+        self._max_level = -1
+
+    def __len__(self) -> int:
+        return len(self._storage)
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Insert vectors one by one into the graph."""
+        if len(vectors) == 0:
+            return
+        start = len(self._storage)
+        self._storage.add(vectors)
+        for node in range(start, len(self._storage)):
+            self._insert(node)
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Greedy descent through the upper layers, then a best-first search of layer 0."""
+        if self._entry_point is None or max_results <= 0:
+            return []
+
+        query_vector = normalize_vectors(query)[0]
+        entry = self._descend(query_vector, self._entry_point, self._max_level, 0)
+        hits = self._search_layer(query_vector, [entry], max(self.ef_search, max_results), 0, mask)
+        return [(row, similarity) for similarity, row in hits[:max_results] if similarity >= similarity_threshold]
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Stored vectors of the given rows."""
+        return self._storage.decode(rows)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Rebuild the graph from the kept rows."""
+        kept = self._storage.vectors[mask].copy()
+        self._storage = FlatVectorIndex()
+        self._neighbors = []
+        self._entry_point = None
+        self._max_level = -1
+        self.add(kept)
+
+    def _similarities(self, vector: np.ndarray, rows: Sequence[int]) -> List[float]:
+        return (self._storage.vectors[np.asarray(rows)] @ vector).tolist()
+
+    def _insert(self, node: int) -> None:
+        vector = self._storage.vectors[node]
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_multiplier)
+        self._neighbors.append([[] for _ in range(level + 1)])
+
+        if self._entry_point is None:
+            self._entry_point = node
+            self._max_level = level
+            return
+
+        entries = [self._descend(vector, self._entry_point, self._max_level, level)]
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(vector, entries, self.ef_construction, layer)
+            selected = self._select_neighbors(candidates, self.m)
+            self._neighbors[node][layer] = selected
+
+            # Link back and prune neighbors that went over their degree budget
+            max_neighbors = self.max_neighbors_layer0 if layer == 0 else self.m
+            for neighbor in selected:
+                links = self._neighbors[neighbor][layer]
+                links.append(node)
+                if len(links) > max_neighbors:
+                    neighbor_vector = self._storage.vectors[neighbor]
+                    ranked = sorted(zip(self._similarities(neighbor_vector, links), links), reverse=True)
+                    self._neighbors[neighbor][layer] = self._select_neighbors(ranked, max_neighbors)
+            entries = [row for _, row in candidates]
+
+        if level > self._max_level:
+            self._entry_point = node
+            self._max_level = level
+
+    def _descend(self, vector: np.ndarray, entry: int, from_level: int, to_level: int) -> int:
+        """Greedily walk down from from_level to just above to_level, returning the closest node."""
+        current = entry
+        current_similarity = self._similarities(vector, [current])[0]
+        for layer in range(from_level, to_level, -1):
+            improved = True
+            while improved:
+                improved = False
+                neighbors = self._neighbors[current][layer]
+                if not neighbors:
+                    break
+                similarities = self._similarities(vector, neighbors)
+                best = int(np.argmax(similarities))
+                if similarities[best] > current_similarity:
+                    current, current_similarity = neighbors[best], similarities[best]
+                    improved = True
+        return current
+
+    def _search_layer(
+        self,
+        vector: np.ndarray,
+        entries: List[int],
+        ef: int,
+        layer: int,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[float, int]]:
+        """Best-first search of one layer; returns up to ef (similarity, row) pairs, best first."""
+        visited = set(entries)
+        candidates = []
+        results = []
+        for similarity, row in zip(self._similarities(vector, entries), entries):
+            candidates.append((-similarity, row))
+            if mask is None or mask[row]:
+                results.append((similarity, row))
+        heapq.heapify(candidates)
+        heapq.heapify(results)
+
+        while candidates:
+            negative_similarity, row = heapq.heappop(candidates)
+            if len(results) >= ef and -negative_similarity < results[0][0]:
+                break
+
+            neighbors = [neighbor for neighbor in self._neighbors[row][layer] if neighbor not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            for similarity, neighbor in zip(self._similarities(vector, neighbors), neighbors):
+                if len(results) < ef or similarity > results[0][0]:
+                    heapq.heappush(candidates, (-similarity, neighbor))
+                    if mask is None or mask[neighbor]:
+                        heapq.heappush(results, (similarity, neighbor))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], count: int) -> List[int]:
+        """Neighbor selection heuristic: prefer candidates that are not already covered by a closer pick."""
+        if len(candidates) <= count:
+            return [row for _, row in candidates]
+
+        rows = [row for _, row in candidates]
+        vectors = self._storage.vectors[np.asarray(rows)]
+        pairwise = vectors @ vectors.T
+
+        selected: List[int] = []
+        pruned: List[int] = []
+        for position, (similarity, _) in enumerate(candidates):
+            if len(selected) == count:
+                break
+            if selected and pairwise[position, selected].max() > similarity:
+                pruned.append(position)
+            else:
+                selected.append(position)
+
+        # Keep the degree up with the best pruned candidates
+        selected.extend(pruned[:count - len(selected)])
+        return [rows[position] for position in selected]
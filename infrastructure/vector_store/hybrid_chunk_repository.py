@@ -0,0 +1,163 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from infrastructure.vector_store.bm25_index import BM25Index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked lists of IDs: each ID scores the sum of 1 / (k + rank) over the lists holding it."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridChunkRepository(DocumentChunkRepositoryPort):
+    """Chunk repository adding BM25 lexical search on top of any vector repository.
+
+    Writes go to the wrapped repository and to one BM25 index per chat, kept up to date
+    incrementally. search_hybrid_chunks runs the lexical leg on a worker thread while the vector
+    leg runs on the calling one, then fuses both rankings with reciprocal rank fusion, so exact
+    terms (form numbers, codes, acronyms) are found without adding the latency of a second
+    search. The lexical indexes live in process: the index of a chat is built from the wrapped
+    repository's chunks on its first use, so a persistent repository keeps hybrid search after
+    a restart, then follows the writes made through this repository.
+    """
+
+    def __init__(
+        self,
+        vector_repository: DocumentChunkRepositoryPort,
+        k1: float = 1.2,
+        b: float = 0.75,
+        rrf_k: int = 60,
+        candidates: int = 20
+    ):
+        self.vector_repository = vector_repository
+        self.k1 = k1
+        self.b = b
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.lexical_indexes: Dict[str, BM25Index] = {}
+        self._chat_ids_by_document: Dict[str, set] = {}
+        # Serializes the first build of a chat's index with the writes that would update it
+        self._index_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(thread_name_prefix="lexical-search")
+
+    def save_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Save chunks in the vector repository and index their terms."""
+        saved = self.vector_repository.save_chunks(chunks)
+        grouped: Dict[str, List[DocumentChunk]] = {}
+        for chunk in saved:
+            grouped.setdefault(chunk.chat_id, []).append(chunk)
+        with self._index_lock:
+            # Chats whose index is not built yet pick the chunks up from the repository when it is
+            for chat_id, chat_chunks in grouped.items():
+                if chat_id in self.lexical_indexes:
+                    self._index(chat_id, chat_chunks)
+        return saved
+
+    def get_chunks_by_document_id(self, document_id: str) -> List[DocumentChunk]:
+        """Get all chunks for a specific document."""
+        return self.vector_repository.get_chunks_by_document_id(document_id)
+
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
+        """Get a specific chunk by ID."""
+        return self.vector_repository.get_chunk_by_id(chunk_id)
+
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID."""
+        return self.vector_repository.get_embeddings(chunk_ids)
+
+    def delete_chunks_by_document_id(self, document_id: str) -> bool:
+        """Delete all chunks for a specific document from both indexes."""
+        with self._index_lock:
+            for chat_id in self._chat_ids_by_document.pop(document_id, ()):
+                self.lexical_indexes[chat_id].remove_document(document_id)
+        return self.vector_repository.delete_chunks_by_document_id(document_id)
+
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat."""
+        return self.vector_repository.get_chunks_by_chat_id(chat_id)
+
+    def search_similar_chunks(
+        self,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Search for similar chunks using vector similarity only."""
+        return self.vector_repository.search_similar_chunks(
+            query_embedding, chat_id, max_results, similarity_threshold, chunk_filter
+        )
+
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Search for several queries at once using vector similarity only."""
+        return self.vector_repository.search_similar_chunks_batch(
+            query_embeddings, chat_id, max_results, similarity_threshold, chunk_filter
+        )
+
+    def search_hybrid_chunks(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Fuse the BM25 and vector rankings of a query.
+
+        Each leg returns up to max(max_results, candidates) chunks; the similarity threshold only
+        applies to the vector leg. The similarity of a fused hit is its cosine similarity from the
+        vector leg; hits only the lexical leg found get 0.0 and are flagged lexical_only.
+        """
+        index = self._lexical_index(chat_id)
+        if len(index) == 0:
+            return self.search_similar_chunks(query_embedding, chat_id, max_results, similarity_threshold, chunk_filter)
+
+        depth = max(max_results, self.candidates)
+        lexical_future = self._executor.submit(index.search, query_text, depth, chunk_filter)
+        vector_hits = self.vector_repository.search_similar_chunks(
+            query_embedding, chat_id, depth, similarity_threshold, chunk_filter
+        )
+        lexical_hits = lexical_future.result()
+
+        chunks = {hit.chunk.chunk_id: hit.chunk for hit in vector_hits}
+        for chunk, _ in lexical_hits:
+            chunks.setdefault(chunk.chunk_id, chunk)
+        similarities = {hit.chunk.chunk_id: hit.similarity for hit in vector_hits}
+        fused = reciprocal_rank_fusion(
+            [[hit.chunk.chunk_id for hit in vector_hits], [chunk.chunk_id for chunk, _ in lexical_hits]],
+            self.rrf_k
+        )
+        return [
+            ScoredChunk(chunks[chunk_id], similarities.get(chunk_id, 0.0), rank, chunk_id not in similarities)
+            for rank, (chunk_id, _) in enumerate(fused[:max_results], start=1)
+        ]
+
+    def _lexical_index(self, chat_id: str) -> BM25Index:
+        """BM25 index of a chat, built from the wrapped repository's chunks on first use."""
+        with self._index_lock:
+            if chat_id not in self.lexical_indexes:
+                self.lexical_indexes[chat_id] = BM25Index(self.k1, self.b)
+                self._index(chat_id, self.vector_repository.get_chunks_by_chat_id(chat_id))
+            return self.lexical_indexes[chat_id]
+
+    def _index(self, chat_id: str, chunks: List[DocumentChunk]) -> None:
+        for chunk in chunks:
+            self._chat_ids_by_document.setdefault(chunk.document_id, set()).add(chat_id)
+        self.lexical_indexes[chat_id].add(chunks)
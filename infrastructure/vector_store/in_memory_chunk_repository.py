@@ -1,80 +1,168 @@
-from typing import List, Optional
-import numpy as np
+import threading
+from typing import Callable, Dict, List, Optional
+from domain.model.chunk_filter import ChunkFilter
 from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
 from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
 from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.service.chunk_embedder import chunk_embeddings
+from infrastructure.concurrency.read_write_lock import ReadWriteLock
+from infrastructure.vector_store.chat_partition import ChatPartition
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.vector_index import VectorIndex
 
 
 class InMemoryChunkRepository(DocumentChunkRepositoryPort):
-    """In-memory implementation of document chunk repository with vector search."""
-    
-    def __init__(self, embedding_service: EmbeddingServicePort):
-        self.chunks: List[DocumentChunk] = []
-        self.embeddings: List[List[float]] = []
+    """In-memory implementation of document chunk repository with vector search.
+
+    Chunks are stored in one partition per chat, so a search only scans the vectors of that chat.
+    Partitions are split into segments of at most segment_size rows, each with its own vector index
+    built by index_factory (exact flat search by default); see ChatPartition for deletes and
+    compaction.
+
+    The repository is safe to share between threads. Searches and appends hold its reader-writer
+    lock shared, so they run concurrently (each partition serializes its own appends); deletes,
+    which may drop a whole partition, hold it exclusively. The lookup dicts are only touched
+    under a small mutex.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        index_factory: Callable[[], VectorIndex] = FlatVectorIndex,
+        segment_size: int = 50000,
+        compaction_deleted_ratio: float = 0.5
+    ):
+        self.partitions: Dict[str, ChatPartition] = {}
         self.embedding_service = embedding_service
-    
+        self.index_factory = index_factory
+        self.segment_size = segment_size
+        self.compaction_deleted_ratio = compaction_deleted_ratio
+        # Documents may be spread across several chats, so remember every partition they touch
+        self._chat_ids_by_document: Dict[str, set] = {}
+        self._chunks_by_id: Dict[str, DocumentChunk] = {}
+        self._lock = ReadWriteLock()
+        self._index_lock = threading.Lock()
+
     def save_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
-        """Save multiple document chunks and generate their embeddings."""
+        """Save multiple document chunks, generating the embeddings they do not carry yet."""
         if not chunks:
             return []
-        
-        # Generate embeddings for all chunks
-        texts = [chunk.content for chunk in chunks]
-        embeddings = self.embedding_service.generate_embeddings_batch(texts)
-        
-        # Store chunks and embeddings
-        for chunk, embedding in zip(chunks, embeddings):
-            self.chunks.append(chunk)
-            self.embeddings.append(embedding)
-        
+
+        embeddings = chunk_embeddings(chunks, self.embedding_service)
+        # The vectors are kept by the segment indexes only
+        stored = [chunk.without_embedding() for chunk in chunks]
+
+        # Group chunks by chat and append them to their (lazily created) partitions
+        grouped: Dict[str, tuple] = {}
+        for chunk, embedding in zip(stored, embeddings):
+            chat_chunks, chat_embeddings = grouped.setdefault(chunk.chat_id, ([], []))
+            chat_chunks.append(chunk)
+            chat_embeddings.append(embedding)
+
+        # Shared: partitions cannot be dropped by a delete until the chunks are in
+        with self._lock.read():
+            with self._index_lock:
+                for chunk in stored:
+                    self._chat_ids_by_document.setdefault(chunk.document_id, set()).add(chunk.chat_id)
+                    self._chunks_by_id[chunk.chunk_id] = chunk
+                for chat_id in grouped:
+                    if chat_id not in self.partitions:
+                        self.partitions[chat_id] = ChatPartition(
+                            chat_id,
+                            self.index_factory,
+                            segment_size=self.segment_size,
+                            compaction_deleted_ratio=self.compaction_deleted_ratio
+                        )
+                partitions = {chat_id: self.partitions[chat_id] for chat_id in grouped}
+            for chat_id, (chat_chunks, chat_embeddings) in grouped.items():
+                partitions[chat_id].add(chat_chunks, chat_embeddings)
+
         return chunks
-    
+
     def get_chunks_by_document_id(self, document_id: str) -> List[DocumentChunk]:
         """Get all chunks for a specific document."""
-        return [chunk for chunk in self.chunks if chunk.document_id == document_id]
-    
+        with self._lock.read():
+            with self._index_lock:
+                partitions = [self.partitions[chat_id] for chat_id in self._chat_ids_by_document.get(document_id, ())]
+            return [chunk for partition in partitions for chunk in partition.chunks_of_document(document_id)]
+
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat."""
+        with self._lock.read():
+            with self._index_lock:
+                partition = self.partitions.get(chat_id)
+            return partition.chunks if partition is not None else []
+
     def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
         """Get a specific chunk by ID."""
-        for chunk in self.chunks:
-            if chunk.chunk_id == chunk_id:
-                return chunk
-        return None
-    
+        with self._index_lock:
+            return self._chunks_by_id.get(chunk_id)
+
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID, decoded from their segment's index."""
+        grouped: Dict[str, List[str]] = {}
+        with self._index_lock:
+            for chunk_id in chunk_ids:
+                chunk = self._chunks_by_id.get(chunk_id)
+                if chunk is not None:
+                    grouped.setdefault(chunk.chat_id, []).append(chunk_id)
+        found = {}
+        with self._lock.read():
+            for chat_id, chat_chunk_ids in grouped.items():
+                partition = self.partitions.get(chat_id)
+                if partition is not None:
+                    found.update(partition.embeddings(chat_chunk_ids))
+        return {chunk_id: vector.tolist() for chunk_id, vector in found.items()}
+
     def delete_chunks_by_document_id(self, document_id: str) -> bool:
         """Delete all chunks for a specific document."""
-        indices_to_remove = []
-        for i, chunk in enumerate(self.chunks):
-            if chunk.document_id == document_id:
-                indices_to_remove.append(i)
-        
-        # Remove in reverse order to maintain indices
-        for i in reversed(indices_to_remove):
-            del self.chunks[i]
-            del self.embeddings[i]
-        
-        return len(indices_to_remove) > 0
-    
+        removed = False
+        with self._lock.write(), self._index_lock:
+            for chat_id in self._chat_ids_by_document.pop(document_id, ()):
+                partition = self.partitions[chat_id]
+                for chunk in partition.chunks_of_document(document_id):
+                    self._chunks_by_id.pop(chunk.chunk_id, None)
+                removed = partition.remove_document(document_id) or removed
+                # Drop the partition together with its last document
+                if len(partition) == 0:
+                    del self.partitions[chat_id]
+
+        return removed
+
     def search_similar_chunks(
-        self, 
-        query_embedding: List[float], 
+        self,
+        query_embedding: List[float],
         chat_id: str,
         max_results: int = 5,
-        similarity_threshold: float = 0.7
-    ) -> List[DocumentChunk]:
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
         """Search for similar chunks using vector similarity."""
-        if not self.chunks:
-            return []
-        
-        # Filter chunks by chat_id and calculate similarities
-        similarities = []
-        for i, (chunk, embedding) in enumerate(zip(self.chunks, self.embeddings)):
-            if chunk.chat_id == chat_id:
-                similarity = self.embedding_service.calculate_similarity(query_embedding, embedding)
-                if similarity >= similarity_threshold:
-                    similarities.append((i, similarity))
-        
-        # Sort by similarity (descending) and return top results
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        top_indices = [idx for idx, _ in similarities[:max_results]]
-        
-        return [self.chunks[i] for i in top_indices] 
\ No newline at end of file
+        with self._lock.read():
+            with self._index_lock:
+                partition = self.partitions.get(chat_id)
+            if partition is None:
+                return []
+            hits = partition.search(query_embedding, max_results, similarity_threshold, chunk_filter)
+        return [ScoredChunk(chunk, score, rank) for rank, (chunk, score) in enumerate(hits, start=1)]
+
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Search for several queries at once, scoring them together against each segment."""
+        with self._lock.read():
+            with self._index_lock:
+                partition = self.partitions.get(chat_id)
+            if partition is None:
+                return [[] for _ in query_embeddings]
+            batch = partition.search_batch(query_embeddings, max_results, similarity_threshold, chunk_filter)
+        return [
+            [ScoredChunk(chunk, score, rank) for rank, (chunk, score) in enumerate(hits, start=1)]
+            for hits in batch
+        ]
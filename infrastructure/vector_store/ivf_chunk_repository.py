@@ -0,0 +1,33 @@
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+from infrastructure.vector_store.ivf_vector_index import IVFVectorIndex
+
+
+class IVFChunkRepository(InMemoryChunkRepository):
+    """In-memory chunk repository answering searches from per-chat IVF-flat indexes (approximate)."""
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        nlist: int = 0,
+        nprobe: int = 8,
+        retrain_growth_factor: float = 2.0,
+        min_training_size: int = 1000,
+        segment_size: int = 50000,
+        compaction_deleted_ratio: float = 0.5
+    ):
+        super().__init__(
+            embedding_service=embedding_service,
+            index_factory=lambda: IVFVectorIndex(
+                nlist=nlist,
+                nprobe=nprobe,
+                retrain_growth_factor=retrain_growth_factor,
+                min_training_size=min_training_size
+            ),
+            segment_size=segment_size,
+            compaction_deleted_ratio=compaction_deleted_ratio
+        )
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.retrain_growth_factor = retrain_growth_factor
+        self.min_training_size = min_training_size
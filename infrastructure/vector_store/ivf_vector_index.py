@@ -0,0 +1,201 @@
+import math
+import threading
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors, top_k
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    clusters: int,
+    iterations: int = 20,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity; returns normalized centroids."""
+    rng = rng or np.random.default_rng()
+    clusters = min(clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign_to_centroids(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        present, starts = np.unique(labels[order], return_index=True)
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+
+        updated = centroids.copy()
+        updated[present] = sums
+        # Re-seed empty clusters with random points so every list stays useful
+        empty = np.setdiff1d(np.arange(clusters), present)
+        if len(empty):
+            updated[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+        updated = normalize_vectors(updated)
+
+        if np.allclose(updated, centroids, atol=1e-6):
+            break
+        centroids = updated
+
+    return centroids
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+    """Index of the most similar centroid for every vector, computed in bounded-memory batches."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch_size):
+        labels[start:start + batch_size] = np.argmax(vectors[start:start + batch_size] @ centroids.T, axis=1)
+    return labels
+
+
+class IVFLayout:
+    """Coarse centroids and the inverted lists of rows assigned to each of them."""
+
+    def __init__(self, centroids: np.ndarray, labels: np.ndarray, trained_size: int):
+        self.centroids = centroids
+        self.trained_size = trained_size
+        self.lists: List[List[int]] = [[] for _ in range(len(centroids))]
+        for row, label in enumerate(labels.tolist()):
+            self.lists[label].append(row)
+
+    def append(self, first_row: int, vectors: np.ndarray) -> None:
+        for offset, label in enumerate(assign_to_centroids(vectors, self.centroids).tolist()):
+            self.lists[label].append(first_row + offset)
+
+
+class IVFVectorIndex(VectorIndex):
+    """Inverted-file index with flat (uncompressed) lists for approximate cosine search.
+
+    Rows are assigned to the nearest k-means centroid and a query only scans the nprobe closest
+    lists. Until min_training_size rows are stored the index answers with an exact scan. Once the
+    corpus has grown by retrain_growth_factor since the last training, centroids are retrained in
+    a background thread while searches keep using the previous layout, which is swapped in
+    atomically when the new one is ready.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 0,
+        nprobe: int = 8,
+        retrain_growth_factor: float = 2.0,
+        min_training_size: int = 1000,
+        background: bool = True,
+        seed: Optional[int] = None
+    ):
+        if nprobe < 1:
+            raise ValueError("IVF nprobe must be at least 1")
+        if retrain_growth_factor <= 1.0:
+            raise ValueError("IVF retrain_growth_factor must be greater than 1")
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.retrain_growth_factor = retrain_growth_factor
+        self.min_training_size = min_training_size
+        self.background = background
+        self._rng = np.random.default_rng(seed)
+        self._storage = FlatVectorIndex()
+        self._layout: Optional[IVFLayout] = None
+        self._lock = threading.Lock()
+        self._training_thread: Optional[threading.Thread] = None
+        # Bumped whenever rows are renumbered, so a stale training result is discarded
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._storage)
+
+    @property
+    def layout(self) -> Optional[IVFLayout]:
+        """Layout currently used to answer queries (None while the index is untrained)."""
+        return self._layout
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors and route them to the inverted lists of the current layout."""
+        if len(vectors) == 0:
+            return
+        with self._lock:
+            first_row = len(self._storage)
+            self._storage.add(vectors)
+            if self._layout is not None:
+                self._layout.append(first_row, self._storage.vectors[first_row:])
+        self._maybe_train()
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Scan the nprobe lists whose centroids are closest to the query."""
+        layout = self._layout
+        if layout is None:
+            return self._storage.search(query, max_results, similarity_threshold, mask)
+
+        query_vector = normalize_vectors(query)[0]
+        probed = top_k(layout.centroids @ query_vector, self.nprobe)
+        rows = np.concatenate([np.asarray(layout.lists[label], dtype=np.int64) for label in probed])
+        if mask is not None:
+            rows = rows[mask[rows]]
+
+        scores = self._storage.vectors[rows] @ query_vector
+        eligible = np.flatnonzero(scores >= similarity_threshold)
+        best = eligible[top_k(scores[eligible], max_results)]
+        return [(int(rows[position]), float(scores[position])) for position in best]
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Stored vectors of the given rows."""
+        return self._storage.decode(rows)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop rows and renumber the inverted lists without retraining."""
+        with self._lock:
+            self._storage.keep(mask)
+            self._generation += 1
+            if self._layout is not None:
+                new_rows = np.cumsum(mask) - 1
+                remapped = IVFLayout(
+                    self._layout.centroids,
+                    np.empty(0, dtype=np.int32),
+                    min(self._layout.trained_size, len(self._storage))
+                )
+                remapped.lists = [[int(new_rows[row]) for row in rows if mask[row]] for rows in self._layout.lists]
+                self._layout = remapped
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> None:
+        """Block until a background (re)training, if any, has finished."""
+        thread = self._training_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _maybe_train(self) -> None:
+        # Checked and started under the lock, so concurrent adds start at most one training
+        with self._lock:
+            size = len(self._storage)
+            if size < self.min_training_size:
+                return
+            if self._layout is not None and size < self._layout.trained_size * self.retrain_growth_factor:
+                return
+            if self._training_thread is not None and self._training_thread.is_alive():
+                return
+            if self.background:
+                self._training_thread = threading.Thread(target=self._train, name="ivf-retraining", daemon=True)
+                self._training_thread.start()
+                return
+        self._train()
+
+    def _train(self) -> None:
+        with self._lock:
+            generation = self._generation
+            snapshot = self._storage.vectors.copy()
+
+        clusters = self.nlist or max(1, int(math.sqrt(len(snapshot))))
+        # Training on a bounded sample keeps k-means cost independent of the corpus size
+        sample_size = min(len(snapshot), 256 * clusters)
+        sample = snapshot[self._rng.choice(len(snapshot), size=sample_size, replace=False)]
+        centroids = spherical_kmeans(sample, clusters, rng=self._rng)
+        layout = IVFLayout(centroids, assign_to_centroids(snapshot, centroids), len(snapshot))
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            # Route rows that arrived while training, then swap the layout in
+            if len(self._storage) > len(snapshot):
+                layout.append(len(snapshot), self._storage.vectors[len(snapshot):])
+            self._layout = layout
@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+
+# Scalar metadata values that get a bitmap; other values (lists, dicts...) cannot be filtered on
+BITMAP_VALUE_TYPES = (str, int, float, bool)
+
+
+class MetadataBitmaps:
+    """Per-attribute bool bitmaps over row-aligned chunk metadata.
+
+    Every (key, value) pair with a scalar value gets a bitmap of the rows holding it, and the
+    created_at attribute is kept as a float64 timestamp column (NaN when missing) for range
+    conditions. mask() combines them with vectorized boolean operations, so the cost of a filter
+    does not depend on how selective it is. Bitmaps grow geometrically like FlatVectorIndex.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._capacity = initial_capacity
+        self._size = 0
+        self._bitmaps: Dict[Tuple[str, Any], np.ndarray] = {}
+        self._timestamps = np.full(initial_capacity, np.nan)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, metadatas: List[Dict[str, Any]]) -> None:
+        """Append the metadata of new rows."""
+        self._reserve(self._size + len(metadatas))
+        for row, metadata in enumerate(metadatas, start=self._size):
+            for key, value in metadata.items():
+                if key == "created_at":
+                    self._timestamps[row] = self._timestamp(value)
+                elif isinstance(value, BITMAP_VALUE_TYPES):
+                    bitmap = self._bitmaps.get((key, value))
+                    if bitmap is None:
+                        bitmap = self._bitmaps[(key, value)] = np.zeros(self._capacity, dtype=bool)
+                    bitmap[row] = True
+        self._size += len(metadatas)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False."""
+        size = int(mask.sum())
+        for key, bitmap in list(self._bitmaps.items()):
+            kept = bitmap[:self._size][mask]
+            if not kept.any():
+                del self._bitmaps[key]
+                continue
+            bitmap[:size] = kept
+            bitmap[size:] = False
+        self._timestamps[:size] = self._timestamps[:self._size][mask]
+        self._timestamps[size:] = np.nan
+        self._size = size
+
+    def mask(self, chunk_filter: ChunkFilter) -> Optional[np.ndarray]:
+        """Rows meeting the type, date and metadata conditions (None when there are none)."""
+        conditions = []
+        if chunk_filter.document_types is not None:
+            any_type = np.zeros(self._size, dtype=bool)
+            for document_type in chunk_filter.document_types:
+                any_type |= self._bitmap("document_type", document_type.value)
+            conditions.append(any_type)
+        for key, value in chunk_filter.metadata.items():
+            conditions.append(self._bitmap(key, value))
+        timestamps = self._timestamps[:self._size]
+        # Comparisons with NaN are False, so rows without created_at never match a date range
+        if chunk_filter.created_after is not None:
+            conditions.append(timestamps >= chunk_filter.created_after.timestamp())
+        if chunk_filter.created_before is not None:
+            conditions.append(timestamps <= chunk_filter.created_before.timestamp())
+
+        if not conditions:
+            return None
+        mask = conditions[0].copy()
+        for condition in conditions[1:]:
+            mask &= condition
+        return mask
+
+    def _bitmap(self, key: str, value: Any) -> np.ndarray:
+        bitmap = self._bitmaps.get((key, value))
+        if bitmap is None:
+            return np.zeros(self._size, dtype=bool)
+        return bitmap[:self._size]
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity)
+        for key, bitmap in self._bitmaps.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:self._size] = bitmap[:self._size]
+            self._bitmaps[key] = grown
+        timestamps = np.full(capacity, np.nan)
+        timestamps[:self._size] = self._timestamps[:self._size]
+        self._timestamps = timestamps
+        self._capacity = capacity
+
+    @staticmethod
+    def _timestamp(value: Any) -> float:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return np.nan
+        return np.nan
@@ -0,0 +1,578 @@
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.service.chunk_embedder import chunk_embeddings
+from infrastructure.vector_store.flat_vector_index import normalize_vectors, top_k
+from infrastructure.vector_store.metadata_bitmaps import MetadataBitmaps
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: the single-writer rule is then not enforced
+    fcntl = None
+
+# Fixed-size record describing one stored chunk
+ROW_DTYPE = np.dtype([
+    ("offset", "<i8"),
+    ("length", "<i4"),
+    ("chat", "<i4"),
+    ("document", "<i4"),
+    ("alive", "u1"),
+])
+
+# Rows scored per matrix-vector product when scanning the mapping
+SCAN_BATCH_SIZE = 65536
+
+# Seconds between two checks of the inbox (writer) or of a forwarded write's result (reader)
+INBOX_POLL_INTERVAL = 0.02
+
+
+class WriterLockHeldError(ValueError):
+    """Raised when opening a store for writing while another process is its writer."""
+
+
+class StoreSnapshot:
+    """Row table and vectors mapped at one point in time, with the caches derived from them.
+
+    Loads and writes replace the repository's snapshot rather than change it, so a call working
+    on the snapshot it took keeps consistent arrays while another thread remaps the files.
+    """
+
+    def __init__(self, rows: np.ndarray, vectors: np.ndarray, chunk_rows_by_id: Optional[Dict[str, int]] = None):
+        self.rows = rows
+        self.vectors = vectors
+        self.chat_rows: Dict[str, np.ndarray] = {}
+        self.chat_metadata: Dict[str, MetadataBitmaps] = {}
+        # Built from the side file on first lookup; may list rows appended after this snapshot
+        self.chunk_rows_by_id = chunk_rows_by_id
+
+
+class MemoryMappedChunkRepository(DocumentChunkRepositoryPort):
+    """Persistent chunk repository backed by memory-mapped files.
+
+    Layout of the store directory:
+    - embeddings.f32: normalized float32 vectors, one row per chunk, opened with np.memmap
+    - chunks.jsonl: one JSON record per chunk (content and metadata)
+    - rows.idx: one ROW_DTYPE record per chunk (side-file offset and length, chat and document
+      codes, alive flag), also memory-mapped
+    - keys.jsonl: append-only mapping from chat and document ids to the codes used in rows.idx
+    - meta.json: embedding dimension
+    - generation.u64: write counter, bumped by the writer after every change
+    - writer.lock: held (flock) by the only instance allowed to write
+
+    Opening an existing store maps the files and reads the small key table, so a restart takes
+    milliseconds and nothing is re-embedded. Rows are appended; deletes clear the alive flag.
+    A save writes the side file, then the vectors, then the row table, so rows.idx defines what
+    is stored: when the writer opens the store, the bytes a crash left past its last complete row
+    are truncated from the other files, so the next append lines up with its row again.
+
+    Several processes (e.g. uvicorn workers) can share one store: a single writer applies inserts
+    and deletes while read_only instances serve searches straight from the same shared mappings,
+    so the vectors sit once in the page cache whatever the number of workers. Readers compare
+    the generation counter on every call and remap the files when the writer has changed them;
+    every call works on the StoreSnapshot current when it started. Writes made on a reader are forwarded to the writer: the reader embeds the chunks, drops the
+    request in the store's inbox directory and waits (up to forward_timeout seconds) for the
+    result the writer's inbox thread leaves there. open_shared opens the store as its writer if
+    no other process is, and read-only otherwise, so identical workers can share one config.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingServicePort,
+        path: str,
+        read_only: bool = False,
+        forward_timeout: float = 30.0
+    ):
+        self.embedding_service = embedding_service
+        self.path = path
+        self.read_only = read_only
+        self.forward_timeout = forward_timeout
+        self._inbox_path = os.path.join(path, "inbox")
+        os.makedirs(self._inbox_path, exist_ok=True)
+        self._embeddings_path = os.path.join(path, "embeddings.f32")
+        self._chunks_path = os.path.join(path, "chunks.jsonl")
+        self._rows_path = os.path.join(path, "rows.idx")
+        self._keys_path = os.path.join(path, "keys.jsonl")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._generation_path = os.path.join(path, "generation.u64")
+
+        for file_path in (self._embeddings_path, self._chunks_path, self._rows_path, self._keys_path):
+            open(file_path, "ab").close()
+        with open(self._generation_path, "ab") as file:
+            if file.tell() < 8:
+                file.write(bytes(8 - file.tell()))
+        self._generation = np.memmap(self._generation_path, dtype="<u8", mode="r" if read_only else "r+", shape=(1,))
+
+        self._writer_lock = None
+        if not read_only:
+            self._acquire_writer_lock()
+            self._recover()
+
+        self.dimension: Optional[int] = None
+        self._codes: Dict[str, Dict[str, int]] = {"chat": {}, "document": {}}
+        self._keys_offset = 0
+        self._chunks_file = open(self._chunks_path, "rb")
+        self._snapshot = StoreSnapshot(np.zeros(0, dtype=ROW_DTYPE), np.zeros((0, 0), dtype=np.float32))
+        # Serializes the loads of a reader, which replace the snapshot and advance the keys offset
+        self._refresh_lock = threading.Lock()
+        self._load()
+
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._inbox_thread = None
+        if not read_only:
+            self._inbox_thread = threading.Thread(target=self._serve_inbox, name="mmap-store-inbox", daemon=True)
+            self._inbox_thread.start()
+
+    @classmethod
+    def open_shared(cls, embedding_service: EmbeddingServicePort, path: str, **kwargs) -> "MemoryMappedChunkRepository":
+        """Open the store as its writer, or read-only when another process already is."""
+        try:
+            return cls(embedding_service, path, **kwargs)
+        except WriterLockHeldError:
+            return cls(embedding_service, path, read_only=True, **kwargs)
+
+    def __len__(self) -> int:
+        return int(self._refresh().rows["alive"].sum())
+
+    def close(self) -> None:
+        """Release the open file handles, mappings and writer lock."""
+        self._stopped.set()
+        if self._inbox_thread is not None:
+            self._inbox_thread.join()
+            self._inbox_thread = None
+        self._chunks_file.close()
+        if self._writer_lock is not None:
+            self._writer_lock.close()
+            self._writer_lock = None
+        self._snapshot = StoreSnapshot(np.zeros(0, dtype=ROW_DTYPE), np.zeros((0, self.dimension or 0), dtype=np.float32))
+
+    def save_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Embed the chunks without an embedding and append them to the store (through the writer on readers)."""
+        if not chunks:
+            return []
+
+        embeddings = chunk_embeddings(chunks, self.embedding_service)
+        if self.read_only:
+            records = [{**self._to_record(chunk), "embedding": list(map(float, embedding))}
+                       for chunk, embedding in zip(chunks, embeddings)]
+            self._forward({"operation": "save", "chunks": records})
+            return chunks
+        with self._write_lock:
+            self._append(chunks, normalize_vectors(embeddings))
+        return chunks
+
+    def _append(self, chunks: List[DocumentChunk], vectors: np.ndarray) -> None:
+        if self.dimension is None:
+            self.dimension = int(vectors.shape[1])
+            with open(self._meta_path, "w") as file:
+                json.dump({"dimension": self.dimension}, file)
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Embedding dimension mismatch: store has {self.dimension}, got {vectors.shape[1]}")
+
+        rows = np.zeros(len(chunks), dtype=ROW_DTYPE)
+        with open(self._chunks_path, "ab") as file:
+            file.seek(0, os.SEEK_END)
+            for i, chunk in enumerate(chunks):
+                record = json.dumps(self._to_record(chunk)).encode("utf-8") + b"\n"
+                rows[i] = (file.tell(), len(record), self._code("chat", chunk.chat_id),
+                           self._code("document", chunk.document_id), 1)
+                file.write(record)
+
+        # The row table is written last: it defines how many rows survive a crash (see _recover)
+        with open(self._embeddings_path, "ab") as file:
+            file.write(vectors.tobytes())
+        with open(self._rows_path, "ab") as file:
+            file.write(rows.tobytes())
+
+        first_row = len(self._snapshot.rows)
+        chunk_rows_by_id = self._snapshot.chunk_rows_by_id
+        if chunk_rows_by_id is not None:
+            for i, chunk in enumerate(chunks):
+                chunk_rows_by_id[chunk.chunk_id] = first_row + i
+        self._remap(chunk_rows_by_id)
+        self._bump_generation()
+
+    def get_chunks_by_document_id(self, document_id: str) -> List[DocumentChunk]:
+        """Get all chunks for a specific document."""
+        snapshot = self._refresh()
+        code = self._codes["document"].get(document_id)
+        if code is None:
+            return []
+        rows = np.flatnonzero((snapshot.rows["document"] == code) & (snapshot.rows["alive"] == 1))
+        return [self._load_chunk(snapshot, row) for row in rows]
+
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat."""
+        snapshot = self._refresh()
+        return [self._load_chunk(snapshot, row) for row in self._rows_of_chat(snapshot, chat_id)]
+
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
+        """Get a specific chunk by ID."""
+        snapshot = self._refresh()
+        if snapshot.chunk_rows_by_id is None:
+            snapshot.chunk_rows_by_id = self._scan_chunk_ids(snapshot)
+        row = snapshot.chunk_rows_by_id.get(chunk_id)
+        if row is None or row >= len(snapshot.rows) or not snapshot.rows["alive"][row]:
+            return None
+        return self._load_chunk(snapshot, row)
+
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID, read from the vector mapping."""
+        snapshot = self._refresh()
+        if snapshot.chunk_rows_by_id is None:
+            snapshot.chunk_rows_by_id = self._scan_chunk_ids(snapshot)
+        found = {}
+        for chunk_id in chunk_ids:
+            row = snapshot.chunk_rows_by_id.get(chunk_id)
+            if row is not None and row < len(snapshot.rows) and snapshot.rows["alive"][row]:
+                found[chunk_id] = snapshot.vectors[row].tolist()
+        return found
+
+    def delete_chunks_by_document_id(self, document_id: str) -> bool:
+        """Flag every chunk of a document as deleted (through the writer on readers)."""
+        if self.read_only:
+            return self._forward({"operation": "delete", "document_id": document_id})
+        with self._write_lock:
+            return self._delete(document_id)
+
+    def _delete(self, document_id: str) -> bool:
+        code = self._codes["document"].get(document_id)
+        if code is None:
+            return False
+        snapshot = self._snapshot
+        rows = np.flatnonzero((snapshot.rows["document"] == code) & (snapshot.rows["alive"] == 1))
+        if len(rows) == 0:
+            return False
+        snapshot.rows["alive"][rows] = 0
+        snapshot.rows.flush()
+        # Same mappings, without the chat caches listing the deleted rows
+        self._snapshot = StoreSnapshot(snapshot.rows, snapshot.vectors, snapshot.chunk_rows_by_id)
+        self._bump_generation()
+        return True
+
+    def search_similar_chunks(
+        self,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Exact cosine search over the memory-mapped vectors of one chat."""
+        snapshot = self._refresh()
+        rows = self._rows_of_chat(snapshot, chat_id)
+        mask = self._filter_mask(snapshot, chat_id, rows, chunk_filter)
+        if len(rows) == 0 or (mask is not None and not mask.any()):
+            return []
+
+        scores = self._score_rows(snapshot, rows, normalize_vectors(query_embedding))[0]
+        return self._best_hits(snapshot, rows, scores, max_results, similarity_threshold, mask)
+
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Exact cosine search for several queries, scored together in matrix-matrix products."""
+        snapshot = self._refresh()
+        rows = self._rows_of_chat(snapshot, chat_id)
+        mask = self._filter_mask(snapshot, chat_id, rows, chunk_filter)
+        if len(rows) == 0 or len(query_embeddings) == 0 or (mask is not None and not mask.any()):
+            return [[] for _ in query_embeddings]
+
+        return [
+            self._best_hits(snapshot, rows, scores, max_results, similarity_threshold, mask)
+            for scores in self._score_rows(snapshot, rows, normalize_vectors(query_embeddings))
+        ]
+
+    def _best_hits(
+        self,
+        snapshot: StoreSnapshot,
+        rows: np.ndarray,
+        scores: np.ndarray,
+        max_results: int,
+        similarity_threshold: float,
+        mask: Optional[np.ndarray] = None
+    ) -> List[ScoredChunk]:
+        eligible = scores >= similarity_threshold
+        if mask is not None:
+            eligible &= mask
+        eligible = np.flatnonzero(eligible)
+        best = eligible[top_k(scores[eligible], max_results)]
+        return [
+            ScoredChunk(self._load_chunk(snapshot, rows[position]), float(scores[position]), rank)
+            for rank, position in enumerate(best, start=1)
+        ]
+
+    def _score_rows(self, snapshot: StoreSnapshot, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Similarity of every query (normalized, one per row) with the given stored rows."""
+        first, last = int(rows[0]), int(rows[-1]) + 1
+        if last - first > 2 * len(rows):
+            return queries @ snapshot.vectors[rows].T
+
+        # Chats are mostly stored in runs: scoring the contiguous span reads the mapping in
+        # place, where fancy indexing would first copy every selected row
+        span_scores = np.empty((len(queries), last - first), dtype=np.float32)
+        for start in range(first, last, SCAN_BATCH_SIZE):
+            stop = min(start + SCAN_BATCH_SIZE, last)
+            span_scores[:, start - first:stop - first] = queries @ snapshot.vectors[start:stop].T
+        return span_scores[:, rows - first]
+
+    def _filter_mask(
+        self,
+        snapshot: StoreSnapshot,
+        chat_id: str,
+        rows: np.ndarray,
+        chunk_filter: Optional[ChunkFilter]
+    ) -> Optional[np.ndarray]:
+        """Positions (aligned with rows) meeting the filter, or None when there is nothing to filter."""
+        if chunk_filter is None or chunk_filter.is_empty() or len(rows) == 0:
+            return None
+
+        mask = np.ones(len(rows), dtype=bool)
+        if chunk_filter.document_ids is not None:
+            codes = [self._codes["document"][document_id] for document_id in chunk_filter.document_ids
+                     if document_id in self._codes["document"]]
+            mask &= np.isin(snapshot.rows["document"][rows], codes)
+        metadata_mask = self._metadata_of_chat(snapshot, chat_id, rows).mask(chunk_filter)
+        if metadata_mask is not None:
+            mask &= metadata_mask
+        return mask
+
+    def _metadata_of_chat(self, snapshot: StoreSnapshot, chat_id: str, rows: np.ndarray) -> MetadataBitmaps:
+        """Metadata bitmaps of a chat's live rows, read once from the side file and cached in the snapshot."""
+        if chat_id not in snapshot.chat_metadata:
+            bitmaps = MetadataBitmaps(initial_capacity=len(rows))
+            bitmaps.add([self._read_record(snapshot, row)["metadata"] for row in rows])
+            snapshot.chat_metadata[chat_id] = bitmaps
+        return snapshot.chat_metadata[chat_id]
+
+    def _acquire_writer_lock(self) -> None:
+        self._writer_lock = open(os.path.join(self.path, "writer.lock"), "a")
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._writer_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._writer_lock.close()
+            self._writer_lock = None
+            raise WriterLockHeldError(f"Another process is already writing to {self.path}; open it with read_only=True")
+
+    def _recover(self) -> None:
+        """Truncate what an interrupted save left past the last complete row (writer only)."""
+        dimension = None
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r") as file:
+                dimension = json.load(file)["dimension"]
+        count = 0
+        if dimension:
+            count = min(
+                os.path.getsize(self._rows_path) // ROW_DTYPE.itemsize,
+                os.path.getsize(self._embeddings_path) // (4 * dimension)
+            )
+        rows = np.fromfile(self._rows_path, dtype=ROW_DTYPE, count=count)
+        # Rows are only kept while their record is entirely in the side file
+        ends = rows["offset"] + rows["length"]
+        incomplete = np.flatnonzero(ends > os.path.getsize(self._chunks_path))
+        if len(incomplete):
+            count = int(incomplete[0])
+
+        self._truncate(self._rows_path, count * ROW_DTYPE.itemsize)
+        self._truncate(self._embeddings_path, count * 4 * (dimension or 0))
+        self._truncate(self._chunks_path, int(ends[count - 1]) if count else 0)
+        # A key line cut short by the crash would corrupt the next one appended
+        with open(self._keys_path, "rb") as file:
+            keys = file.read()
+        self._truncate(self._keys_path, keys.rfind(b"\n") + 1)
+
+    @staticmethod
+    def _truncate(file_path: str, size: int) -> None:
+        if os.path.getsize(file_path) > size:
+            os.truncate(file_path, size)
+
+    def _forward(self, request: Dict[str, Any]) -> Any:
+        """Hand a write to the writer process through the inbox and wait for its result."""
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex}"
+        request_path = os.path.join(self._inbox_path, f"{name}.request")
+        result_path = os.path.join(self._inbox_path, f"{name}.result")
+        with open(f"{request_path}.tmp", "w") as file:
+            json.dump(request, file)
+        os.replace(f"{request_path}.tmp", request_path)
+
+        deadline = time.monotonic() + self.forward_timeout
+        while not os.path.exists(result_path):
+            if time.monotonic() > deadline:
+                try:
+                    os.remove(request_path)
+                except FileNotFoundError:
+                    pass
+                raise ValueError(f"No writer process applied the write to {self.path} in time")
+            time.sleep(INBOX_POLL_INTERVAL)
+        with open(result_path, "r") as file:
+            result = json.load(file)
+        os.remove(result_path)
+        if "error" in result:
+            raise ValueError(result["error"])
+        self._refresh()
+        return result["value"]
+
+    def _serve_inbox(self) -> None:
+        """Apply the writes forwarded by readers, oldest first (writer only)."""
+        while not self._stopped.wait(INBOX_POLL_INTERVAL):
+            for entry in sorted(os.listdir(self._inbox_path)):
+                if entry.endswith(".request"):
+                    self._apply_forwarded(os.path.join(self._inbox_path, entry))
+
+    def _apply_forwarded(self, request_path: str) -> None:
+        try:
+            with open(request_path, "r") as file:
+                request = json.load(file)
+            # Claimed once removed: a reader giving up can no longer withdraw it
+            os.remove(request_path)
+        except FileNotFoundError:
+            return
+        try:
+            if request["operation"] == "save":
+                chunks = [
+                    DocumentChunk(
+                        chunk_id=record["chunk_id"],
+                        document_id=record["document_id"],
+                        content=record["content"],
+                        chunk_index=record["chunk_index"],
+                        embedding=record["embedding"],
+                        metadata=record["metadata"],
+                        chat_id=record["chat_id"]
+                    )
+                    for record in request["chunks"]
+                ]
+                self.save_chunks(chunks)
+                result = {"value": None}
+            else:
+                result = {"value": self.delete_chunks_by_document_id(request["document_id"])}
+        except Exception as error:
+            result = {"error": str(error)}
+        result_path = request_path[:-len(".request")] + ".result"
+        with open(f"{result_path}.tmp", "w") as file:
+            json.dump(result, file)
+        os.replace(f"{result_path}.tmp", result_path)
+
+    def _bump_generation(self) -> None:
+        """Publish a change to the readers, once the data it covers is on disk."""
+        self._generation[0] += 1
+        self._generation.flush()
+        self._seen_generation = int(self._generation[0])
+
+    def _refresh(self) -> StoreSnapshot:
+        """Current snapshot, after picking up the changes of the writer process if any since the last call."""
+        if self.read_only and int(self._generation[0]) != self._seen_generation:
+            with self._refresh_lock:
+                if int(self._generation[0]) != self._seen_generation:
+                    self._load()
+        return self._snapshot
+
+    def _load(self) -> None:
+        """Read the dimension and the keys added since the last load, then remap the files."""
+        # Read before the files, so everything the counter covers is already there
+        self._seen_generation = int(self._generation[0])
+        if self.dimension is None and os.path.exists(self._meta_path):
+            with open(self._meta_path, "r") as file:
+                self.dimension = json.load(file)["dimension"]
+        with open(self._keys_path, "rb") as file:
+            file.seek(self._keys_offset)
+            for line in file:
+                # A line without its newline is still being written: it is read on the next load
+                if not line.endswith(b"\n"):
+                    break
+                entry = json.loads(line)
+                self._codes[entry["kind"]][entry["id"]] = entry["code"]
+                self._keys_offset += len(line)
+        self._remap()
+
+    def _remap(self, chunk_rows_by_id: Optional[Dict[str, int]] = None) -> None:
+        """Publish a new snapshot mapping the rows currently on disk."""
+        count = os.path.getsize(self._rows_path) // ROW_DTYPE.itemsize
+        if self.dimension:
+            count = min(count, os.path.getsize(self._embeddings_path) // (4 * self.dimension))
+        if count == 0:
+            rows = np.zeros(0, dtype=ROW_DTYPE)
+            vectors = np.zeros((0, self.dimension or 0), dtype=np.float32)
+        else:
+            rows = np.memmap(self._rows_path, dtype=ROW_DTYPE, mode="r" if self.read_only else "r+", shape=(count,))
+            vectors = np.memmap(self._embeddings_path, dtype=np.float32, mode="r", shape=(count, self.dimension))
+        self._snapshot = StoreSnapshot(rows, vectors, chunk_rows_by_id)
+
+    def _rows_of_chat(self, snapshot: StoreSnapshot, chat_id: str) -> np.ndarray:
+        """Live rows of a chat, cached in the snapshot."""
+        if chat_id not in snapshot.chat_rows:
+            code = self._codes["chat"].get(chat_id)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            snapshot.chat_rows[chat_id] = np.flatnonzero((snapshot.rows["chat"] == code) & (snapshot.rows["alive"] == 1))
+        return snapshot.chat_rows[chat_id]
+
+    def _code(self, kind: str, key: str) -> int:
+        codes = self._codes[kind]
+        if key not in codes:
+            codes[key] = len(codes)
+            line = (json.dumps({"kind": kind, "id": key, "code": codes[key]}) + "\n").encode("utf-8")
+            with open(self._keys_path, "ab") as file:
+                file.write(line)
+            self._keys_offset += len(line)
+        return codes[key]
+
+    def _read_record(self, snapshot: StoreSnapshot, row: int) -> dict:
+        # pread leaves the shared file position alone, so concurrent searches cannot move each other's
+        record = os.pread(self._chunks_file.fileno(), int(snapshot.rows["length"][row]), int(snapshot.rows["offset"][row]))
+        return json.loads(record)
+
+    def _load_chunk(self, snapshot: StoreSnapshot, row: int) -> DocumentChunk:
+        record = self._read_record(snapshot, row)
+        return DocumentChunk(
+            chunk_id=record["chunk_id"],
+            document_id=record["document_id"],
+            content=record["content"],
+            chunk_index=record["chunk_index"],
+            embedding=snapshot.vectors[row].tolist(),
+            metadata=record["metadata"],
+            chat_id=record["chat_id"]
+        )
+
+    def _scan_chunk_ids(self, snapshot: StoreSnapshot) -> Dict[str, int]:
+        """Build the chunk id -> row map from the side file (done once, on first lookup).
+
+        Lines are matched to rows through the row offsets, so records that are not (or not yet)
+        referenced by a row are skipped instead of shifting every following row.
+        """
+        rows_by_offset = {offset: row for row, offset in enumerate(snapshot.rows["offset"].tolist())}
+        rows_by_id = {}
+        offset = 0
+        with open(self._chunks_path, "rb") as file:
+            for line in file:
+                row = rows_by_offset.get(offset)
+                if row is not None:
+                    rows_by_id[json.loads(line)["chunk_id"]] = row
+                offset += len(line)
+        return rows_by_id
+
+    @staticmethod
+    def _to_record(chunk: DocumentChunk) -> dict:
+        return {
+            "chunk_id": chunk.chunk_id,
+            "document_id": chunk.document_id,
+            "chat_id": chunk.chat_id,
+            "content": chunk.content,
+            "chunk_index": chunk.chunk_index,
+            "metadata": chunk.metadata,
+        }
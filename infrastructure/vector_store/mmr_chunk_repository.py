@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from infrastructure.vector_store.flat_vector_index import normalize_vectors
+
+
+def maximal_marginal_relevance(
+    query_embedding: np.ndarray,
+    candidate_embeddings: np.ndarray,
+    max_results: int,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """Pick candidate rows by maximal marginal relevance, in selection order.
+
+    Each step picks the row maximizing lambda_mult * sim(query, row) - (1 - lambda_mult) * the
+    highest similarity between the row and the rows already picked. Candidate-to-candidate
+    similarities come from a single Gram matrix product, and the running maximum is updated with
+    one vectorized np.maximum per step. Inputs must be L2-normalized.
+    """
+    count = min(max_results, len(candidate_embeddings))
+    if count <= 0:
+        return []
+    relevance = candidate_embeddings @ query_embedding
+    gram = candidate_embeddings @ candidate_embeddings.T
+    redundancy = np.zeros(len(candidate_embeddings), dtype=np.float32)
+    available = np.ones(len(candidate_embeddings), dtype=bool)
+    selected: List[int] = []
+    for _ in range(count):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        row = int(np.argmax(scores))
+        selected.append(row)
+        available[row] = False
+        np.maximum(redundancy, gram[row], out=redundancy)
+    return selected
+
+
+class MMRChunkRepository(DocumentChunkRepositoryPort):
+    """Chunk repository re-ranking the results of another one by maximal marginal relevance.
+
+    Searches fetch fetch_factor times more candidates than requested, then keep the max_results
+    that best balance relevance to the query against redundancy with the chunks already picked,
+    so overlapping chunks do not fill the context with the same text. Candidates are compared
+    through chunk.embedding, or the vectors the wrapped repository stores for chunks returned
+    without one; nothing is embedded at query time. Candidates whose vector cannot be found are
+    returned in the wrapped repository's order.
+    """
+
+    def __init__(
+        self,
+        repository: DocumentChunkRepositoryPort,
+        lambda_mult: float = 0.5,
+        fetch_factor: int = 4
+    ):
+        if not 0.0 <= lambda_mult <= 1.0:
+            raise ValueError("MMR lambda must be in [0, 1]")
+        if fetch_factor < 1:
+            raise ValueError("MMR fetch factor must be at least 1")
+        self.repository = repository
+        self.lambda_mult = lambda_mult
+        self.fetch_factor = fetch_factor
+
+    def save_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Save chunks in the wrapped repository."""
+        return self.repository.save_chunks(chunks)
+
+    def get_chunks_by_document_id(self, document_id: str) -> List[DocumentChunk]:
+        """Get all chunks for a specific document."""
+        return self.repository.get_chunks_by_document_id(document_id)
+
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat."""
+        return self.repository.get_chunks_by_chat_id(chat_id)
+
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
+        """Get a specific chunk by ID."""
+        return self.repository.get_chunk_by_id(chunk_id)
+
+    def delete_chunks_by_document_id(self, document_id: str) -> bool:
+        """Delete all chunks for a specific document."""
+        return self.repository.delete_chunks_by_document_id(document_id)
+
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID."""
+        return self.repository.get_embeddings(chunk_ids)
+
+    def search_similar_chunks(
+        self,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Search for similar chunks and diversify them."""
+        candidates = self.repository.search_similar_chunks(
+            query_embedding, chat_id, max_results * self.fetch_factor, similarity_threshold, chunk_filter
+        )
+        return self._diversify(query_embedding, candidates, max_results)
+
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Search for several queries at once and diversify each result list."""
+        batch = self.repository.search_similar_chunks_batch(
+            query_embeddings, chat_id, max_results * self.fetch_factor, similarity_threshold, chunk_filter
+        )
+        return [
+            self._diversify(query_embedding, candidates, max_results)
+            for query_embedding, candidates in zip(query_embeddings, batch)
+        ]
+
+    def search_hybrid_chunks(
+        self,
+        query_text: str,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Run the wrapped repository's hybrid search and diversify its results."""
+        candidates = self.repository.search_hybrid_chunks(
+            query_text, query_embedding, chat_id, max_results * self.fetch_factor, similarity_threshold, chunk_filter
+        )
+        return self._diversify(query_embedding, candidates, max_results)
+
+    def _diversify(
+        self,
+        query_embedding: List[float],
+        candidates: List[ScoredChunk],
+        max_results: int
+    ) -> List[ScoredChunk]:
+        if len(candidates) <= max_results:
+            return candidates
+        embeddings = self._candidate_embeddings(candidates)
+        if embeddings is None:
+            return candidates[:max_results]
+        query = normalize_vectors([query_embedding])[0]
+        selected = maximal_marginal_relevance(query, embeddings, max_results, self.lambda_mult)
+        return [
+            ScoredChunk(candidates[row].chunk, candidates[row].similarity, rank, candidates[row].lexical_only)
+            for rank, row in enumerate(selected, start=1)
+        ]
+
+    def _candidate_embeddings(self, candidates: List[ScoredChunk]) -> Optional[np.ndarray]:
+        """Normalized embedding matrix of the candidates, one row per candidate (None if one is missing)."""
+        missing = [candidate.chunk.chunk_id for candidate in candidates if not candidate.chunk.has_embedding()]
+        stored = self.repository.get_embeddings(missing) if missing else {}
+        if len(stored) < len(set(missing)):
+            return None
+        return normalize_vectors([
+            candidate.chunk.embedding if candidate.chunk.has_embedding() else stored[candidate.chunk.chunk_id]
+            for candidate in candidates
+        ])
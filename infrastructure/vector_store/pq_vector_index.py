@@ -0,0 +1,188 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors, top_k
+from infrastructure.vector_store.vector_index import VectorIndex
+
+CENTROIDS_PER_SUBSPACE = 256
+
+
+def kmeans(vectors: np.ndarray, clusters: int, iterations: int = 20, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Euclidean k-means (Lloyd's algorithm); returns the centroids."""
+    rng = rng or np.random.default_rng()
+    clusters = min(clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = nearest_centroids(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        present, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+
+        updated = centroids.copy()
+        updated[present] = sums / counts[:, np.newaxis]
+        empty = np.setdiff1d(np.arange(clusters), present)
+        if len(empty):
+            updated[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+
+        if np.allclose(updated, centroids, atol=1e-6):
+            break
+        centroids = updated
+
+    return centroids
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid (L2) for every vector."""
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, and ||x||^2 does not change the argmin
+    distances = (centroids * centroids).sum(axis=1) - 2.0 * (vectors @ centroids.T)
+    return np.argmin(distances, axis=1)
+
+
+class PQVectorIndex(VectorIndex):
+    """Product-quantization codec: M subspaces with 256 centroids each, one byte per subspace.
+
+    Vectors are buffered in float32 (and searched exactly) until min_training_size rows are stored;
+    the codebooks are then trained, every row is encoded and the float32 buffer is released. A
+    query builds an (M x 256) lookup table of inner products with the codebooks once, and scores
+    each code as the sum of M table entries (asymmetric distance computation).
+    """
+
+    def __init__(
+        self,
+        subspaces: int = 64,
+        min_training_size: int = 10000,
+        initial_capacity: int = 1024,
+        seed: Optional[int] = None
+    ):
+        if subspaces < 1:
+            raise ValueError("PQ subspaces must be at least 1")
+        self.subspaces = subspaces
+        self.min_training_size = max(min_training_size, CENTROIDS_PER_SUBSPACE)
+        self.initial_capacity = initial_capacity
+        self._rng = np.random.default_rng(seed)
+        self._buffer: Optional[FlatVectorIndex] = FlatVectorIndex()
+        self._codebooks: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._size = 0
+        self._dimension = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer) if self._buffer is not None else self._size
+
+    @property
+    def is_trained(self) -> bool:
+        return self._codebooks is not None
+
+    @property
+    def codes(self) -> np.ndarray:
+        """One uint8 centroid id per subspace for every stored vector (empty until trained)."""
+        if self._codes is None:
+            return np.empty((0, self.subspaces), dtype=np.uint8)
+        return self._codes[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by codes and codebooks (or by the float32 buffer before training)."""
+        if self._buffer is not None:
+            return self._buffer.nbytes
+        return self.codes.nbytes + self._codebooks.nbytes
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Encode and append vectors, training the codebooks once enough rows are buffered."""
+        if len(vectors) == 0:
+            return
+        if self._buffer is not None:
+            self._buffer.add(vectors)
+            if len(self._buffer) >= self.min_training_size:
+                self.train()
+            return
+        self._append(self._encode(normalize_vectors(vectors)))
+
+    def train(self) -> None:
+        """Train the codebooks on the buffered vectors and switch to compressed storage."""
+        vectors = self._pad(self._buffer.vectors)
+        # A bounded sample is plenty for 256 centroids and keeps training time flat
+        sample_size = min(len(vectors), 100 * CENTROIDS_PER_SUBSPACE)
+        sample = vectors[self._rng.choice(len(vectors), size=sample_size, replace=False)]
+        sub_vectors = sample.reshape(sample_size, self.subspaces, -1)
+        self._codebooks = np.stack([
+            kmeans(sub_vectors[:, subspace], CENTROIDS_PER_SUBSPACE, rng=self._rng)
+            for subspace in range(self.subspaces)
+        ]).astype(np.float32)
+        self._append(self._encode(self._buffer.vectors))
+        self._buffer = None
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Approximate reconstruction of the given rows (all rows by default; exact before training)."""
+        if self._buffer is not None:
+            return self._buffer.decode(rows)
+        codes = self.codes if rows is None else self.codes[np.asarray(rows, dtype=np.int64)]
+        reconstructed = self._codebooks[np.arange(self.subspaces), codes]
+        return reconstructed.reshape(len(codes), -1)[:, :self._dimension]
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Score every code with a per-query lookup table (approximate inner products)."""
+        if self._buffer is not None:
+            return self._buffer.search(query, max_results, similarity_threshold, mask)
+        if self._size == 0:
+            return []
+        codes = self.codes
+
+        query_vector = self._pad(normalize_vectors(query))[0].reshape(self.subspaces, -1)
+        table = np.einsum("mkd,md->mk", self._codebooks, query_vector)
+
+        # One 1-D gather per subspace is cheaper than a single 2-D fancy-indexing gather
+        scores = np.zeros(self._size, dtype=np.float32)
+        for subspace in range(self.subspaces):
+            scores += np.take(table[subspace], codes[:, subspace])
+
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+        rows = rows[scores[rows] >= similarity_threshold]
+        best = rows[top_k(scores[rows], max_results)]
+        return [(int(row), float(scores[row])) for row in best]
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False."""
+        if self._buffer is not None:
+            self._buffer.keep(mask)
+        else:
+            kept = self.codes[mask]
+            self._codes[:len(kept)] = kept
+            self._size = len(kept)
+
+    def _encode(self, normalized: np.ndarray) -> np.ndarray:
+        sub_vectors = self._pad(normalized).reshape(len(normalized), self.subspaces, -1)
+        codes = np.empty((len(normalized), self.subspaces), dtype=np.uint8)
+        for subspace in range(self.subspaces):
+            codes[:, subspace] = nearest_centroids(sub_vectors[:, subspace], self._codebooks[subspace])
+        return codes
+
+    def _append(self, codes: np.ndarray) -> None:
+        self._reserve(self._size + len(codes))
+        self._codes[self._size:self._size + len(codes)] = codes
+        self._size += len(codes)
+
+    def _reserve(self, size: int) -> None:
+        """Grow the code matrix geometrically so appends stay amortized O(1)."""
+        if self._codes is None:
+            self._codes = np.zeros((max(self.initial_capacity, size), self.subspaces), dtype=np.uint8)
+        elif size > len(self._codes):
+            grown = np.zeros((max(size, 2 * len(self._codes)), self.subspaces), dtype=np.uint8)
+            grown[:self._size] = self.codes
+            self._codes = grown
+
+    def _pad(self, vectors: np.ndarray) -> np.ndarray:
+        """Zero-pad the dimension to a multiple of the number of subspaces."""
+        self._dimension = self._dimension or vectors.shape[1]
+        if vectors.shape[1] != self._dimension:
+            raise ValueError(f"Embedding dimension mismatch: index has {self._dimension}, got {vectors.shape[1]}")
+        padding = -self._dimension % self.subspaces
+        if padding == 0:
+            return vectors
+        return np.pad(vectors, ((0, 0), (0, padding)))
@@ -0,0 +1,157 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors, top_k
+from infrastructure.vector_store.vector_index import VectorIndex
+
+INT8_LEVELS = 127
+
+
+class QuantizedVectorIndex(VectorIndex):
+    """Scalar-quantized (int8 or float16) vectors searched directly in compressed form.
+
+    int8 codes use one scale per dimension, widened (and existing codes re-quantized) when a
+    new vector does not fit. With rescore_candidates > 0 a float32 copy is also kept and the best
+    candidates of the compressed scan are rescored exactly, trading RAM for exact scores.
+
+    Memory per 1024-d vector: 1 KB (int8) or 2 KB (float16), plus 4 KB when rescoring, against
+    roughly 32 KB for a Python list of floats. Scores are computed over cache-sized row batches;
+    float16 is the more accurate mode but its conversion is slower than int8 on most CPUs.
+    """
+
+    def __init__(
+        self,
+        dtype: str = "int8",
+        rescore_candidates: int = 0,
+        initial_capacity: int = 1024,
+        batch_size: int = 2048
+    ):
+        if dtype not in ("int8", "float16"):
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        self.dtype = np.dtype(dtype)
+        self.rescore_candidates = rescore_candidates
+        self.initial_capacity = initial_capacity
+        self.batch_size = batch_size
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._size = 0
+        self._originals = FlatVectorIndex(initial_capacity) if rescore_candidates > 0 else None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def codes(self) -> np.ndarray:
+        """View of the stored quantized vectors."""
+        if self._codes is None:
+            return np.empty((0, 0), dtype=self.dtype)
+        return self._codes[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored vectors (codes, scales and the optional float32 copy)."""
+        total = self.codes.nbytes
+        if self._scales is not None:
+            total += self._scales.nbytes
+        if self._originals is not None:
+            total += self._originals.nbytes
+        return total
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Quantize and append vectors."""
+        if len(vectors) == 0:
+            return
+        normalized = normalize_vectors(vectors)
+        self._reserve(self._size + len(normalized), normalized.shape[1])
+        if self._originals is not None:
+            self._originals.add(normalized)
+        self._codes[self._size:self._size + len(normalized)] = self._encode(normalized)
+        self._size += len(normalized)
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Approximate float32 reconstruction of the given rows (all rows by default)."""
+        codes = self.codes if rows is None else self.codes[np.asarray(rows, dtype=np.int64)]
+        if self.dtype == np.int8:
+            return codes.astype(np.float32) * self._scales
+        return codes.astype(np.float32)
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Scan the compressed matrix, then optionally rescore the best candidates in float32."""
+        if self._size == 0:
+            return []
+
+        query_vector = normalize_vectors(query)[0]
+        scores = self._approximate_scores(query_vector)
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(self._size)
+
+        if self._originals is None:
+            rows = rows[scores[rows] >= similarity_threshold]
+            best = rows[top_k(scores[rows], max_results)]
+            return [(int(row), float(scores[row])) for row in best]
+
+        # The threshold is applied to exact scores only, so borderline rows are not lost
+        candidates = rows[top_k(scores[rows], max(self.rescore_candidates, max_results))]
+        exact = self._originals.vectors[candidates] @ query_vector
+        kept = np.flatnonzero(exact >= similarity_threshold)
+        best = kept[top_k(exact[kept], max_results)]
+        return [(int(candidates[position]), float(exact[position])) for position in best]
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False."""
+        if self._codes is None:
+            return
+        kept = self.codes[mask]
+        self._codes[:len(kept)] = kept
+        self._size = len(kept)
+        if self._originals is not None:
+            self._originals.keep(mask)
+
+    def _approximate_scores(self, query_vector: np.ndarray) -> np.ndarray:
+        # Fold the per-dimension scales into the query instead of dequantizing the matrix
+        weights = query_vector * self._scales if self.dtype == np.int8 else query_vector
+        scores = np.empty(self._size, dtype=np.float32)
+        codes = self.codes
+        for start in range(0, self._size, self.batch_size):
+            scores[start:start + self.batch_size] = codes[start:start + self.batch_size].astype(np.float32) @ weights
+        return scores
+
+    def _encode(self, normalized: np.ndarray) -> np.ndarray:
+        if self.dtype == np.float16:
+            return normalized.astype(np.float16)
+
+        peak = np.abs(normalized).max(axis=0)
+        if self._scales is None:
+            # Unit vectors have components around 1/sqrt(d); leave headroom so scales rarely move
+            floor = 4.0 / math.sqrt(normalized.shape[1])
+            self._scales = (np.maximum(peak, floor) / INT8_LEVELS).astype(np.float32)
+        elif np.any(peak > self._scales * INT8_LEVELS):
+            self._rescale(np.maximum(self._scales, 1.25 * peak / INT8_LEVELS).astype(np.float32))
+        return np.clip(np.rint(normalized / self._scales), -INT8_LEVELS, INT8_LEVELS).astype(np.int8)
+
+    def _rescale(self, scales: np.ndarray) -> None:
+        """Re-quantize the stored codes to wider per-dimension scales."""
+        factor = self._scales / scales
+        codes = self.codes
+        for start in range(0, self._size, self.batch_size):
+            block = codes[start:start + self.batch_size].astype(np.float32) * factor
+            codes[start:start + self.batch_size] = np.rint(block).astype(np.int8)
+        self._scales = scales
+
+    def _reserve(self, size: int, dimension: int) -> None:
+        if self._codes is None:
+            self._codes = np.zeros((max(self.initial_capacity, size), dimension), dtype=self.dtype)
+            return
+        if self._codes.shape[1] != dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: index has {self._codes.shape[1]}, got {dimension}"
+            )
+        if size > len(self._codes):
+            grown = np.zeros((max(size, 2 * len(self._codes)), dimension), dtype=self.dtype)
+            grown[:self._size] = self.codes
+            self._codes = grown
@@ -0,0 +1,145 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from infrastructure.vector_store.metadata_bitmaps import MetadataBitmaps
+from infrastructure.vector_store.vector_index import VectorIndex
+
+
+class Segment:
+    """Append-only run of chunks with its own vector index and a tombstone bitmap.
+
+    Rows are only appended until the segment is sealed. Chunks are stored without their
+    embedding: the vectors live in the index only (see decode). Deletes set tombstones, which searches
+    pass to the index as a mask, combined with the metadata bitmaps when a filter is given;
+    tombstoned rows are physically dropped by compact().
+    """
+
+    def __init__(self, index: VectorIndex):
+        self.index = index
+        self.sealed = False
+        self._chunks: List[DocumentChunk] = []
+        self._tombstones = np.zeros(0, dtype=bool)
+        self._deleted = 0
+        self._rows_by_document: Dict[str, List[int]] = {}
+        self._rows_by_chunk: Dict[str, int] = {}
+        self._metadata = MetadataBitmaps()
+
+    def __len__(self) -> int:
+        return len(self._chunks) - self._deleted
+
+    @property
+    def size(self) -> int:
+        """Stored rows, tombstoned ones included."""
+        return len(self._chunks)
+
+    @property
+    def deleted(self) -> int:
+        """Tombstoned rows still held by the segment."""
+        return self._deleted
+
+    @property
+    def chunks(self) -> List[DocumentChunk]:
+        """Live chunks, in insertion order."""
+        if not self._deleted:
+            return list(self._chunks)
+        return [chunk for chunk, dead in zip(self._chunks, self._tombstones) if not dead]
+
+    def chunks_of_document(self, document_id: str) -> List[DocumentChunk]:
+        """Live chunks of one document, looked up through the document -> rows index."""
+        return [self._chunks[row] for row in self._rows_by_document.get(document_id, ())]
+
+    def add(self, chunks: List[DocumentChunk], embeddings: Sequence[Sequence[float]]) -> None:
+        """Append chunks and their embeddings; row i of the index holds the i-th stored chunk."""
+        if self.sealed:
+            raise ValueError("Cannot append to a sealed segment")
+        self.index.add(embeddings)
+        # A float list per chunk would outweigh the index itself, quantized codes all the more
+        chunks = [chunk.without_embedding() if chunk.embedding is not None else chunk for chunk in chunks]
+        for row, chunk in enumerate(chunks, start=len(self._chunks)):
+            self._rows_by_document.setdefault(chunk.document_id, []).append(row)
+            self._rows_by_chunk[chunk.chunk_id] = row
+        self._chunks.extend(chunks)
+        self._metadata.add([chunk.metadata for chunk in chunks])
+        self._tombstones = np.concatenate([self._tombstones, np.zeros(len(chunks), dtype=bool)])
+
+    def embeddings(self, chunk_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Vectors of the live chunks among chunk_ids, decoded from the index."""
+        rows = {}
+        for chunk_id in chunk_ids:
+            row = self._rows_by_chunk.get(chunk_id)
+            if row is not None and not self._tombstones[row]:
+                rows[chunk_id] = row
+        if not rows:
+            return {}
+        return dict(zip(rows, self.index.decode(list(rows.values()))))
+
+    def delete_document(self, document_id: str) -> int:
+        """Tombstone every row of a document; returns the number of rows deleted."""
+        rows = self._rows_by_document.pop(document_id, [])
+        self._tombstones[rows] = True
+        self._deleted += len(rows)
+        return len(rows)
+
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        max_results: int,
+        similarity_threshold: float,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[Tuple[DocumentChunk, float]]:
+        """Return (chunk, similarity) pairs for live rows meeting the filter, most similar first."""
+        mask = self._mask(chunk_filter)
+        if mask is not None and not mask.any():
+            return []
+        hits = self.index.search(query_embedding, max_results, similarity_threshold, mask)
+        return [(self._chunks[row], score) for row, score in hits]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        max_results: int,
+        similarity_threshold: float,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[Tuple[DocumentChunk, float]]]:
+        """Search for several queries at once, one list of (chunk, similarity) pairs per query."""
+        mask = self._mask(chunk_filter)
+        if mask is not None and not mask.any():
+            return [[] for _ in query_embeddings]
+        batch = self.index.search_batch(query_embeddings, max_results, similarity_threshold, mask)
+        return [[(self._chunks[row], score) for row, score in hits] for hits in batch]
+
+    def compact(self) -> None:
+        """Physically drop tombstoned rows from the index and the chunk list."""
+        if not self._deleted:
+            return
+        self.index.keep(~self._tombstones)
+        self._metadata.keep(~self._tombstones)
+        self._chunks = self.chunks
+        self._tombstones = np.zeros(len(self._chunks), dtype=bool)
+        self._deleted = 0
+        self._rows_by_document = {}
+        self._rows_by_chunk = {}
+        for row, chunk in enumerate(self._chunks):
+            self._rows_by_document.setdefault(chunk.document_id, []).append(row)
+            self._rows_by_chunk[chunk.chunk_id] = row
+
+    def _mask(self, chunk_filter: Optional[ChunkFilter]) -> Optional[np.ndarray]:
+        """Rows a search may return: live rows meeting the filter (None when all rows qualify)."""
+        conditions = [~self._tombstones] if self._deleted else []
+        if chunk_filter is not None:
+            if chunk_filter.document_ids is not None:
+                in_documents = np.zeros(self.size, dtype=bool)
+                for document_id in chunk_filter.document_ids:
+                    in_documents[self._rows_by_document.get(document_id, [])] = True
+                conditions.append(in_documents)
+            metadata_mask = self._metadata.mask(chunk_filter)
+            if metadata_mask is not None:
+                conditions.append(metadata_mask)
+
+        if not conditions:
+            return None
+        mask = conditions[0].copy()
+        for condition in conditions[1:]:
+            mask &= condition
+        return mask
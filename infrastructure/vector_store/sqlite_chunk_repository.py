@@ -0,0 +1,189 @@
+import json
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from domain.port.embedding_service_port import EmbeddingServicePort
+from domain.service.chunk_embedder import chunk_embeddings
+from infrastructure.sqlite.connection import open_connection
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors
+from infrastructure.vector_store.segment import Segment
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    chat_id TEXT,
+    chunk_index INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    embedding BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_chat_id ON chunks (chat_id);
+CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks (document_id);
+"""
+
+COLUMNS = "chunk_id, document_id, chat_id, chunk_index, content, metadata"
+
+# Chunk IDs looked up per statement, below the host parameter limit of older SQLite builds
+LOOKUP_BATCH_SIZE = 500
+
+
+class SQLiteChunkRepository(DocumentChunkRepositoryPort):
+    """Chunk repository stored in a SQLite database (WAL mode).
+
+    Embeddings are stored normalized, as float32 BLOBs. The first search in a chat loads all its
+    vectors into a cached segment (flat matrix plus metadata bitmaps); the cache of a chat is
+    dropped whenever one of its chunks is written or deleted.
+    """
+
+    def __init__(self, embedding_service: EmbeddingServicePort, path: str):
+        self.embedding_service = embedding_service
+        self.path = path
+        self._connection = open_connection(path)
+        self._lock = threading.Lock()
+        self._chat_cache: Dict[str, Segment] = {}
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def save_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
+        """Embed the chunks without an embedding and insert them in a single bulk statement."""
+        if not chunks:
+            return []
+
+        vectors = normalize_vectors(chunk_embeddings(chunks, self.embedding_service))
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO chunks ({COLUMNS}, embedding) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        chunk.chunk_id,
+                        chunk.document_id,
+                        chunk.chat_id,
+                        chunk.chunk_index,
+                        chunk.content,
+                        json.dumps(chunk.metadata),
+                        vector.tobytes()
+                    )
+                    for chunk, vector in zip(chunks, vectors)
+                ]
+            )
+            for chat_id in {chunk.chat_id for chunk in chunks}:
+                self._chat_cache.pop(chat_id, None)
+        return chunks
+
+    def get_chunks_by_document_id(self, document_id: str) -> List[DocumentChunk]:
+        """Get all chunks for a specific document."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {COLUMNS}, embedding FROM chunks WHERE document_id = ? ORDER BY rowid", (document_id,)
+            ).fetchall()
+        return [self._to_chunk(row) for row in rows]
+
+    def get_chunks_by_chat_id(self, chat_id: str) -> List[DocumentChunk]:
+        """Get all chunks of a chat."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {COLUMNS}, embedding FROM chunks WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+            ).fetchall()
+        return [self._to_chunk(row) for row in rows]
+
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[DocumentChunk]:
+        """Get a specific chunk by ID."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {COLUMNS}, embedding FROM chunks WHERE chunk_id = ?", (chunk_id,)
+            ).fetchone()
+        return self._to_chunk(row) if row else None
+
+    def get_embeddings(self, chunk_ids: List[str]) -> Dict[str, List[float]]:
+        """Get the stored embeddings of chunks by ID."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(chunk_ids), LOOKUP_BATCH_SIZE):
+                batch = chunk_ids[start:start + LOOKUP_BATCH_SIZE]
+                rows = self._connection.execute(
+                    f"SELECT chunk_id, embedding FROM chunks WHERE chunk_id IN ({', '.join('?' * len(batch))})", batch
+                )
+                for chunk_id, embedding in rows:
+                    found[chunk_id] = np.frombuffer(embedding, dtype=np.float32).tolist()
+        return found
+
+    def delete_chunks_by_document_id(self, document_id: str) -> bool:
+        """Delete all chunks for a specific document."""
+        with self._lock, self._connection:
+            chat_ids = [
+                chat_id for (chat_id,) in self._connection.execute(
+                    "SELECT DISTINCT chat_id FROM chunks WHERE document_id = ?", (document_id,)
+                )
+            ]
+            cursor = self._connection.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+            for chat_id in chat_ids:
+                self._chat_cache.pop(chat_id, None)
+        return cursor.rowcount > 0
+
+    def search_similar_chunks(
+        self,
+        query_embedding: List[float],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[ScoredChunk]:
+        """Exact cosine search over the cached vector matrix of one chat."""
+        hits = self._chat_segment(chat_id).search(query_embedding, max_results, similarity_threshold, chunk_filter)
+        return [ScoredChunk(chunk, score, rank) for rank, (chunk, score) in enumerate(hits, start=1)]
+
+    def search_similar_chunks_batch(
+        self,
+        query_embeddings: List[List[float]],
+        chat_id: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7,
+        chunk_filter: Optional[ChunkFilter] = None
+    ) -> List[List[ScoredChunk]]:
+        """Search for several queries at once against the cached vector matrix of one chat."""
+        batch = self._chat_segment(chat_id).search_batch(
+            query_embeddings, max_results, similarity_threshold, chunk_filter
+        )
+        return [
+            [ScoredChunk(chunk, score, rank) for rank, (chunk, score) in enumerate(hits, start=1)]
+            for hits in batch
+        ]
+
+    def _chat_segment(self, chat_id: str) -> Segment:
+        """Vectors, chunks and metadata bitmaps of a chat, loaded once and cached until the next write."""
+        with self._lock:
+            segment = self._chat_cache.get(chat_id)
+            if segment is None:
+                rows = self._connection.execute(
+                    f"SELECT {COLUMNS}, embedding FROM chunks WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+                ).fetchall()
+                segment = Segment(FlatVectorIndex(initial_capacity=max(len(rows), 1)))
+                if rows:
+                    vectors = np.frombuffer(b"".join(row[-1] for row in rows), dtype=np.float32)
+                    # Chunks held by the cache do not carry their embedding: the matrix has it
+                    chunks = [self._to_chunk(row[:-1] + (None,)) for row in rows]
+                    segment.add(chunks, vectors.reshape(len(rows), -1))
+                self._chat_cache[chat_id] = segment
+        return segment
+
+    @staticmethod
+    def _to_chunk(row: tuple) -> DocumentChunk:
+        chunk_id, document_id, chat_id, chunk_index, content, metadata, embedding = row
+        return DocumentChunk(
+            chunk_id=chunk_id,
+            document_id=document_id,
+            content=content,
+            chunk_index=chunk_index,
+            embedding=np.frombuffer(embedding, dtype=np.float32).tolist() if embedding is not None else None,
+            metadata=json.loads(metadata),
+            chat_id=chat_id
+        )
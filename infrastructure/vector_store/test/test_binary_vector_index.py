@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from infrastructure.vector_store.binary_vector_index import (
+    BinaryVectorIndex,
+    POPCOUNT_TABLE,
+    hamming_distances,
+    pack_signs
+)
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+
+
+class TestBinaryVectorIndex(unittest.TestCase):
+    """Unit tests for BinaryVectorIndex."""
+
+    def test_pack_signs_and_hamming_distance(self):
+        """Test that sign bits are packed and compared bit by bit."""
+        codes = pack_signs(np.array([[1.0, -1.0, 1.0, 1.0, -1.0, -1.0, -1.0, -1.0, 1.0],
+                                     [-1.0, -1.0, 1.0, 1.0, -1.0, -1.0, -1.0, -1.0, -1.0]]))
+
+        self.assertEqual(codes.shape, (2, 2))
+        self.assertEqual(list(hamming_distances(codes, codes[0])), [0, 2])
+
+    def test_popcount_table(self):
+        """Test the fallback popcount lookup table."""
+        self.assertEqual(POPCOUNT_TABLE[0], 0)
+        self.assertEqual(POPCOUNT_TABLE[0b10110001], 4)
+        self.assertEqual(POPCOUNT_TABLE[255], 8)
+
+    def test_rescored_results_match_exact_search(self):
+        """Test that rescoring a large enough shortlist recovers the exact top-k."""
+        rng = np.random.default_rng(11)
+        vectors = rng.normal(size=(2000, 128))
+        exact = FlatVectorIndex()
+        exact.add(vectors)
+        index = BinaryVectorIndex(rescore_candidates=300)
+        index.add(vectors)
+
+        recalls = []
+        for query in vectors[:10] + 0.5 * rng.normal(size=(10, 128)):
+            expected = [row for row, _ in exact.search(query, 5)]
+            found = [row for row, _ in index.search(query, 5)]
+            recalls.append(len(set(expected) & set(found)) / 5)
+
+        self.assertEqual(index.codes.shape, (2000, 16))
+        self.assertGreaterEqual(np.mean(recalls), 0.9)
+
+    def test_threshold_mask_and_keep(self):
+        """Test that scores are exact cosines and that masked or dropped rows are excluded."""
+        index = BinaryVectorIndex(rescore_candidates=10)
+        index.add([[1.0, 0.0], [0.6, 0.8], [-1.0, 0.0]])
+
+        hits = index.search([1.0, 0.0], 3, similarity_threshold=0.5)
+        self.assertEqual([row for row, _ in hits], [0, 1])
+        self.assertAlmostEqual(hits[1][1], 0.6, places=5)
+
+        hits = index.search([1.0, 0.0], 3, mask=np.array([False, True, True]))
+        self.assertEqual([row for row, _ in hits], [1, 2])
+
+        index.keep(np.array([False, True, True]))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search([1.0, 0.0], 1)[0][0], 0)
@@ -0,0 +1,52 @@
+import unittest
+
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from infrastructure.vector_store.bm25_index import BM25Index, tokenize
+
+
+class TestBM25Index(unittest.TestCase):
+    """Unit tests for BM25Index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.index = BM25Index()
+        self.index.add([
+            DocumentChunk("chunk-1", "doc-1", "Request the APL benefit with form 730", 0, metadata={"lang": "en"}),
+            DocumentChunk("chunk-2", "doc-1", "The benefit is paid monthly", 1, metadata={"lang": "en"}),
+            DocumentChunk("chunk-3", "doc-2", "Form F24 for the APL payment, APL office", 0, metadata={"lang": "it"})
+        ])
+
+    def _ids(self, hits):
+        return [chunk.chunk_id for chunk, _ in hits]
+
+    def test_tokenize(self):
+        """Test that tokens are lowercased words, numbers and codes."""
+        self.assertEqual(tokenize("Form F24, code APL-730!"), ["form", "f24", "code", "apl", "730"])
+
+    def test_search_ranks_exact_terms(self):
+        """Test that only chunks holding a query term are returned, rarer and repeated terms first."""
+        self.assertEqual(self._ids(self.index.search("apl", 5)), ["chunk-3", "chunk-1"])
+        self.assertEqual(self._ids(self.index.search("730 benefit", 5)), ["chunk-1", "chunk-2"])
+        self.assertEqual(self._ids(self.index.search("F24", 1)), ["chunk-3"])
+        self.assertEqual(self.index.search("unknown words", 5), [])
+
+    def test_search_applies_chunk_filter(self):
+        """Test that the lexical leg honours the same filters as the vector search."""
+        hits = self.index.search("apl", 5, ChunkFilter(metadata={"lang": "en"}))
+        self.assertEqual(self._ids(hits), ["chunk-1"])
+        self.assertEqual(self._ids(self.index.search("apl", 5, ChunkFilter(document_ids=["doc-2"]))), ["chunk-3"])
+
+    def test_updates_are_incremental(self):
+        """Test that removed documents and replaced chunks leave no stale postings."""
+        self.assertEqual(self.index.remove_document("doc-2"), 1)
+        self.assertEqual(self.index.remove_document("doc-2"), 0)
+        self.assertEqual(self._ids(self.index.search("apl f24", 5)), ["chunk-1"])
+
+        self.index.add([DocumentChunk("chunk-1", "doc-1", "Nothing relevant", 0)])
+        self.assertEqual(self.index.search("apl", 5), [])
+        self.assertEqual(len(self.index), 2)
+
+        self.index.remove_document("doc-1")
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.search("benefit", 5), [])
@@ -0,0 +1,72 @@
+import unittest
+
+from domain.model.document_chunk import DocumentChunk
+from infrastructure.vector_store.chat_partition import ChatPartition
+
+
+class TestChatPartition(unittest.TestCase):
+    """Unit tests for ChatPartition and its segments."""
+
+    def _chunks(self, document_id, count, start=0):
+        return [
+            DocumentChunk(f"{document_id}-{i}", document_id, f"text {i}", i, chat_id="chat-1")
+            for i in range(start, start + count)
+        ]
+
+    def test_segments_are_sealed_when_full(self):
+        """Test that appends spill into a new segment once the active one is full."""
+        partition = ChatPartition("chat-1", segment_size=3)
+
+        partition.add(self._chunks("doc-1", 4), [[1.0, 0.0]] * 4)
+        partition.add(self._chunks("doc-2", 3), [[0.0, 1.0]] * 3)
+
+        self.assertEqual([segment.size for segment in partition.segments], [3, 3, 1])
+        self.assertEqual([segment.sealed for segment in partition.segments], [True, True, False])
+        self.assertEqual(len(partition), 7)
+
+    def test_search_merges_segments_and_skips_tombstones(self):
+        """Test that hits from every segment are ranked together and deleted rows are skipped."""
+        partition = ChatPartition("chat-1", segment_size=2, compaction_deleted_ratio=1.0)
+        partition.add(self._chunks("doc-1", 2), [[0.0, 1.0], [0.6, 0.8]])
+        partition.add(self._chunks("doc-2", 2), [[1.0, 0.0], [0.8, 0.6]])
+
+        hits = partition.search([1.0, 0.0], 3, 0.0)
+        self.assertEqual([chunk.chunk_id for chunk, _ in hits], ["doc-2-0", "doc-2-1", "doc-1-1"])
+
+        partition.add(self._chunks("doc-3", 1), [[0.9, 0.1]])
+        self.assertTrue(partition.remove_document("doc-2"))
+        self.assertFalse(partition.remove_document("doc-2"))
+
+        hits = partition.search([1.0, 0.0], 3, 0.0)
+        self.assertEqual([chunk.chunk_id for chunk, _ in hits], ["doc-3-0", "doc-1-1", "doc-1-0"])
+        self.assertEqual(len(partition.segments), 2)
+
+    def test_background_compaction_past_threshold(self):
+        """Test that segments are rewritten without their tombstones once the threshold is passed."""
+        partition = ChatPartition("chat-1", segment_size=4, compaction_deleted_ratio=0.3)
+        partition.add(self._chunks("doc-1", 1) + self._chunks("doc-2", 3, start=1), [[1.0, 0.0]] * 4)
+        partition.add(self._chunks("doc-3", 4), [[0.0, 1.0]] * 4)
+
+        partition.remove_document("doc-1")
+        partition.wait_for_compaction()
+        self.assertEqual(partition.segments[0].deleted, 1)
+
+        partition.remove_document("doc-2")
+        partition.wait_for_compaction()
+        self.assertEqual([segment.size for segment in partition.segments], [4])
+
+        partition.remove_document("doc-3")
+        self.assertEqual(partition.segments, [])
+
+    def test_compaction_rewrites_partially_deleted_segment(self):
+        """Test that compaction drops tombstoned rows and keeps search results intact."""
+        partition = ChatPartition("chat-1", segment_size=10, compaction_deleted_ratio=0.2, background_compaction=False)
+        partition.add(self._chunks("doc-1", 3) + self._chunks("doc-2", 2), [[1.0, 0.0]] * 3 + [[0.6, 0.8], [0.0, 1.0]])
+
+        partition.remove_document("doc-1")
+
+        segment = partition.segments[0]
+        self.assertEqual((segment.size, segment.deleted, len(segment.index)), (2, 0, 2))
+        hits = partition.search([1.0, 0.0], 5, 0.0)
+        self.assertEqual([chunk.chunk_id for chunk, _ in hits], ["doc-2-0", "doc-2-1"])
+        self.assertEqual([chunk.chunk_id for chunk in partition.chunks], ["doc-2-0", "doc-2-1"])
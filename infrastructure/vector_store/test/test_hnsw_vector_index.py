@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.hnsw_chunk_repository import HNSWChunkRepository
+from infrastructure.vector_store.hnsw_vector_index import HNSWVectorIndex
+
+
+class TestHNSWVectorIndex(unittest.TestCase):
+    """Unit tests for HNSWVectorIndex."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(42)
+        self.vectors = rng.normal(size=(400, 24))
+        self.queries = rng.normal(size=(20, 24))
+        self.exact = FlatVectorIndex()
+        self.exact.add(self.vectors)
+
+    def test_recall_against_exact_search(self):
+        """Test that the graph finds most of the exact top-k neighbours."""
+        index = HNSWVectorIndex(m=8, ef_construction=64, ef_search=64, seed=0)
+        index.add(self.vectors)
+
+        recalls = []
+        for query in self.queries:
+            expected = {row for row, _ in self.exact.search(query, 10)}
+            found = {row for row, _ in index.search(query, 10)}
+            recalls.append(len(expected & found) / 10)
+
+        self.assertEqual(len(index), 400)
+        self.assertGreaterEqual(np.mean(recalls), 0.9)
+
+    def test_search_skips_masked_rows(self):
+        """Test that masked (soft-deleted) rows are traversed but never returned."""
+        index = HNSWVectorIndex(m=8, ef_construction=32, ef_search=32, seed=0)
+        index.add(self.vectors)
+        mask = np.ones(len(self.vectors), dtype=bool)
+        mask[::2] = False
+
+        hits = index.search(self.queries[0], 10, mask=mask)
+
+        self.assertEqual(len(hits), 10)
+        self.assertTrue(all(row % 2 == 1 for row, _ in hits))
+
+    def test_keep_rebuilds_graph(self):
+        """Test that keep renumbers the surviving rows."""
+        index = HNSWVectorIndex(m=4, ef_construction=16, seed=0)
+        index.add([[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]])
+
+        index.keep(np.array([False, True, True]))
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search([0.0, 1.0], 1)[0][0], 0)
+
+    def test_invalid_m_raises(self):
+        """Test that a degenerate graph degree is rejected."""
+        with self.assertRaises(ValueError):
+            HNSWVectorIndex(m=1)
+
+
+class TestHNSWChunkRepository(unittest.TestCase):
+    """Unit tests for HNSWChunkRepository."""
+
+    def test_soft_deleted_document_is_not_returned(self):
+        """Test that chunks of a deleted document disappear from search results."""
+        embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        repository = HNSWChunkRepository(embedding_service=embedding_service_mock, m=4, ef_construction=16)
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-2", "B", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "C", 1, chat_id="chat-1")
+        ]
+        embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]]
+        repository.save_chunks(chunks)
+
+        self.assertTrue(repository.delete_chunks_by_document_id("doc-1"))
+
+        results = repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.0)
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-2", "chunk-3"])
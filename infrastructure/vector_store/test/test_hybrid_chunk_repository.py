@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.hybrid_chunk_repository import HybridChunkRepository, reciprocal_rank_fusion
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+from infrastructure.vector_store.sqlite_chunk_repository import SQLiteChunkRepository
+
+
+class TestHybridChunkRepository(unittest.TestCase):
+    """Unit tests for HybridChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.repository = HybridChunkRepository(InMemoryChunkRepository(self.embedding_service_mock), candidates=5)
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0], [0.8, 0.6], [0.0, 1.0]]
+        self.repository.save_chunks([
+            DocumentChunk("chunk-1", "doc-1", "How to apply for a housing benefit", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "Eligibility rules for the benefit", 1, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "Form APL-730 must be signed", 0, chat_id="chat-1")
+        ])
+
+    def _ids(self, hits):
+        return [hit.chunk.chunk_id for hit in hits]
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that IDs ranked well by several lists come first."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b"]], k=1)
+        self.assertEqual([item_id for item_id, _ in fused], ["c", "b", "a"])
+        self.assertAlmostEqual(fused[0][1], 1 / 4 + 1 / 2)
+
+    def test_hybrid_search_finds_exact_terms_missed_by_vectors(self):
+        """Test that a chunk below the similarity threshold is returned when it holds a query term."""
+        vector_hits = self.repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.5)
+        self.assertEqual(self._ids(vector_hits), ["chunk-1", "chunk-2"])
+
+        hits = self.repository.search_hybrid_chunks("APL-730 benefit", [1.0, 0.0], "chat-1", similarity_threshold=0.5)
+
+        self.assertEqual(self._ids(hits), ["chunk-1", "chunk-2", "chunk-3"])
+        self.assertEqual([hit.rank for hit in hits], [1, 2, 3])
+        self.assertAlmostEqual(hits[1].similarity, 0.8, places=5)
+        self.assertEqual(hits[2].similarity, 0.0)
+        self.assertEqual([hit.lexical_only for hit in hits], [False, False, True])
+        self.assertEqual(self._ids(self.repository.search_hybrid_chunks("apl", [1.0, 0.0], "chat-1", max_results=1)), ["chunk-1"])
+
+    def test_delete_updates_both_legs(self):
+        """Test that deleted chunks are neither found by terms nor by vectors."""
+        self.assertTrue(self.repository.delete_chunks_by_document_id("doc-2"))
+
+        hits = self.repository.search_hybrid_chunks("APL", [0.0, 1.0], "chat-1", similarity_threshold=0.9)
+        self.assertEqual(hits, [])
+        self.assertEqual(self.repository.get_chunk_by_id("chunk-3"), None)
+        self.assertEqual(self.repository.search_hybrid_chunks("APL", [0.0, 1.0], "unknown-chat"), [])
+
+    def test_lexical_index_is_rebuilt_from_the_vector_repository(self):
+        """Test that a new instance over a persistent repository rebuilds the BM25 index on first use."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/chunks.sqlite3"
+            first = HybridChunkRepository(SQLiteChunkRepository(self.embedding_service_mock, path))
+            first.save_chunks([
+                DocumentChunk("chunk-1", "doc-1", "How to apply for a housing benefit", 0, chat_id="chat-1"),
+                DocumentChunk("chunk-2", "doc-1", "Eligibility rules for the benefit", 1, chat_id="chat-1"),
+                DocumentChunk("chunk-3", "doc-2", "Form APL-730 must be signed", 0, chat_id="chat-1")
+            ])
+            first.vector_repository.close()
+
+            restarted = HybridChunkRepository(SQLiteChunkRepository(self.embedding_service_mock, path))
+            self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.6, 0.8]]
+            restarted.save_chunks([DocumentChunk("chunk-4", "doc-3", "Appeal APL-730 decisions", 0, chat_id="chat-1")])
+            try:
+                hits = restarted.search_hybrid_chunks("APL-730", [1.0, 0.0], "chat-1", similarity_threshold=0.9)
+                self.assertEqual(self._ids(hits), ["chunk-1", "chunk-4", "chunk-3"])
+                self.assertEqual([hit.lexical_only for hit in hits], [False, True, True])
+
+                restarted.delete_chunks_by_document_id("doc-2")
+                hits = restarted.search_hybrid_chunks("APL-730", [1.0, 0.0], "chat-1", similarity_threshold=0.9)
+                self.assertEqual(self._ids(hits), ["chunk-1", "chunk-4"])
+            finally:
+                restarted.vector_repository.close()
@@ -0,0 +1,267 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+
+
+class TestInMemoryChunkRepository(unittest.TestCase):
+    """Unit tests for InMemoryChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.repository = InMemoryChunkRepository(embedding_service=self.embedding_service_mock)
+
+    def _save(self, chunks, embeddings):
+        self.embedding_service_mock.generate_embeddings_batch.return_value = embeddings
+        return self.repository.save_chunks(chunks)
+
+    def test_save_chunks_generates_embeddings(self):
+        """Test that saving chunks embeds their content in one batch."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "First", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "Second", 1, chat_id="chat-1")
+        ]
+
+        saved = self._save(chunks, [[1.0, 0.0], [0.0, 1.0]])
+
+        self.assertEqual(saved, chunks)
+        self.assertEqual(len(self.repository.partitions["chat-1"].segments[0].index), 2)
+        self.embedding_service_mock.generate_embeddings_batch.assert_called_once_with(["First", "Second"])
+
+    def test_stored_chunks_hold_no_embedding(self):
+        """Test that the vectors are only kept by the index, not as float lists on the stored chunks."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "First", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "Second", 1, embedding=[0.0, 1.0], chat_id="chat-1")
+        ]
+        self._save(chunks[:1], [[1.0, 0.0]])
+        self._save(chunks[1:], [])
+
+        hits = self.repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=-1.0)
+        stored = [self.repository.get_chunk_by_id("chunk-1"), *self.repository.get_chunks_by_document_id("doc-1")]
+        stored += [hit.chunk for hit in hits] + self.repository.partitions["chat-1"].chunks
+        self.assertTrue(all(chunk.embedding is None for chunk in stored))
+        self.assertEqual(chunks[1].embedding, [0.0, 1.0])
+        np.testing.assert_allclose(self.repository.partitions["chat-1"].segments[0].index.decode([1, 0]), [[0.0, 1.0], [1.0, 0.0]])
+
+    def test_get_embeddings_decodes_the_index(self):
+        """Test that stored embeddings are read back normalized from each chat's index."""
+        self._save([DocumentChunk("chunk-1", "doc-1", "First", 0, chat_id="chat-1")], [[2.0, 0.0]])
+        self._save([DocumentChunk("chunk-2", "doc-2", "Second", 0, chat_id="chat-2")], [[0.0, 3.0]])
+
+        embeddings = self.repository.get_embeddings(["chunk-2", "chunk-1", "unknown"])
+
+        self.assertEqual(embeddings, {"chunk-1": [1.0, 0.0], "chunk-2": [0.0, 1.0]})
+        self.repository.delete_chunks_by_document_id("doc-1")
+        self.assertEqual(self.repository.get_embeddings(["chunk-1"]), {})
+
+    def test_save_chunks_empty_list(self):
+        """Test that saving no chunks does not call the embedding service."""
+        self.assertEqual(self.repository.save_chunks([]), [])
+        self.embedding_service_mock.generate_embeddings_batch.assert_not_called()
+
+    def test_search_similar_chunks_orders_by_similarity(self):
+        """Test that search returns the most similar chunks first."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "B", 1, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-1", "C", 2, chat_id="chat-1")
+        ]
+        self._save(chunks, [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+
+        results = self.repository.search_similar_chunks([1.0, 0.1], "chat-1", max_results=2, similarity_threshold=0.0)
+
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-1", "chunk-2"])
+
+    def test_search_similar_chunks_applies_threshold_and_chat_filter(self):
+        """Test that search ignores other chats and chunks below the threshold."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "B", 1, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "C", 0, chat_id="chat-2")
+        ]
+        self._save(chunks, [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0]])
+
+        results = self.repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.7)
+
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-1"])
+        self.assertEqual(self.repository.search_similar_chunks([1.0, 0.0], "unknown-chat"), [])
+
+    def test_delete_chunks_by_document_id(self):
+        """Test that deleting a document removes its chunks from search."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-2", "B", 0, chat_id="chat-1")
+        ]
+        self._save(chunks, [[1.0, 0.0], [0.9, 0.1]])
+
+        self.assertTrue(self.repository.delete_chunks_by_document_id("doc-1"))
+        self.assertFalse(self.repository.delete_chunks_by_document_id("doc-1"))
+
+        results = self.repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.0)
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-2"])
+        self.assertIsNone(self.repository.get_chunk_by_id("chunk-1"))
+        self.assertEqual(self.repository.get_chunks_by_document_id("doc-2"), [chunks[1]])
+
+    def test_partitions_are_created_lazily_and_dropped_when_empty(self):
+        """Test that each chat gets its own partition, removed with its last document."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-2", "B", 0, chat_id="chat-2"),
+            DocumentChunk("chunk-3", "doc-3", "C", 0, chat_id="chat-2")
+        ]
+        self._save(chunks, [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+
+        self.assertEqual(set(self.repository.partitions), {"chat-1", "chat-2"})
+        self.assertEqual(len(self.repository.partitions["chat-2"]), 2)
+
+        self.repository.delete_chunks_by_document_id("doc-1")
+        self.assertNotIn("chat-1", self.repository.partitions)
+
+        self.repository.delete_chunks_by_document_id("doc-2")
+        self.assertEqual(len(self.repository.partitions["chat-2"]), 1)
+        results = self.repository.search_similar_chunks([0.0, 1.0], "chat-2", similarity_threshold=0.0)
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-3"])
+
+    def test_search_similar_chunks_batch_matches_single_searches(self):
+        """Test that a batched search returns the same lists as one search per query."""
+        chunks = [
+            DocumentChunk("chunk-1", "doc-1", "A", 0, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "B", 1, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "C", 0, chat_id="chat-1")
+        ]
+        self._save(chunks, [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+        self.repository.delete_chunks_by_document_id("doc-2")
+        queries = [[1.0, 0.1], [0.0, 1.0], [-1.0, 0.0]]
+
+        batch = self.repository.search_similar_chunks_batch(queries, "chat-1", max_results=2, similarity_threshold=0.5)
+
+        self.assertEqual(batch, [
+            self.repository.search_similar_chunks(query, "chat-1", max_results=2, similarity_threshold=0.5)
+            for query in queries
+        ])
+        self.assertEqual([[hit.chunk.chunk_id for hit in hits] for hits in batch], [["chunk-1", "chunk-2"], ["chunk-2"], []])
+        self.assertEqual(self.repository.search_similar_chunks_batch(queries, "unknown-chat"), [[], [], []])
+
+
+    def test_concurrent_ingestion_search_and_delete(self):
+        """Stress test: writers, deleters and searchers share the repository without losing alignment."""
+        # The embedding of a chunk is derived from its content, so every hit can be checked
+        def embed(texts):
+            return [[1.0, float(text.split("-")[-1]) / 100.0] for text in texts]
+
+        self.embedding_service_mock.generate_embeddings_batch.side_effect = embed
+        self.repository = InMemoryChunkRepository(
+            self.embedding_service_mock, segment_size=16, compaction_deleted_ratio=0.3
+        )
+        errors = []
+        stop = threading.Event()
+
+        def write(writer):
+            for batch in range(40):
+                document_id = f"doc-{writer}-{batch}"
+                chunks = [
+                    DocumentChunk(f"{document_id}-{i}", document_id, f"text-{(batch + i) % 100}", i, chat_id=f"chat-{batch % 2}")
+                    for i in range(5)
+                ]
+                self.repository.save_chunks(chunks)
+                # Writer 0 deletes every document it saved right away
+                if writer == 0:
+                    self.repository.delete_chunks_by_document_id(document_id)
+
+        def search():
+            query = np.array([1.0, 0.5])
+            while not stop.is_set():
+                for hits in (
+                    self.repository.search_similar_chunks(list(query), "chat-0", 1000, -1.0),
+                    self.repository.search_similar_chunks_batch([list(query)], "chat-1", 1000, -1.0)[0]
+                ):
+                    for hit in hits:
+                        vector = np.array(embed([hit.chunk.content])[0])
+                        expected = vector @ query / (np.linalg.norm(vector) * np.linalg.norm(query))
+                        if abs(hit.similarity - expected) > 1e-5:
+                            errors.append(f"{hit.chunk.chunk_id} scored {hit.similarity}, expected {expected}")
+
+        def run(target, *args):
+            try:
+                target(*args)
+            except Exception as e:
+                errors.append(repr(e))
+
+        searchers = [threading.Thread(target=run, args=(search,)) for _ in range(4)]
+        writers = [threading.Thread(target=run, args=(write, writer)) for writer in range(4)]
+        for thread in searchers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in searchers:
+            thread.join()
+        for partition in self.repository.partitions.values():
+            partition.wait_for_compaction()
+
+        self.assertEqual(errors, [])
+        live = sum(len(partition) for partition in self.repository.partitions.values())
+        self.assertEqual(live, 3 * 40 * 5)
+        self.assertEqual(len(self.repository.get_chunks_by_document_id("doc-1-7")), 5)
+        self.assertIsNone(self.repository.get_chunk_by_id("doc-0-7-0"))
+        for partition in self.repository.partitions.values():
+            for segment in partition.segments:
+                self.assertEqual(len(segment.index), segment.size)
+
+
+class TestFlatVectorIndex(unittest.TestCase):
+    """Unit tests for FlatVectorIndex."""
+
+    def test_vectors_are_normalized_float32(self):
+        """Test that stored vectors are unit-norm float32 rows."""
+        index = FlatVectorIndex(initial_capacity=1)
+        index.add([[3.0, 4.0], [0.0, 2.0], [0.0, 0.0]])
+
+        self.assertEqual(index.vectors.dtype, np.float32)
+        np.testing.assert_allclose(index.vectors, [[0.6, 0.8], [0.0, 1.0], [0.0, 0.0]], rtol=1e-6)
+
+    def test_search_matches_brute_force(self):
+        """Test that top-k search agrees with a full sort of cosine similarities."""
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(500, 16))
+        query = rng.normal(size=16)
+        index = FlatVectorIndex(initial_capacity=8)
+        index.add(vectors)
+
+        hits = index.search(query, max_results=10)
+
+        cosine = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        self.assertEqual([row for row, _ in hits], list(np.argsort(-cosine)[:10]))
+        np.testing.assert_allclose([score for _, score in hits], np.sort(cosine)[::-1][:10], rtol=1e-5)
+
+    def test_search_batch_matches_search(self):
+        """Test that the matrix-matrix batch search agrees with per-query search, mask included."""
+        rng = np.random.default_rng(1)
+        index = FlatVectorIndex()
+        index.add(rng.normal(size=(300, 16)))
+        queries = rng.normal(size=(7, 16))
+        mask = rng.random(300) > 0.3
+
+        batch = index.search_batch(queries, 5, similarity_threshold=0.1, mask=mask)
+
+        for query, hits in zip(queries, batch):
+            expected = index.search(query, 5, similarity_threshold=0.1, mask=mask)
+            self.assertEqual([row for row, _ in hits], [row for row, _ in expected])
+            np.testing.assert_allclose([score for _, score in hits], [score for _, score in expected], rtol=1e-5)
+
+    def test_dimension_mismatch_raises(self):
+        """Test that mixing embedding dimensions is rejected."""
+        index = FlatVectorIndex()
+        index.add([[1.0, 0.0]])
+
+        with self.assertRaises(ValueError):
+            index.add([[1.0, 0.0, 0.0]])
+
@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.ivf_vector_index import IVFVectorIndex, spherical_kmeans
+
+
+class TestIVFVectorIndex(unittest.TestCase):
+    """Unit tests for IVFVectorIndex."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(7)
+        centers = rng.normal(size=(10, 16))
+        self.vectors = centers[rng.integers(10, size=600)] + 0.3 * rng.normal(size=(600, 16))
+        self.query = self.vectors[0] + 0.05 * rng.normal(size=16)
+        self.exact = FlatVectorIndex()
+        self.exact.add(self.vectors)
+
+    def test_untrained_index_uses_exact_scan(self):
+        """Test that a corpus below the training size is searched exhaustively."""
+        index = IVFVectorIndex(min_training_size=1000, background=False)
+        index.add(self.vectors)
+
+        self.assertIsNone(index.layout)
+        self.assertEqual(index.search(self.query, 5), self.exact.search(self.query, 5))
+
+    def test_probing_every_list_is_exact(self):
+        """Test that probing all lists returns the exact top-k."""
+        index = IVFVectorIndex(nlist=8, nprobe=8, min_training_size=100, background=False, seed=0)
+        index.add(self.vectors)
+
+        self.assertIsNotNone(index.layout)
+        self.assertEqual(
+            [row for row, _ in index.search(self.query, 10)],
+            [row for row, _ in self.exact.search(self.query, 10)]
+        )
+
+    def test_retraining_after_growth_in_background(self):
+        """Test that a new layout is built once the corpus grows past the factor."""
+        index = IVFVectorIndex(nlist=4, nprobe=2, retrain_growth_factor=2.0, min_training_size=100, seed=0)
+        index.add(self.vectors[:150])
+        index.wait_for_training()
+        first_layout = index.layout
+        self.assertEqual(first_layout.trained_size, 150)
+
+        index.add(self.vectors[150:250])
+        index.wait_for_training()
+        self.assertIs(index.layout, first_layout)
+
+        index.add(self.vectors[250:])
+        index.wait_for_training()
+        self.assertIsNot(index.layout, first_layout)
+        self.assertEqual(index.layout.trained_size, 600)
+        self.assertEqual(sum(len(rows) for rows in index.layout.lists), 600)
+
+    def test_concurrent_adds_start_a_single_training(self):
+        """Test that adds crossing the training size together start only one training thread."""
+        index = IVFVectorIndex(nlist=4, min_training_size=100, seed=0)
+        barrier = threading.Barrier(8)
+        calls = []
+
+        def slow_train():
+            calls.append(1)
+            time.sleep(0.2)
+
+        def add(rows):
+            barrier.wait()
+            index.add(rows)
+
+        with patch.object(index, "_train", side_effect=slow_train):
+            threads = [threading.Thread(target=add, args=(self.vectors[i * 75:(i + 1) * 75],)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            index.wait_for_training()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_keep_renumbers_lists(self):
+        """Test that dropping rows keeps lists consistent with the stored vectors."""
+        index = IVFVectorIndex(nlist=4, nprobe=4, min_training_size=100, background=False, seed=0)
+        index.add(self.vectors)
+        mask = np.ones(len(self.vectors), dtype=bool)
+        mask[:300] = False
+
+        index.keep(mask)
+
+        self.assertEqual(len(index), 300)
+        self.assertEqual(sorted(row for rows in index.layout.lists for row in rows), list(range(300)))
+        self.assertEqual(index.search(self.vectors[400], 1)[0][0], 100)
+
+    def test_spherical_kmeans_returns_unit_centroids(self):
+        """Test that k-means centroids are normalized and distinct."""
+        vectors = FlatVectorIndex()
+        vectors.add(self.vectors)
+
+        centroids = spherical_kmeans(vectors.vectors, 10, rng=np.random.default_rng(0))
+
+        self.assertEqual(centroids.shape, (10, 16))
+        np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1.0, rtol=1e-5)
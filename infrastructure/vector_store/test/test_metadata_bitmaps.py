@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document import DocumentType
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.in_memory_chunk_repository import InMemoryChunkRepository
+from infrastructure.vector_store.metadata_bitmaps import MetadataBitmaps
+
+
+class TestMetadataBitmaps(unittest.TestCase):
+    """Unit tests for MetadataBitmaps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.bitmaps = MetadataBitmaps(initial_capacity=1)
+        self.bitmaps.add([
+            {"document_type": "pdf", "created_at": "2024-01-10T00:00:00", "lang": "en"},
+            {"document_type": "image", "created_at": "2024-03-01T00:00:00", "lang": "fr"},
+            {"document_type": "pdf", "lang": "fr", "tags": ["a", "b"]}
+        ])
+
+    def test_mask_combines_conditions(self):
+        """Test that type, metadata and date conditions are ANDed together."""
+        pdf = self.bitmaps.mask(ChunkFilter(document_types=[DocumentType.PDF]))
+        french_pdf = self.bitmaps.mask(ChunkFilter(document_types=[DocumentType.PDF], metadata={"lang": "fr"}))
+        recent = self.bitmaps.mask(ChunkFilter(created_after=datetime(2024, 2, 1)))
+        early = self.bitmaps.mask(ChunkFilter(created_before=datetime(2024, 2, 1)))
+
+        self.assertEqual(list(pdf), [True, False, True])
+        self.assertEqual(list(french_pdf), [False, False, True])
+        self.assertEqual(list(recent), [False, True, False])
+        self.assertEqual(list(early), [True, False, False])
+        self.assertEqual(list(self.bitmaps.mask(ChunkFilter(metadata={"lang": "de"}))), [False, False, False])
+        self.assertIsNone(self.bitmaps.mask(ChunkFilter(document_ids=["doc-1"])))
+
+    def test_keep_drops_rows(self):
+        """Test that keep renumbers the bitmaps and the timestamp column."""
+        self.bitmaps.keep(np.array([False, True, True]))
+
+        self.assertEqual(len(self.bitmaps), 2)
+        self.assertEqual(list(self.bitmaps.mask(ChunkFilter(metadata={"lang": "fr"}))), [True, True])
+        self.assertEqual(list(self.bitmaps.mask(ChunkFilter(created_after=datetime(2024, 1, 1)))), [True, False])
+
+
+class TestFilteredSearch(unittest.TestCase):
+    """Unit tests for metadata-filtered searches in InMemoryChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0], [0.9, 0.1], [0.8, 0.2], [0.7, 0.3]]
+        self.repository = InMemoryChunkRepository(embedding_service=embedding_service_mock, segment_size=2)
+        january_pdf = {"document_type": "pdf", "created_at": "2024-01-01T00:00:00"}
+        june_image = {"document_type": "image", "created_at": "2024-06-01T00:00:00"}
+        june_pdf = {"document_type": "pdf", "created_at": "2024-06-01T00:00:00", "author": "ada"}
+        self.repository.save_chunks([
+            DocumentChunk("chunk-1", "doc-1", "A", 0, metadata=january_pdf, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-2", "B", 0, metadata=june_image, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-3", "C", 0, metadata=june_pdf, chat_id="chat-1"),
+            DocumentChunk("chunk-4", "doc-3", "D", 1, metadata=june_pdf, chat_id="chat-1")
+        ])
+
+    def _search(self, chunk_filter):
+        hits = self.repository.search_similar_chunks(
+            [1.0, 0.0], "chat-1", max_results=2, similarity_threshold=0.0, chunk_filter=chunk_filter
+        )
+        return [hit.chunk.chunk_id for hit in hits]
+
+    def test_filters_apply_before_top_k(self):
+        """Test that filtered searches return the best matching chunks among the allowed ones."""
+        self.assertEqual(self._search(None), ["chunk-1", "chunk-2"])
+        self.assertEqual(self._search(ChunkFilter(document_ids=["doc-3"])), ["chunk-3", "chunk-4"])
+        self.assertEqual(self._search(ChunkFilter(document_types=[DocumentType.IMAGE])), ["chunk-2"])
+        recent_pdf = ChunkFilter(document_types=[DocumentType.PDF], created_after=datetime(2024, 3, 1))
+        self.assertEqual(self._search(recent_pdf), ["chunk-3", "chunk-4"])
+        by_author = ChunkFilter(metadata={"author": "ada"}, document_ids=["doc-1", "doc-3"])
+        self.assertEqual(self._search(by_author), ["chunk-3", "chunk-4"])
+        self.assertEqual(self._search(ChunkFilter(metadata={"author": "bob"})), [])
+
+    def test_filters_skip_deleted_chunks(self):
+        """Test that deleted chunks stay excluded from filtered searches."""
+        self.repository.delete_chunks_by_document_id("doc-3")
+
+        self.assertEqual(self._search(ChunkFilter(document_types=[DocumentType.PDF])), ["chunk-1"])
@@ -0,0 +1,260 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.mmap_chunk_repository import MemoryMappedChunkRepository, WriterLockHeldError
+
+
+class TestMemoryMappedChunkRepository(unittest.TestCase):
+    """Unit tests for MemoryMappedChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.repository = self._open()
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]]
+        self.repository.save_chunks([
+            DocumentChunk("chunk-1", "doc-1", "A", 0, metadata={"page": 1, "created_at": "2024-01-01T00:00:00"}, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "B", 1, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "C", 0, chat_id="chat-2")
+        ])
+
+    def tearDown(self):
+        """Close the store and remove its files."""
+        self.repository.close()
+        self.directory.cleanup()
+
+    def _open(self):
+        return MemoryMappedChunkRepository(self.embedding_service_mock, self.directory.name)
+
+    def test_search_similar_chunks_filters_by_chat_and_threshold(self):
+        """Test that search ranks one chat's chunks and drops those below the threshold."""
+        results = self.repository.search_similar_chunks([1.0, 0.1], "chat-1", max_results=5, similarity_threshold=0.5)
+
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-1", "chunk-2"])
+        self.assertEqual(results[0].chunk.metadata["page"], 1)
+        self.assertEqual(self.repository.search_similar_chunks([1.0, 0.0], "unknown-chat"), [])
+
+    def test_search_similar_chunks_batch(self):
+        """Test that batched queries return one ranked list per query."""
+        results = self.repository.search_similar_chunks_batch([[1.0, 0.1], [0.0, 1.0]], "chat-1", similarity_threshold=0.5)
+
+        self.assertEqual([[hit.chunk.chunk_id for hit in hits] for hits in results], [["chunk-1", "chunk-2"], ["chunk-2"]])
+
+    def test_search_with_chunk_filter(self):
+        """Test that document and metadata filters restrict the candidates before ranking."""
+        def search(chunk_filter):
+            hits = self.repository.search_similar_chunks([1.0, 0.1], "chat-1", similarity_threshold=0.0, chunk_filter=chunk_filter)
+            return [hit.chunk.chunk_id for hit in hits]
+
+        self.assertEqual(search(ChunkFilter(metadata={"page": 1})), ["chunk-1"])
+        self.assertEqual(search(ChunkFilter(document_ids=["doc-2"])), [])
+        self.assertEqual(search(ChunkFilter(created_before=datetime(2023, 1, 1))), [])
+        self.assertEqual(search(ChunkFilter(created_after=datetime(2023, 1, 1), document_ids=["doc-1"])), ["chunk-1"])
+
+    def test_get_embeddings_reads_the_mapped_vectors(self):
+        """Test that stored embeddings come from the vector file and deleted chunks are left out."""
+        self.assertEqual(self.repository.get_embeddings(["chunk-3", "chunk-1", "unknown"]), {"chunk-3": [0.0, 1.0], "chunk-1": [1.0, 0.0]})
+
+        self.repository.delete_chunks_by_document_id("doc-1")
+
+        self.assertEqual(self.repository.get_embeddings(["chunk-1", "chunk-2"]), {})
+
+    def test_reopen_restores_chunks_without_embedding(self):
+        """Test that a new instance over the same directory serves the stored chunks."""
+        self.repository.close()
+        self.embedding_service_mock.reset_mock()
+
+        self.repository = self._open()
+
+        self.assertEqual(len(self.repository), 3)
+        self.assertEqual(self.repository.get_chunk_by_id("chunk-3").content, "C")
+        results = self.repository.search_similar_chunks([0.0, 1.0], "chat-2", similarity_threshold=0.5)
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-3"])
+        self.embedding_service_mock.generate_embeddings_batch.assert_not_called()
+
+    def test_delete_chunks_by_document_id_persists(self):
+        """Test that deleted chunks stay deleted after a restart."""
+        self.assertTrue(self.repository.delete_chunks_by_document_id("doc-1"))
+        self.assertFalse(self.repository.delete_chunks_by_document_id("doc-1"))
+        self.repository.close()
+
+        self.repository = self._open()
+
+        self.assertEqual(self.repository.get_chunks_by_document_id("doc-1"), [])
+        self.assertIsNone(self.repository.get_chunk_by_id("chunk-1"))
+        self.assertEqual(self.repository.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.0), [])
+
+    def test_appends_after_reopen(self):
+        """Test that chunks saved after a restart are appended to the existing rows."""
+        self.repository.close()
+        self.repository = self._open()
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.8, 0.6]]
+
+        self.repository.save_chunks([DocumentChunk("chunk-4", "doc-1", "D", 2, chat_id="chat-1")])
+
+        self.assertEqual([chunk.chunk_id for chunk in self.repository.get_chunks_by_document_id("doc-1")],
+                         ["chunk-1", "chunk-2", "chunk-4"])
+        self.assertEqual(self.repository.get_chunk_by_id("chunk-4").chunk_index, 2)
+
+    def test_recovers_from_an_interrupted_save(self):
+        """Test that bytes left past the last complete row by a crash are dropped on reopen."""
+        self.repository.close()
+        # A save interrupted before its row was written: side-file record and vector, no row
+        with open(os.path.join(self.directory.name, "chunks.jsonl"), "ab") as file:
+            file.write(b'{"chunk_id": "orphan", "document_id": "doc-9", "chat_id": "chat-1", '
+                       b'"content": "X", "chunk_index": 0, "metadata": {}}\n')
+        with open(os.path.join(self.directory.name, "embeddings.f32"), "ab") as file:
+            file.write(bytes(8))
+        with open(os.path.join(self.directory.name, "keys.jsonl"), "ab") as file:
+            file.write(b'{"kind": "document", "id"')
+
+        self.repository = self._open()
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.0, 1.0]]
+        self.repository.save_chunks([DocumentChunk("chunk-4", "doc-3", "D", 0, chat_id="chat-1")])
+
+        self.assertEqual(len(self.repository), 4)
+        self.assertIsNone(self.repository.get_chunk_by_id("orphan"))
+        self.assertEqual(self.repository.get_chunk_by_id("chunk-4").content, "D")
+        results = self.repository.search_similar_chunks([0.0, 1.0], "chat-1", max_results=1, similarity_threshold=0.9)
+        self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-4"])
+        self.repository.close()
+
+        self.repository = self._open()
+        self.assertEqual([chunk.chunk_id for chunk in self.repository.get_chunks_by_document_id("doc-3")], ["chunk-4"])
+
+    def test_concurrent_searches_read_their_own_records(self):
+        """Test that searches running on several threads never read each other's records."""
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0]] * 200
+        self.repository.save_chunks([
+            DocumentChunk(f"bulk-{i}", "doc-3", f"Chunk number {i} " * (i % 7 + 1), i, chat_id="chat-3")
+            for i in range(200)
+        ])
+
+        def search(_):
+            hits = self.repository.search_similar_chunks([1.0, 0.0], "chat-3", max_results=50, similarity_threshold=0.5)
+            return sorted(hit.chunk.content for hit in hits)
+
+        expected = search(None)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(search, range(64)))
+
+        self.assertEqual(results, [expected] * 64)
+
+    def test_reader_searches_while_it_refreshes(self):
+        """Test that searches on a reader stay consistent while other threads pick up the writer's changes."""
+        reader = MemoryMappedChunkRepository(self.embedding_service_mock, self.directory.name, read_only=True)
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0]] * 20
+
+        def search(_):
+            for _ in range(60):
+                hits = reader.search_similar_chunks([1.0, 0.0], "chat-3", max_results=1000, similarity_threshold=0.5)
+                self.assertEqual(len(hits) % 20, 0)
+
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                searches = [executor.submit(search, worker) for worker in range(8)]
+                for batch in range(60):
+                    self.repository.save_chunks([
+                        DocumentChunk(f"bulk-{batch}-{i}", f"doc-{batch}", "Bulk", i, chat_id="chat-3") for i in range(20)
+                    ])
+                for future in searches:
+                    future.result()
+            self.assertEqual(len(reader), 1203)
+        finally:
+            reader.close()
+
+    def test_dimension_mismatch_raises(self):
+        """Test that embeddings of another dimension are rejected."""
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0, 0.0]]
+
+        with self.assertRaises(ValueError):
+            self.repository.save_chunks([DocumentChunk("chunk-5", "doc-3", "E", 0, chat_id="chat-1")])
+
+    def test_single_writer(self):
+        """Test that a second writer is refused."""
+        with self.assertRaises(WriterLockHeldError):
+            self._open()
+
+    def test_open_shared_falls_back_to_read_only(self):
+        """Test that open_shared opens the store read-only while another process is its writer."""
+        shared = MemoryMappedChunkRepository.open_shared(self.embedding_service_mock, self.directory.name)
+        try:
+            self.assertTrue(shared.read_only)
+            self.assertEqual(len(shared), 3)
+        finally:
+            shared.close()
+
+        self.repository.close()
+        self.repository = MemoryMappedChunkRepository.open_shared(self.embedding_service_mock, self.directory.name)
+        self.assertFalse(self.repository.read_only)
+
+    def test_reader_forwards_writes_to_the_writer(self):
+        """Test that saves and deletes made on a read-only instance are applied by the writer."""
+        reader = MemoryMappedChunkRepository(self.embedding_service_mock, self.directory.name, read_only=True)
+        try:
+            self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.0, 1.0]]
+            reader.save_chunks([DocumentChunk("chunk-4", "doc-3", "D", 0, metadata={"page": 2}, chat_id="chat-3")])
+
+            results = reader.search_similar_chunks([0.0, 1.0], "chat-3", similarity_threshold=0.5)
+            self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-4"])
+            self.assertEqual(self.repository.get_chunk_by_id("chunk-4").metadata, {"page": 2})
+
+            self.assertTrue(reader.delete_chunks_by_document_id("doc-1"))
+            self.assertFalse(reader.delete_chunks_by_document_id("doc-1"))
+            self.assertIsNone(self.repository.get_chunk_by_id("chunk-1"))
+            self.assertEqual(len(reader), 2)
+            self.assertEqual(os.listdir(os.path.join(self.directory.name, "inbox")), [])
+        finally:
+            reader.close()
+
+    def test_forwarded_write_errors_reach_the_reader(self):
+        """Test that a write the writer rejects raises on the reader."""
+        reader = MemoryMappedChunkRepository(self.embedding_service_mock, self.directory.name, read_only=True)
+        try:
+            self.embedding_service_mock.generate_embeddings_batch.return_value = [[1.0, 0.0, 0.0]]
+            with self.assertRaises(ValueError):
+                reader.save_chunks([DocumentChunk("chunk-5", "doc-3", "E", 0, chat_id="chat-1")])
+        finally:
+            reader.close()
+
+    def test_forwarded_write_times_out_without_a_writer(self):
+        """Test that a read-only instance gives up when no writer applies its write."""
+        self.repository.close()
+        reader = MemoryMappedChunkRepository(
+            self.embedding_service_mock, self.directory.name, read_only=True, forward_timeout=0.1
+        )
+        try:
+            with self.assertRaises(ValueError):
+                reader.delete_chunks_by_document_id("doc-1")
+            self.assertEqual(os.listdir(os.path.join(self.directory.name, "inbox")), [])
+        finally:
+            reader.close()
+        self.repository = self._open()
+        self.assertIsNotNone(self.repository.get_chunk_by_id("chunk-1"))
+
+    def test_reader_follows_the_writer(self):
+        """Test that a read-only instance sees the inserts and deletes of the writer on its next call."""
+        reader = MemoryMappedChunkRepository(self.embedding_service_mock, self.directory.name, read_only=True)
+        try:
+            self.assertEqual(len(reader), 3)
+
+            self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.0, 1.0]]
+            self.repository.save_chunks([DocumentChunk("chunk-4", "doc-3", "D", 0, chat_id="chat-3")])
+            results = reader.search_similar_chunks([0.0, 1.0], "chat-3", similarity_threshold=0.5)
+            self.assertEqual([hit.chunk.chunk_id for hit in results], ["chunk-4"])
+            self.assertEqual(reader.get_chunk_by_id("chunk-4").content, "D")
+
+            self.repository.delete_chunks_by_document_id("doc-1")
+            self.assertEqual(reader.search_similar_chunks([1.0, 0.0], "chat-1", similarity_threshold=0.0), [])
+            self.assertIsNone(reader.get_chunk_by_id("chunk-1"))
+            self.assertEqual(len(reader), 2)
+        finally:
+            reader.close()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from domain.model.document_chunk import DocumentChunk
+from domain.model.scored_chunk import ScoredChunk
+from domain.port.document_chunk_repository_port import DocumentChunkRepositoryPort
+from infrastructure.vector_store.flat_vector_index import normalize_vectors
+from infrastructure.vector_store.mmr_chunk_repository import MMRChunkRepository, maximal_marginal_relevance
+
+
+class TestMMRChunkRepository(unittest.TestCase):
+    """Unit tests for MMRChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.repository_mock = MagicMock(spec=DocumentChunkRepositoryPort)
+        self.repository = MMRChunkRepository(self.repository_mock, fetch_factor=3)
+        # chunk-2 is a near-duplicate of chunk-1, chunk-3 is less relevant but different
+        self.candidates = [
+            ScoredChunk(DocumentChunk("chunk-1", "doc-1", "A", 0, [1.0, 0.0, 0.0]), 0.95, 1),
+            ScoredChunk(DocumentChunk("chunk-2", "doc-1", "A'", 1, [0.99, 0.14, 0.0]), 0.94, 2),
+            ScoredChunk(DocumentChunk("chunk-3", "doc-2", "B", 0, [0.6, 0.0, 0.8]), 0.6, 3)
+        ]
+
+    def test_maximal_marginal_relevance(self):
+        """Test that lambda 1.0 keeps the relevance order and lower values skip redundant rows."""
+        query = normalize_vectors([[1.0, 0.05, 0.1]])[0]
+        candidates = normalize_vectors([candidate.chunk.embedding for candidate in self.candidates])
+
+        self.assertEqual(maximal_marginal_relevance(query, candidates, 2, lambda_mult=1.0), [0, 1])
+        self.assertEqual(maximal_marginal_relevance(query, candidates, 2, lambda_mult=0.5), [0, 2])
+        self.assertEqual(maximal_marginal_relevance(query, candidates, 5, lambda_mult=0.5), [0, 2, 1])
+        self.assertEqual(maximal_marginal_relevance(query, np.empty((0, 3), dtype=np.float32), 2), [])
+
+    def test_search_fetches_more_candidates_and_diversifies(self):
+        """Test that near-duplicates are dropped and the kept hits are ranked again."""
+        self.repository_mock.search_similar_chunks.return_value = self.candidates
+
+        hits = self.repository.search_similar_chunks([1.0, 0.05, 0.1], "chat-1", max_results=2, similarity_threshold=0.5)
+
+        self.repository_mock.search_similar_chunks.assert_called_once_with([1.0, 0.05, 0.1], "chat-1", 6, 0.5, None)
+        self.assertEqual(hits, [ScoredChunk(self.candidates[0].chunk, 0.95, 1), ScoredChunk(self.candidates[2].chunk, 0.6, 2)])
+        self.repository_mock.get_embeddings.assert_not_called()
+
+    def test_chunks_without_embedding_use_the_stored_vectors(self):
+        """Test that missing candidate embeddings are read from the wrapped repository in one call."""
+        embeddings = {candidate.chunk.chunk_id: candidate.chunk.embedding for candidate in self.candidates}
+        for candidate in self.candidates:
+            candidate.chunk.embedding = None
+        self.repository_mock.get_embeddings.return_value = embeddings
+        self.repository_mock.search_hybrid_chunks.return_value = self.candidates
+
+        hits = self.repository.search_hybrid_chunks("a", [1.0, 0.05, 0.1], "chat-1", max_results=2)
+
+        self.assertEqual([hit.chunk.chunk_id for hit in hits], ["chunk-1", "chunk-3"])
+        self.repository_mock.get_embeddings.assert_called_once_with(["chunk-1", "chunk-2", "chunk-3"])
+
+    def test_candidates_without_stored_vector_keep_their_order(self):
+        """Test that candidates are cut to max_results undiversified when a vector cannot be found."""
+        self.candidates[2].chunk.embedding = None
+        self.repository_mock.get_embeddings.return_value = {}
+        self.repository_mock.search_similar_chunks.return_value = self.candidates
+
+        hits = self.repository.search_similar_chunks([1.0, 0.05, 0.1], "chat-1", max_results=2)
+
+        self.assertEqual(hits, self.candidates[:2])
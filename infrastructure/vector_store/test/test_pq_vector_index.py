@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.pq_vector_index import PQVectorIndex, kmeans
+
+
+class TestPQVectorIndex(unittest.TestCase):
+    """Unit tests for PQVectorIndex."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(5)
+        centers = rng.normal(size=(20, 30))
+        self.vectors = centers[rng.integers(20, size=1000)] + 0.2 * rng.normal(size=(1000, 30))
+        self.exact = FlatVectorIndex()
+        self.exact.add(self.vectors)
+
+    def test_untrained_index_buffers_and_searches_exactly(self):
+        """Test that vectors are kept in float32 until the training size is reached."""
+        index = PQVectorIndex(subspaces=4, min_training_size=5000)
+        index.add(self.vectors)
+
+        self.assertFalse(index.is_trained)
+        self.assertEqual(index.search(self.vectors[0], 5), self.exact.search(self.vectors[0], 5))
+
+    def test_training_compresses_to_one_byte_per_subspace(self):
+        """Test that training encodes every row and releases the float32 buffer."""
+        index = PQVectorIndex(subspaces=8, min_training_size=500, seed=0)
+        index.add(self.vectors[:400])
+        index.add(self.vectors[400:])
+
+        self.assertTrue(index.is_trained)
+        self.assertEqual(len(index), 1000)
+        self.assertEqual(index.codes.shape, (1000, 8))
+        self.assertEqual(index.codes.dtype, np.uint8)
+        self.assertLess(index.nbytes, self.exact.nbytes)
+
+    def test_asymmetric_distance_matches_reconstruction(self):
+        """Test that lookup-table scores equal inner products with the decoded vectors."""
+        index = PQVectorIndex(subspaces=5, min_training_size=256, seed=0)
+        index.add(self.vectors)
+        query = self.exact.vectors[3]
+
+        hits = index.search(query, 10)
+        reconstructed_scores = index.decode() @ query
+
+        for row, score in hits:
+            self.assertAlmostEqual(score, reconstructed_scores[row], places=4)
+        self.assertIn(3, [row for row, _ in hits])
+        np.testing.assert_allclose(index.decode([7, 3]), index.decode()[[7, 3]])
+
+    def test_mask_and_keep(self):
+        """Test that masked rows are skipped and keep drops codes."""
+        index = PQVectorIndex(subspaces=6, min_training_size=256, seed=0)
+        index.add(self.vectors)
+        mask = np.ones(1000, dtype=bool)
+        mask[:500] = False
+
+        self.assertTrue(all(row >= 500 for row, _ in index.search(self.vectors[0], 10, mask=mask)))
+
+        index.keep(mask)
+        self.assertEqual(len(index), 500)
+
+    def test_incremental_adds_grow_the_codes_geometrically(self):
+        """Test that adds after training append in place and match encoding all rows at once."""
+        index = PQVectorIndex(subspaces=6, min_training_size=256, initial_capacity=16, seed=0)
+        index.add(self.vectors[:256])
+        capacities = set()
+        for start in range(256, 1000, 4):
+            index.add(self.vectors[start:start + 4])
+            capacities.add(len(index._codes))
+
+        self.assertEqual(len(index), 1000)
+        self.assertLessEqual(len(capacities), 3)
+        np.testing.assert_array_equal(index.codes, index._encode(self.exact.vectors))
+
+    def test_kmeans_finds_separated_clusters(self):
+        """Test that k-means recovers well separated cluster centers."""
+        points = np.concatenate([np.zeros((50, 2)), np.full((50, 2), 10.0)])
+
+        centroids = kmeans(points, 2, rng=np.random.default_rng(0))
+
+        np.testing.assert_allclose(sorted(centroids[:, 0]), [0.0, 10.0])
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex
+from infrastructure.vector_store.quantized_vector_index import QuantizedVectorIndex
+
+
+class TestQuantizedVectorIndex(unittest.TestCase):
+    """Unit tests for QuantizedVectorIndex."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        rng = np.random.default_rng(3)
+        self.vectors = rng.normal(size=(1000, 64))
+        self.queries = rng.normal(size=(20, 64))
+        self.exact = FlatVectorIndex()
+        self.exact.add(self.vectors)
+
+    def _recall(self, index, k=10):
+        recalls = []
+        for query in self.queries:
+            expected = {row for row, _ in self.exact.search(query, k)}
+            recalls.append(len(expected & {row for row, _ in index.search(query, k)}) / k)
+        return np.mean(recalls)
+
+    def test_int8_storage_is_compact_and_accurate(self):
+        """Test that int8 codes take a quarter of float32 and keep a high recall."""
+        index = QuantizedVectorIndex(dtype="int8")
+        index.add(self.vectors)
+
+        self.assertEqual(index.codes.dtype, np.int8)
+        self.assertLess(index.nbytes, self.exact.vectors.nbytes / 3)
+        self.assertGreaterEqual(self._recall(index), 0.9)
+
+    def test_float16_storage(self):
+        """Test that float16 storage halves memory with near-exact scores."""
+        index = QuantizedVectorIndex(dtype="float16")
+        index.add(self.vectors)
+
+        hits = index.search(self.queries[0], 5)
+        exact_hits = self.exact.search(self.queries[0], 5)
+
+        self.assertEqual(index.codes.dtype, np.float16)
+        np.testing.assert_allclose([s for _, s in hits], [s for _, s in exact_hits], atol=1e-3)
+
+    def test_rescoring_returns_exact_scores(self):
+        """Test that float32 rescoring yields the exact top-k and similarities."""
+        index = QuantizedVectorIndex(dtype="int8", rescore_candidates=50)
+        index.add(self.vectors)
+
+        for query in self.queries:
+            hits = index.search(query, 5)
+            exact_hits = self.exact.search(query, 5)
+            self.assertEqual([row for row, _ in hits], [row for row, _ in exact_hits])
+            np.testing.assert_allclose([s for _, s in hits], [s for _, s in exact_hits], rtol=1e-5)
+
+    def test_incremental_adds_rescale_codes(self):
+        """Test that vectors outside the current scales widen them instead of clipping."""
+        index = QuantizedVectorIndex(dtype="int8")
+        index.add([[1.0, 0.0, 0.0, 0.0]])
+        index.add([[0.0, 0.0, 1.0, 0.0]])
+
+        np.testing.assert_allclose(index.decode(), [[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]], atol=0.02)
+
+    def test_mask_and_keep(self):
+        """Test that masked rows are skipped and keep compacts the codes."""
+        index = QuantizedVectorIndex(dtype="int8", rescore_candidates=10)
+        index.add([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+        hits = index.search([1.0, 0.0], 3, mask=np.array([False, True, True]))
+        self.assertEqual([row for row, _ in hits], [1, 2])
+
+        index.keep(np.array([False, True, True]))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search([1.0, 0.0], 1)[0][0], 0)
+
+    def test_unsupported_dtype_raises(self):
+        """Test that unknown quantization types are rejected."""
+        with self.assertRaises(ValueError):
+            QuantizedVectorIndex(dtype="int4")
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from domain.model.chunk_filter import ChunkFilter
+from domain.model.document_chunk import DocumentChunk
+from domain.port.embedding_service_port import EmbeddingServicePort
+from infrastructure.vector_store.sqlite_chunk_repository import SQLiteChunkRepository
+
+
+class TestSQLiteChunkRepository(unittest.TestCase):
+    """Unit tests for SQLiteChunkRepository."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "rag.sqlite3")
+        self.embedding_service_mock = MagicMock(spec=EmbeddingServicePort)
+        self.repository = SQLiteChunkRepository(self.embedding_service_mock, self.path)
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[2.0, 0.0], [0.6, 0.8], [0.0, 1.0]]
+        self.repository.save_chunks([
+            DocumentChunk("chunk-1", "doc-1", "A", 0, metadata={"lang": "en"}, chat_id="chat-1"),
+            DocumentChunk("chunk-2", "doc-1", "B", 1, metadata={"lang": "fr"}, chat_id="chat-1"),
+            DocumentChunk("chunk-3", "doc-2", "C", 0, chat_id="chat-2")
+        ])
+
+    def tearDown(self):
+        """Close the database and remove it."""
+        self.repository.close()
+        self.directory.cleanup()
+
+    def _ids(self, hits):
+        return [hit.chunk.chunk_id for hit in hits]
+
+    def test_database_uses_wal_and_float32_blobs(self):
+        """Test that the database is in WAL mode and stores normalized float32 embeddings."""
+        with sqlite3.connect(self.path) as connection:
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            blob = connection.execute("SELECT embedding FROM chunks WHERE chunk_id = 'chunk-1'").fetchone()[0]
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(len(blob), 2 * 4)
+        self.assertEqual(self.repository.get_chunk_by_id("chunk-1").embedding, [1.0, 0.0])
+
+    def test_get_embeddings_reads_the_stored_blobs(self):
+        """Test that stored embeddings are returned normalized and unknown IDs are left out."""
+        embeddings = self.repository.get_embeddings(["chunk-1", "chunk-3", "unknown"])
+
+        self.assertEqual(embeddings, {"chunk-1": [1.0, 0.0], "chunk-3": [0.0, 1.0]})
+        self.assertEqual(self.repository.get_embeddings([]), {})
+
+    def test_search_similar_chunks(self):
+        """Test that search ranks a chat's chunks with their similarity."""
+        hits = self.repository.search_similar_chunks([1.0, 0.1], "chat-1", similarity_threshold=0.5)
+
+        self.assertEqual(self._ids(hits), ["chunk-1", "chunk-2"])
+        self.assertEqual([hit.rank for hit in hits], [1, 2])
+        self.assertAlmostEqual(hits[1].similarity, (0.6 + 0.08) / (1.01 ** 0.5), places=5)
+        self.assertEqual(self.repository.search_similar_chunks([1.0, 0.0], "unknown-chat"), [])
+        filtered = self.repository.search_similar_chunks([1.0, 0.1], "chat-1", 0, chunk_filter=ChunkFilter(metadata={"lang": "fr"}))
+        self.assertEqual(self._ids(filtered), [])
+
+    def test_cache_is_invalidated_on_writes(self):
+        """Test that chunks saved or deleted after a search are seen by the next search."""
+        self.assertEqual(self._ids(self.repository.search_similar_chunks([0.0, 1.0], "chat-2", similarity_threshold=0.5)), ["chunk-3"])
+
+        self.embedding_service_mock.generate_embeddings_batch.return_value = [[0.1, 1.0]]
+        self.repository.save_chunks([DocumentChunk("chunk-4", "doc-3", "D", 0, chat_id="chat-2")])
+        self.assertEqual(self._ids(self.repository.search_similar_chunks([0.0, 1.0], "chat-2", similarity_threshold=0.5)), ["chunk-3", "chunk-4"])
+
+        self.assertTrue(self.repository.delete_chunks_by_document_id("doc-2"))
+        self.assertFalse(self.repository.delete_chunks_by_document_id("doc-2"))
+        self.assertEqual(self._ids(self.repository.search_similar_chunks([0.0, 1.0], "chat-2", similarity_threshold=0.5)), ["chunk-4"])
+
+    def test_chunks_survive_reopen(self):
+        """Test that a new repository over the same database serves the stored chunks."""
+        self.repository.close()
+        self.repository = SQLiteChunkRepository(self.embedding_service_mock, self.path)
+
+        self.assertEqual([chunk.chunk_id for chunk in self.repository.get_chunks_by_document_id("doc-1")], ["chunk-1", "chunk-2"])
+        batch = self.repository.search_similar_chunks_batch([[1.0, 0.0], [0.0, 1.0]], "chat-1", similarity_threshold=0.7)
+        self.assertEqual([self._ids(hits) for hits in batch], [["chunk-1"], ["chunk-2"]])
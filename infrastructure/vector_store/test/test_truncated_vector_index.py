@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors
+from infrastructure.vector_store.truncated_vector_index import TruncatedVectorIndex
+
+
+class TestTruncatedVectorIndex(unittest.TestCase):
+    """Unit tests for TruncatedVectorIndex."""
+
+    def _recall(self, index, vectors, rng):
+        exact = FlatVectorIndex()
+        exact.add(vectors)
+        recalls = []
+        for query in vectors[:10] + 0.3 * rng.normal(size=(10, vectors.shape[1])):
+            expected = {row for row, _ in exact.search(query, 5)}
+            found = {row for row, _ in index.search(query, 5)}
+            recalls.append(len(expected & found) / 5)
+        return np.mean(recalls)
+
+    def test_pca_projection_is_fitted_on_the_corpus(self):
+        """Test that PCA is fitted once enough rows are stored and keeps recall high."""
+        rng = np.random.default_rng(3)
+        # Most of the variance lives in 8 of the 64 dimensions
+        vectors = rng.normal(size=(1500, 8)) @ rng.normal(size=(8, 64)) + 0.1 * rng.normal(size=(1500, 64))
+        index = TruncatedVectorIndex(dimensions=8, projection="pca", rescore_candidates=50, min_training_size=1000, seed=0)
+
+        index.add(vectors[:999])
+        self.assertFalse(index.is_trained)
+        self.assertEqual(len(index.search(vectors[0], 5)), 5)
+
+        index.add(vectors[999:])
+        self.assertTrue(index.is_trained)
+        self.assertEqual(index.components.shape, (64, 8))
+        self.assertEqual(index.reduced_vectors.shape, (1500, 8))
+        self.assertGreaterEqual(self._recall(index, vectors, rng), 0.9)
+
+    def test_prefix_projection(self):
+        """Test that prefixes need no training and rescoring recovers the exact top-k."""
+        rng = np.random.default_rng(5)
+        vectors = rng.normal(size=(2000, 32)) * np.linspace(3.0, 0.1, 32)
+        index = TruncatedVectorIndex(dimensions=8, rescore_candidates=200)
+        index.add(vectors)
+
+        self.assertTrue(index.is_trained)
+        np.testing.assert_allclose(index.reduced_vectors, normalize_vectors(vectors)[:, :8], rtol=1e-6)
+        self.assertGreaterEqual(self._recall(index, vectors, rng), 0.9)
+
+    def test_threshold_mask_and_keep(self):
+        """Test that scores are exact cosines and that masked or dropped rows are excluded."""
+        index = TruncatedVectorIndex(dimensions=1, rescore_candidates=10)
+        index.add([[1.0, 0.0], [0.6, 0.8], [-1.0, 0.0]])
+
+        hits = index.search([1.0, 0.0], 3, similarity_threshold=0.5)
+        self.assertEqual([row for row, _ in hits], [0, 1])
+        self.assertAlmostEqual(hits[1][1], 0.6, places=5)
+        self.assertEqual([row for row, _ in index.search([1.0, 0.0], 3, mask=np.array([False, True, True]))], [1, 2])
+
+        index.keep(np.array([False, True, True]))
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.reduced_vectors.shape, (2, 1))
+        self.assertEqual([row for row, _ in index.search([1.0, 0.0], 3)], [0, 1])
+
+    def test_invalid_parameters(self):
+        """Test that unsupported settings are rejected."""
+        with self.assertRaises(ValueError):
+            TruncatedVectorIndex(projection="random")
+        with self.assertRaises(ValueError):
+            TruncatedVectorIndex(dimensions=0)
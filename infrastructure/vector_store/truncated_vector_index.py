@@ -0,0 +1,146 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from infrastructure.vector_store.flat_vector_index import FlatVectorIndex, normalize_vectors, top_k
+from infrastructure.vector_store.vector_index import VectorIndex
+
+# Rows sampled to fit the PCA projection; the leading directions are stable well before that
+PCA_SAMPLE_SIZE = 20000
+
+
+class TruncatedVectorIndex(VectorIndex):
+    """Coarse-to-fine search: a scan over reduced-dimension projections, then exact cosine rescoring.
+
+    Every vector is stored twice: in full (float32, normalized) and projected to `dimensions`
+    components, kept contiguous so the first stage reads dimensions/d of the bytes of a flat scan.
+    The projection is either the leading dimensions of the embedding ("prefix", meaningful for
+    embeddings trained to front-load information) or a PCA basis fitted on the stored vectors
+    ("pca"). PCA is fitted once min_training_size rows are stored; until then searches are exact.
+    Only rescore_candidates shortlisted rows are rescored against the full vectors.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 128,
+        projection: str = "prefix",
+        rescore_candidates: int = 200,
+        min_training_size: int = 1000,
+        initial_capacity: int = 1024,
+        seed: Optional[int] = None
+    ):
+        if dimensions < 1:
+            raise ValueError("Truncated index dimensions must be at least 1")
+        if projection not in ("prefix", "pca"):
+            raise ValueError(f"Unsupported projection: {projection}")
+        if rescore_candidates < 1:
+            raise ValueError("Truncated index rescore_candidates must be at least 1")
+        self.dimensions = dimensions
+        self.projection = projection
+        self.rescore_candidates = rescore_candidates
+        self.min_training_size = min_training_size
+        self.initial_capacity = initial_capacity
+        self._rng = np.random.default_rng(seed)
+        self._originals = FlatVectorIndex(initial_capacity)
+        # (d x dimensions) basis of the PCA projection, None for prefixes or before fitting
+        self._components: Optional[np.ndarray] = None
+        self._reduced: Optional[np.ndarray] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._originals)
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the projection is available (always true for prefixes)."""
+        return self.projection == "prefix" or self._components is not None
+
+    @property
+    def components(self) -> Optional[np.ndarray]:
+        """Fitted PCA basis, one column per kept component (None for prefixes or before fitting)."""
+        return self._components
+
+    @property
+    def reduced_vectors(self) -> np.ndarray:
+        """View of the projected vectors, one row per stored vector (empty until trained)."""
+        if self._reduced is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._reduced[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the projected vectors, the full vectors and the PCA basis."""
+        components = self._components.nbytes if self._components is not None else 0
+        return self.reduced_vectors.nbytes + self._originals.nbytes + components
+
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors, fitting the PCA projection once enough rows are stored."""
+        if len(vectors) == 0:
+            return
+        normalized = normalize_vectors(vectors)
+        self._originals.add(normalized)
+        if self.is_trained:
+            self._append_reduced(self._project(normalized))
+        elif len(self._originals) >= self.min_training_size:
+            self.train()
+
+    def train(self) -> None:
+        """Fit the PCA basis on a sample of the stored vectors and project every row."""
+        vectors = self._originals.vectors
+        sample = vectors
+        if len(vectors) > PCA_SAMPLE_SIZE:
+            sample = vectors[self._rng.choice(len(vectors), size=PCA_SAMPLE_SIZE, replace=False)]
+        # Uncentered: the basis then preserves inner products (hence cosines) as well as possible
+        _, _, basis = np.linalg.svd(sample, full_matrices=False)
+        self._components = np.ascontiguousarray(basis[:self.dimensions].T, dtype=np.float32)
+        self._size = 0
+        self._append_reduced(self._project(vectors))
+
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Shortlist by projected inner product, then rank the shortlist by exact cosine similarity."""
+        if not self.is_trained:
+            return self._originals.search(query, max_results, similarity_threshold, mask)
+        if self._size == 0:
+            return []
+
+        query_vector = normalize_vectors(query)[0]
+        coarse = self.reduced_vectors @ self._project(query_vector[np.newaxis])[0]
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(self._size)
+        candidates = rows[top_k(coarse[rows], max(self.rescore_candidates, max_results))]
+
+        exact = self._originals.vectors[candidates] @ query_vector
+        kept = np.flatnonzero(exact >= similarity_threshold)
+        best = kept[top_k(exact[kept], max_results)]
+        return [(int(candidates[position]), float(exact[position])) for position in best]
+
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Exact vectors of the given rows, from the full-dimension copy."""
+        return self._originals.decode(rows)
+
+    def keep(self, mask: np.ndarray) -> None:
+        """Drop every row whose mask entry is False."""
+        if self._reduced is not None:
+            kept = self.reduced_vectors[mask]
+            self._reduced[:len(kept)] = kept
+            self._size = len(kept)
+        self._originals.keep(mask)
+
+    def _project(self, normalized: np.ndarray) -> np.ndarray:
+        if self._components is not None:
+            return normalized @ self._components
+        return normalized[:, :self.dimensions]
+
+    def _append_reduced(self, reduced: np.ndarray) -> None:
+        size = self._size + len(reduced)
+        if self._reduced is None:
+            self._reduced = np.zeros((max(self.initial_capacity, size), reduced.shape[1]), dtype=np.float32)
+        elif size > len(self._reduced):
+            grown = np.zeros((max(size, 2 * len(self._reduced)), reduced.shape[1]), dtype=np.float32)
+            grown[:self._size] = self.reduced_vectors
+            self._reduced = grown
+        self._reduced[self._size:size] = reduced
+        self._size = size
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class VectorIndex(ABC):
+    """Row-addressed vector index used by the chunk repositories.
+
+    Rows are numbered in insertion order; callers keep their own row-aligned payload (chunks).
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of rows stored in the index"""
+        pass
+
+    @abstractmethod
+    def add(self, vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors at the end of the index"""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: Sequence[float],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Return (row, cosine similarity) pairs, best first, restricted to rows allowed by mask"""
+        pass
+
+    def search_batch(
+        self,
+        queries: Sequence[Sequence[float]],
+        max_results: int,
+        similarity_threshold: float = -1.0,
+        mask: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Run search for every query; indexes that can score queries together override this"""
+        return [self.search(query, max_results, similarity_threshold, mask) for query in queries]
+
+    @abstractmethod
+    def decode(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Normalized float32 vectors of the given rows (all rows by default), approximate for lossy indexes"""
+        pass
+
+    @abstractmethod
+    def keep(self, mask: np.ndarray) -> None:
+        """Physically drop the rows whose mask entry is False and renumber the others"""
+        pass